@@ -0,0 +1,90 @@
+import threading
+import time
+import weakref
+from collections import defaultdict, deque
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+_lock = threading.Lock()
+_requests = 0
+_counters = defaultdict(lambda: {"checkouts": 0, "new_connections": 0})
+# Age of the physical connection at each recent checkout, per alias
+_ages = defaultdict(lambda: deque(maxlen=1000))
+# First checkout time of pooled connections, sqlite3 connections can't be weakly referenced
+_opened_at = weakref.WeakKeyDictionary()
+
+
+@receiver(request_started)
+def count_request(sender, **kwargs):
+    global _requests
+    with _lock:
+        _requests += 1
+
+
+@receiver(connection_created)
+def record_checkout(sender, connection, **kwargs):
+    """
+    Count every connection handed to Django. Without a pool each one is a new
+    physical connection, with a pool it's a checkout of a (maybe reused) one.
+    """
+    now = time.monotonic()
+    with _lock:
+        try:
+            opened_at = _opened_at.setdefault(connection.connection, now)
+        except TypeError:
+            opened_at = now
+        counters = _counters[connection.alias]
+        counters["checkouts"] += 1
+        if opened_at == now:
+            counters["new_connections"] += 1
+        _ages[connection.alias].append(now - opened_at)
+
+
+def get_stats() -> dict:
+    """
+    Return the connection metrics of this process for every database alias.
+    """
+    stats = {"requests": _requests, "databases": {}}
+    for alias in connections:
+        connection = connections[alias]
+        with _lock:
+            ages = list(_ages[alias])
+            alias_stats = dict(_counters[alias])
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            mode = "pool"
+        elif connection.settings_dict["CONN_MAX_AGE"] != 0:
+            mode = "persistent"
+        else:
+            mode = "per request"
+        alias_stats.update(
+            mode=mode,
+            connection_age={
+                "avg": round(sum(ages) / len(ages), 3) if ages else None,
+                "max": round(max(ages), 3) if ages else None,
+            },
+        )
+        if pool is not None:
+            pool_stats = pool.get_stats()
+            alias_stats["pool"] = {
+                "size": pool_stats.get("pool_size"),
+                "available": pool_stats.get("pool_available"),
+                "checkouts": pool_stats.get("requests_num", 0),
+                "waits": pool_stats.get("requests_queued", 0),
+                "wait_ms": pool_stats.get("requests_wait_ms", 0),
+                "waiting": pool_stats.get("requests_waiting", 0),
+                "connections": pool_stats.get("connections_num", 0),
+                "connections_lost": pool_stats.get("connections_lost", 0),
+            }
+        stats["databases"][alias] = alias_stats
+    return stats
+
+
+def reset_stats():
+    global _requests
+    with _lock:
+        _requests = 0
+        _counters.clear()
+        _ages.clear()
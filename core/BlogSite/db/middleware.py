@@ -0,0 +1,61 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from .routers import start_request, end_request
+
+COOKIE_NAME = "use_primary"
+COOKIE_SALT = "BlogSite.db.middleware"
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Keep the reads of a client on the primary database for
+    ``REPLICA_STICKY_SECONDS`` after it wrote, so it sees its own changes
+    while the replicas catch up.
+
+    Sync and async capable, so it doesn't make Django run the middleware
+    chain and the async views in a thread under ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = self.start_request(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        return self.process_response(response, wrote)
+
+    async def __acall__(self, request):
+        token = self.start_request(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            wrote = end_request(token)
+        return self.process_response(response, wrote)
+
+    def start_request(self, request):
+        pinned = request.get_signed_cookie(
+            COOKIE_NAME, default=None, salt=COOKIE_SALT, max_age=settings.REPLICA_STICKY_SECONDS
+        )
+        return start_request(pinned=pinned is not None)
+
+    def process_response(self, response, wrote: bool):
+        if wrote and settings.DATABASE_REPLICAS:
+            response.set_signed_cookie(
+                COOKIE_NAME,
+                "1",
+                salt=COOKIE_SALT,
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,26 @@
+class LoadedValuesMixin:
+    """
+    Model mixin keeping the column values the instance was loaded with, then
+    the ones it last saved, in ``_loaded_values`` (by attname), so signals can
+    tell what a save changes without reading the row again.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, update_fields=None, **kwargs):
+        super().save(*args, update_fields=update_fields, **kwargs)
+        # What was just written is what the next save changes. Keep the column
+        # values, not the live objects (a FieldFile changes with its field).
+        deferred = self.get_deferred_fields()
+        self._loaded_values = {
+            **getattr(self, "_loaded_values", {}),
+            **{
+                field.attname: field.get_prep_value(getattr(self, field.attname))
+                for field in self._meta.concrete_fields
+                if field.attname not in deferred and (update_fields is None or field.name in update_fields)
+            },
+        }
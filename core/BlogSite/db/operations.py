@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+class AddIndexConcurrently(migrations.AddIndex):
+    """
+    Add an index without blocking writes on PostgreSQL (CREATE INDEX CONCURRENTLY).
+    Other databases get a plain CREATE INDEX. Migrations using it must set
+    ``atomic = False``.
+    """
+
+    def concurrently(self, schema_editor):
+        return {"concurrently": True} if schema_editor.connection.vendor == "postgresql" else {}
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.add_index(model, self.index, **self.concurrently(schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.remove_index(model, self.index, **self.concurrently(schema_editor))
@@ -0,0 +1,84 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Per request: {"pinned": reads go to the primary, "wrote": the request wrote to it}
+_request_state = ContextVar("replica_request_state", default=None)
+
+
+def start_request(pinned: bool = False):
+    """
+    Start tracking reads and writes of the current request, return the token
+    to pass to ``end_request()``.
+    """
+    return _request_state.set({"pinned": pinned, "wrote": False})
+
+
+def end_request(token) -> bool:
+    """
+    Stop tracking the current request and return whether it wrote to the primary.
+    """
+    state = _request_state.get()
+    _request_state.reset(token)
+    return bool(state and state["wrote"])
+
+
+@contextmanager
+def use_primary():
+    """
+    Send the reads of the block to the primary, for results stored in shared
+    caches: read from a lagging replica, old rows would be cached under the
+    generation a write just moved to.
+    """
+    state = _request_state.get()
+    if state is None:
+        token = start_request(pinned=True)
+        try:
+            yield
+        finally:
+            end_request(token)
+        return
+    pinned = state["pinned"]
+    state["pinned"] = True
+    try:
+        yield
+    finally:
+        # A write in the block keeps the rest of the request on the primary.
+        state["pinned"] = pinned or state["wrote"]
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads of the blog, comment and account apps to a random replica
+    (``settings.DATABASE_REPLICAS``) and all writes to the primary.
+
+    Once a request writes, its remaining reads use the primary too, and so do
+    reads inside transactions on the primary.
+    """
+
+    route_app_labels = {"blog", "comment", "account"}
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or model._meta.app_label not in self.route_app_labels:
+            return None
+
+        state = _request_state.get()
+        if (state and state["pinned"]) or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = _request_state.get()
+        if state is not None and model._meta.app_label in self.route_app_labels:
+            state["wrote"] = state["pinned"] = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
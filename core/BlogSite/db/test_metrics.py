@@ -0,0 +1,43 @@
+import threading
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from BlogSite.db.metrics import get_stats, reset_stats
+from blog.models import Post
+from account.models import User
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConnectionStats:
+    def test_new_connections_are_counted(self):
+        def request():
+            # Every thread gets its own connection.
+            Post.objects.exists()
+            Post.objects.exists()
+            connection.close()
+
+        reset_stats()
+        thread = threading.Thread(target=request)
+        thread.start()
+        thread.join()
+
+        stats = get_stats()["databases"]["default"]
+        assert stats["mode"] == "per request"
+        assert stats["checkouts"] == 1 and stats["new_connections"] == 1
+        assert stats["connection_age"]["max"] == 0
+
+    def test_stats_endpoint_is_admin_only(self):
+        url = reverse("db-stats")
+        api_client = APIClient()
+        user = User.objects.create_user(username="testuser", email="testuser@example.com", password="testpassword")
+        api_client.force_authenticate(user=user)
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+        admin = User.objects.create_superuser(username="admin", email="admin@example.com", password="adminpassword")
+        api_client.force_authenticate(user=admin)
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["requests"] >= 1
+        assert "default" in response.data["databases"]
@@ -0,0 +1,163 @@
+import logging
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.handlers.asgi import ASGIHandler
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import Client
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from BlogSite.db.middleware import COOKIE_NAME, COOKIE_SALT, ReplicaStickinessMiddleware
+from BlogSite.db.routers import start_request, end_request, use_primary
+from blog.models import Post
+from account.models import User
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+    settings.REPLICA_STICKY_SECONDS = 10
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create_user(
+        username="testuser", email="testuser@example.com", password="testpassword", is_verified=True
+    )
+
+
+@pytest.fixture
+def replica_post() -> Post:
+    # A row that only exists on the replica tells which database served a read.
+    # The tests run without a wrapping transaction, which would pin reads to the primary.
+    author = User.objects.using("replica").create(username="replicauser", email="replicauser@example.com")
+    return Post.objects.using("replica").create(title="Replica Post", content="From the replica.", author=author)
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+class TestPrimaryReplicaRouter:
+    def test_reads_go_to_the_replica(self, replica_post: Post):
+        assert Post.objects.all().db == "replica"
+        assert list(Post.objects.values_list("title", flat=True)) == ["Replica Post"]
+
+    def test_writes_go_to_the_primary(self, user: User):
+        post = Post.objects.create(title="Primary Post", content="Content", author=user)
+        assert post._state.db == "default"
+        assert not Post.objects.using("replica").filter(pk=post.pk).exists()
+
+    def test_reads_in_transactions_use_the_primary(self):
+        with transaction.atomic():
+            assert Post.objects.all().db == "default"
+
+    def test_request_sticks_to_the_primary_after_a_write(self, user: User):
+        token = start_request()
+        assert Post.objects.all().db == "replica"
+        Post.objects.create(title="Primary Post", content="Content", author=user)
+        assert Post.objects.all().db == "default"
+        assert end_request(token)
+
+    def test_use_primary(self, user: User):
+        with use_primary():
+            assert Post.objects.all().db == "default"
+        assert Post.objects.all().db == "replica"
+
+        token = start_request()
+        with use_primary():
+            Post.objects.create(title="Primary Post", content="Content", author=user)
+        # The write keeps the rest of the request on the primary.
+        assert Post.objects.all().db == "default"
+        assert end_request(token)
+
+    def test_other_apps_are_not_routed(self):
+        from django.contrib.sessions.models import Session
+
+        assert Session.objects.all().db == "default"
+
+    def test_no_replicas_configured(self, settings):
+        settings.DATABASE_REPLICAS = []
+        assert Post.objects.all().db == "default"
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+class TestReplicaStickinessMiddleware:
+    def test_client_reads_own_writes(self, user: User, replica_post: Post):
+        api_client = APIClient()
+        api_client.force_authenticate(user=user)
+        url = reverse("post:api-v1:posts-list")
+        # The post page isn't cached, cache fills always read the primary.
+        page_url = reverse("post:list")
+
+        assert "Replica Post" in api_client.get(page_url).content.decode()
+
+        response = api_client.post(url, {"title": "My Post", "content": "Content"})
+        assert response.status_code == status.HTTP_201_CREATED
+        assert COOKIE_NAME in response.cookies
+
+        content = api_client.get(page_url).content.decode()
+        assert "My Post" in content and "Replica Post" not in content
+
+    def test_sticky_window(self, settings, rf):
+        response = HttpResponse()
+        response.set_signed_cookie(COOKIE_NAME, "1", salt=COOKIE_SALT)
+        request = rf.get("/")
+        request.COOKIES[COOKIE_NAME] = response.cookies[COOKIE_NAME].value
+        middleware = ReplicaStickinessMiddleware(lambda request: HttpResponse(Post.objects.all().db))
+
+        assert middleware(request).content == b"default"
+        settings.REPLICA_STICKY_SECONDS = -1
+        assert middleware(request).content == b"replica"
+
+    def test_async_requests(self, rf, user: User):
+        async def get_response(request):
+            db = Post.objects.all().db
+            await Post.objects.acreate(title="Async Post", content="Content", author=user)
+            return HttpResponse(db)
+
+        middleware = ReplicaStickinessMiddleware(get_response)
+        assert iscoroutinefunction(middleware)
+        response = async_to_sync(middleware)(rf.get("/"))
+        assert response.content == b"replica"
+        assert COOKIE_NAME in response.cookies
+
+    def test_asgi_chain_stays_async(self, settings, caplog):
+        # With DEBUG, Django logs every middleware it has to adapt to the other mode.
+        settings.DEBUG = True
+        caplog.set_level(logging.DEBUG, logger="django.request")
+        ASGIHandler()
+        assert not [record.message for record in caplog.records if "adapted for middleware" in record.message]
+
+    def test_reads_do_not_stick(self, replica_post: Post):
+        response = Client().get(reverse("post:list"))
+        assert response.status_code == 200
+        assert COOKIE_NAME not in response.cookies
+        assert "Replica Post" in response.content.decode()
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+class TestSharedCaches:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def lagging_post(self, user: User) -> Post:
+        # The replica still has the post as it was before the last edit.
+        post = Post.objects.create(title="New Title", content="Content", author=user, published=True)
+        User.objects.using("replica").create(pk=user.pk, username=user.username, email=user.email)
+        Post.objects.using("replica").create(
+            pk=post.pk, title="Old Title", content="Content", author_id=user.pk, published=True
+        )
+        return post
+
+    def test_api_cache_is_filled_from_the_primary(self, lagging_post: Post):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": lagging_post.pk})
+        api_client = APIClient()
+        assert api_client.get(url).data["title"] == "New Title"
+        # Served from the cache.
+        assert api_client.get(url).data["title"] == "New Title"
+
+    def test_feeds_are_rendered_from_the_primary(self, lagging_post: Post):
+        content = Client().get(reverse("syndication:rss")).content.decode()
+        assert "New Title" in content and "Old Title" not in content
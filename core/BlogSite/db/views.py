@@ -0,0 +1,15 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from .metrics import get_stats
+
+
+class ConnectionStatsView(APIView):
+    """
+    Database connection and pool metrics of the process answering the request.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(get_stats())
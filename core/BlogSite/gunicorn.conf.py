@@ -0,0 +1,19 @@
+"""
+Gunicorn config for BlogSite.
+
+SERVER_MODE="wsgi" runs the classic sync workers, SERVER_MODE="asgi" runs
+BlogSite.asgi on uvicorn workers, where async views don't hold a worker
+while they wait for the database or the cache.
+"""
+
+# Gunicorn reads every module level name as a setting, and "config" is one of them.
+import decouple
+
+bind = decouple.config("GUNICORN_BIND", default="0.0.0.0:8000")
+workers = decouple.config("GUNICORN_WORKERS", default=1, cast=int)
+
+if decouple.config("SERVER_MODE", default="wsgi") == "asgi":
+    wsgi_app = "BlogSite.asgi:application"
+    worker_class = "uvicorn_worker.UvicornWorker"
+else:
+    wsgi_app = "BlogSite.wsgi:application"
@@ -39,11 +39,13 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.sitemaps",
     # Created Apps
     "account",
     "blog",
     "comment",
     "jwt_token",
+    "images",
     # Third party apps
     "django_recaptcha",
     "rest_framework",
@@ -57,6 +59,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "BlogSite.db.middleware.ReplicaStickinessMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -97,9 +100,44 @@ DATABASES = {
         "PASSWORD": config("SQL_PASSWORD", default="password"),
         "HOST": config("SQL_HOST", default="localhost"),
         "PORT": config("SQL_PORT", default="5432"),
+        # Seconds to keep a connection open between requests (0 closes it after each one)
+        "CONN_MAX_AGE": config("SQL_CONN_MAX_AGE", default=0, cast=int),
+        "CONN_HEALTH_CHECKS": config("SQL_CONN_HEALTH_CHECKS", default=True, cast=bool),
     }
 }
 
+# psycopg connection pool of every web and Celery process (PostgreSQL only)
+if config("SQL_POOL", default=False, cast=bool) and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    from psycopg_pool import ConnectionPool
+
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # The pool keeps the connections open instead
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": config("SQL_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("SQL_POOL_MAX_SIZE", default=10, cast=int),
+            "timeout": config("SQL_POOL_TIMEOUT", default=10, cast=float),
+            "max_lifetime": config("SQL_POOL_MAX_LIFETIME", default=60 * 30, cast=float),
+            "check": ConnectionPool.check_connection if DATABASES["default"]["CONN_HEALTH_CHECKS"] else None,
+        }
+    }
+
+# Read replicas ("host" or "host:port", sharing the primary's credentials)
+DATABASE_REPLICAS = []
+for index, replica in enumerate(config("SQL_REPLICA_HOSTS", default="", cast=Csv()), start=1):
+    host, _, port = replica.partition(":")
+    DATABASES[f"replica_{index}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index}")
+
+DATABASE_ROUTERS = ["BlogSite.db.routers.PrimaryReplicaRouter"]
+
+# Seconds a client's reads stay on the primary after it wrote
+REPLICA_STICKY_SECONDS = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -144,6 +182,19 @@ STATICFILES_DIRS = [
 MEDIA_URL = "media/"
 MEDIA_ROOT = "media"
 
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    # Uploaded images, stored once per distinct content under its hash
+    "images": {"BACKEND": "images.storage.ContentAddressedStorage", "OPTIONS": {"allow_overwrite": True}},
+}
+
+# Uploads are streamed to temporary files with their limits checked on the way
+FILE_UPLOAD_HANDLERS = ["images.uploads.ImageUploadHandler"]
+IMAGE_UPLOAD_MAX_SIZE = config("IMAGE_UPLOAD_MAX_SIZE", default=10 * 1024 * 1024, cast=int)  # 10 MB
+IMAGE_UPLOAD_MAX_DIMENSION = config("IMAGE_UPLOAD_MAX_DIMENSION", default=8000, cast=int)
+IMAGE_UPLOAD_MAX_PIXELS = config("IMAGE_UPLOAD_MAX_PIXELS", default=40_000_000, cast=int)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -168,6 +219,11 @@ EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", cast=str, default=None)
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", cast=bool, default=True)
 # EUse MAIL_PORT 465 for SSL
 EMAIL_USE_SSL = config("EMAIL_USE_SSL", cast=bool, default=False)
+# Verification emails queued in Redis and sent in batches over one SMTP
+# connection per worker, each email gets its own task when empty
+EMAIL_QUEUE_REDIS_URL = config("EMAIL_QUEUE_REDIS_URL", default="")
+EMAIL_BATCH_SIZE = config("EMAIL_BATCH_SIZE", default=100, cast=int)
+EMAIL_BATCH_DELAY = config("EMAIL_BATCH_DELAY", default=2, cast=int)  # seconds
 
 
 # Rest framework
@@ -197,8 +253,23 @@ CELERY_BEAT_SCHEDULE = {
         "task": "jwt_token.tasks.remove_inactive_tokens",
         "schedule": crontab(hour=23, minute=0),
     },
+    "update_trending_posts": {
+        "task": "blog.tasks.update_trending_posts",
+        "schedule": crontab(minute="*/5"),
+    },
+    "sweep_orphan_media": {
+        "task": "images.tasks.sweep_orphan_media",
+        "schedule": crontab(hour=3, minute=30),
+    },
 }
 
+# Media files no row references are swept once older than this many hours
+MEDIA_ORPHAN_MIN_AGE = config("MEDIA_ORPHAN_MIN_AGE", default=24, cast=int)
+
+# Trending feed: comments count half as much every TRENDING_HALF_LIFE hours
+TRENDING_HALF_LIFE = config("TRENDING_HALF_LIFE", default=24, cast=float)
+TRENDING_SIZE = config("TRENDING_SIZE", default=200, cast=int)
+
 # Cache settings
 CACHES = {
     "default": {
@@ -208,6 +279,21 @@ CACHES = {
     }
 }
 
+# Cached API responses are invalidated on writes, so they can live long
+API_CACHE_TIMEOUT = config("API_CACHE_TIMEOUT", default=60 * 60 * 24, cast=int)  # 1 day
+
+# Rendered post cards are keyed on the post's updated_at, so they can live long
+POST_CARD_CACHE_TIMEOUT = config("POST_CARD_CACHE_TIMEOUT", default=60 * 60 * 24, cast=int)  # 1 day
+
+# RSS/Atom feeds and sitemaps are re-rendered on writes, crawlers may reuse them for a while
+SYNDICATION_MAX_AGE = config("SYNDICATION_MAX_AGE", default=60 * 15, cast=int)  # 15 minutes
+
+# Post feed pagination: "page" (page numbers) or "cursor" (keyset)
+POST_PAGINATION_MODE = config("POST_PAGINATION_MODE", default="page")
+
+# Redis database holding the post ids of every category feed, empty to read feeds from the DB
+CATEGORY_FEED_REDIS_URL = config("CATEGORY_FEED_REDIS_URL", default="")
+
 # Cors Headers
 CORS_ALLOW_ALL_ORIGINS = config("CORS_ALLOW_ALL_ORIGINS", default=True, cast=bool)
 if not CORS_ALLOW_ALL_ORIGINS:
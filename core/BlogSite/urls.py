@@ -23,6 +23,7 @@ from django.views.generic import RedirectView
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from BlogSite.db.views import ConnectionStatsView
 
 
 schema_view = get_schema_view(
@@ -45,6 +46,7 @@ urlpatterns = [
     path("categories/", include("blog.urls.category")),
     path("posts/", include("blog.urls.post")),
     path("comments/", include("comment.urls")),
+    path("", include("blog.urls.syndication")),
     path(
         "swagger/",
         schema_view.with_ui("swagger", cache_timeout=0),
@@ -56,6 +58,7 @@ urlpatterns = [
         name="schema-redoc",
     ),
     path("captcha/", include("captcha.urls")),
+    path("db-stats/", ConnectionStatsView.as_view(), name="db-stats"),
     path("favicon.ico", RedirectView.as_view(url=settings.STATIC_URL + "img/favicon.ico", permanent=True)),
 ]
 
@@ -2,10 +2,9 @@ from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate
-import uuid
-from django.utils.text import slugify
 from captcha.validators import captcha_validate
 from account.models import User
+from images.serializers import ImageUploadField, SrcsetField
 
 
 class MessageSerializer(serializers.Serializer):
@@ -154,9 +153,12 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
 
 
 class ProfileSerializer(serializers.ModelSerializer):
+    image = ImageUploadField(required=False, allow_null=True)
+    image_srcset = SrcsetField()
+
     class Meta:
         model = User
-        fields = ["id", "email", "username", "image", "is_verified", "is_active"]
+        fields = ["id", "email", "username", "image", "image_srcset", "is_verified", "is_active"]
         read_only_fields = ["id", "email", "is_verified", "is_active"]
 
     def validate(self, attrs):
@@ -165,12 +167,4 @@ class ProfileSerializer(serializers.ModelSerializer):
             if User.objects.filter(username=username).exclude(id=self.instance.id).exists():
                 raise serializers.ValidationError({"username": "Username is already in use."})
 
-        # Change the name of the uploaded image if present
-        image = attrs.get("image")
-        if image:
-            ext = image.name.split(".")[-1]
-            username = self.instance.username if self.instance else "user"
-            new_filename = f"{slugify(username)}-{uuid.uuid4().hex[:8]}.{ext}"
-            image.name = new_filename
-
         return super().validate(attrs)
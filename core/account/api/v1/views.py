@@ -19,7 +19,7 @@ from .serializers import (
 from .permissions import IsVerified, IsVerifiedOrReadOnly
 
 from jwt_token.models import Token
-from account.tasks import send_email
+from account.tasks import queue_email
 
 
 class SignupAPIView(GenericAPIView):
@@ -46,7 +46,7 @@ class SignupAPIView(GenericAPIView):
         protocol = "https" if request.is_secure() else "http"
         token = Token.make_token(user)
 
-        send_email.delay(
+        queue_email(
             email=user.email,
             domain=domain,
             protocol=protocol,
@@ -129,7 +129,7 @@ class VerificationResendAPIView(GenericAPIView):
             protocol = "https" if request.is_secure() else "http"
             token = Token.make_token(user)
 
-            send_email.delay(
+            queue_email(
                 email=user.email,
                 domain=domain,
                 protocol=protocol,
@@ -231,7 +231,7 @@ class PasswordResetAPIView(GenericAPIView):
         protocol = "https" if request.is_secure() else "http"
         token = Token.make_token(user)
 
-        send_email.delay(
+        queue_email(
             email=user.email,
             domain=domain,
             protocol=protocol,
@@ -0,0 +1,172 @@
+import functools
+import json
+import smtplib
+import threading
+import uuid
+import redis
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+
+QUEUE_KEY = "email:queue"
+# Emails popped by the draining task, removed once sent or dropped
+PROCESSING_KEY = "email:processing"
+# Set while a send_queued_emails task is scheduled, so a burst schedules one task
+SCHEDULED_KEY = "email:scheduled"
+# Held by the task draining the queue
+DRAINING_KEY = "email:draining"
+DRAINING_TIMEOUT = 300
+
+_lock = threading.Lock()
+_connection = None
+
+
+@functools.cache
+def compiled_template(name: str):
+    # Parsed once per process, whatever the template loaders cache.
+    return get_template(name)
+
+
+def render_message(
+    email: str,
+    domain: str,
+    protocol: str,
+    using_api: bool,
+    token: str,
+    subject: str,
+    html_template_name: str,
+    txt_template_name: str,
+) -> EmailMultiAlternatives:
+    """
+    Build the email the ``send_email`` task sends, see its arguments.
+    """
+    email_context = {
+        "domain": domain,
+        "protocol": protocol,
+        "using_api": using_api,
+        "token": token,
+    }
+    body_html = compiled_template(html_template_name).render(email_context)
+    body_txt = compiled_template(txt_template_name).render(email_context)
+    message = EmailMultiAlternatives(subject, body_txt, to=[email])
+    message.attach_alternative(body_html, "text/html")
+    return message
+
+
+def send_messages(messages: list[EmailMultiAlternatives]) -> int:
+    """
+    Send the messages over the connection of this worker process, opened once
+    and kept for the next messages instead of a new SMTP session (and TLS
+    handshake and login) per message. Return the number of sent messages.
+    """
+    global _connection
+    with _lock:
+        if _connection is None:
+            _connection = get_connection(fail_silently=False)
+        try:
+            # open() keeps an already open connection.
+            _connection.open()
+            return _connection.send_messages(messages)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # The server closed the idle connection, reconnect once. Messages
+            # sent before the failure may be sent twice.
+            _connection.close()
+            _connection.open()
+            return _connection.send_messages(messages)
+
+
+def close_connection():
+    global _connection
+    with _lock:
+        if _connection is not None:
+            _connection.close()
+            _connection = None
+
+
+class EmailQueue:
+    """
+    Redis list of the arguments of pending ``send_email`` calls, drained in
+    batches by the send_queued_emails task so a burst of signups shares SMTP
+    sessions instead of running one task (and session) per message.
+
+    Popped emails move to a processing list until they are acknowledged, the
+    next drain puts back the ones of a worker that died meanwhile.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+        self.token = uuid.uuid4().hex
+
+    def push(self, **kwargs) -> bool:
+        """
+        Queue an email and return whether a drain task must be scheduled.
+        """
+        with self.client.pipeline() as pipe:
+            pipe.rpush(QUEUE_KEY, json.dumps(kwargs))
+            pipe.set(SCHEDULED_KEY, 1, nx=True, ex=settings.EMAIL_BATCH_DELAY + 60)
+            _, scheduled = pipe.execute()
+        return bool(scheduled)
+
+    def claim(self) -> bool:
+        """
+        Become the only drain of the queue, return False if another one is running.
+        """
+        return bool(self.client.set(DRAINING_KEY, self.token, nx=True, ex=DRAINING_TIMEOUT))
+
+    def release(self):
+        if self.client.get(DRAINING_KEY) == self.token.encode():
+            self.client.delete(DRAINING_KEY)
+
+    def recover(self):
+        # Back to the front, in their order, while holding the claim.
+        while self.client.lmove(PROCESSING_KEY, QUEUE_KEY, "RIGHT", "LEFT"):
+            pass
+
+    def pop(self, count: int) -> list[tuple[bytes, dict]]:
+        """
+        Move up to ``count`` emails to the processing list, return them as
+        (item, arguments) pairs, the item to pass to ``ack`` or ``requeue``.
+        """
+        with self.client.pipeline() as pipe:
+            for _ in range(count):
+                pipe.lmove(QUEUE_KEY, PROCESSING_KEY, "LEFT", "RIGHT")
+            pipe.expire(DRAINING_KEY, DRAINING_TIMEOUT)
+            *items, _ = pipe.execute()
+        return [(item, json.loads(item)) for item in items if item is not None]
+
+    def ack(self, item: bytes):
+        self.client.lrem(PROCESSING_KEY, 1, item)
+
+    def requeue(self, items: list[bytes], countdown: int):
+        """
+        Put unsent emails back to the front of the queue, in their order, for
+        the task scheduled ``countdown`` seconds later.
+        """
+        with self.client.pipeline() as pipe:
+            for item in reversed(items):
+                pipe.lrem(PROCESSING_KEY, 1, item)
+                pipe.lpush(QUEUE_KEY, item)
+            # New emails don't need another task meanwhile.
+            pipe.set(SCHEDULED_KEY, 1, ex=countdown + 60)
+            pipe.execute()
+
+    def start_draining(self):
+        # Emails queued from now on schedule another task.
+        self.client.delete(SCHEDULED_KEY)
+
+    def __len__(self):
+        return self.client.llen(QUEUE_KEY)
+
+
+@functools.cache
+def _get_client(url: str) -> redis.Redis:
+    # One connection pool per process.
+    return redis.Redis.from_url(url)
+
+
+def get_email_queue() -> EmailQueue | None:
+    """
+    Return the email queue, or None when EMAIL_QUEUE_REDIS_URL is empty.
+    """
+    url = settings.EMAIL_QUEUE_REDIS_URL
+    return EmailQueue(_get_client(url)) if url else None
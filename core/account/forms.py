@@ -3,10 +3,9 @@ from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.forms import PasswordChangeForm, SetPasswordForm
 from django_recaptcha.fields import ReCaptchaField, ReCaptchaV2Checkbox
-from django.core.files.base import ContentFile
 from django.conf import settings
-import base64
 from account.models import User
+from images.fields import ImageUploadField
 
 
 class CaptchaForm(forms.Form):
@@ -163,7 +162,7 @@ class CustomPasswordResetForm(SetPasswordForm):
 
 
 class UserInfoForm(forms.ModelForm):
-    cropped_image_data = forms.CharField(widget=forms.HiddenInput(), required=False)
+    image = ImageUploadField(required=False)
     delete_image = forms.BooleanField(required=False, label="Remove current profile image")
 
     class Meta:
@@ -176,18 +175,12 @@ class UserInfoForm(forms.ModelForm):
 
         # Handle deleting the current image
         if self.cleaned_data.get("delete_image") and instance.image:
-            instance.image.delete(save=False)
+            # The signals delete the file once no other row references it.
             instance.image = None
 
-        cropped_data = self.cleaned_data.get("cropped_image_data")
-        if cropped_data:
-            try:
-                format, imgstr = cropped_data.split(";base64,")
-                ext = format.split("/")[-1]
-                image_file = ContentFile(base64.b64decode(imgstr), name=f"user_{instance.pk}.{ext}")
-                instance.image = image_file
-            except ValueError:
-                pass
+        image = self.cleaned_data.get("image")
+        if image:
+            instance.image = image
 
         if commit:
             instance.save()
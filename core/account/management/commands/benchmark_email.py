@@ -0,0 +1,129 @@
+import socketserver
+import threading
+import time
+from django.core.mail import EmailMultiAlternatives
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test.utils import override_settings
+from account.emails import close_connection, compiled_template, render_message, send_messages
+
+EMAIL = {
+    "domain": "example.com",
+    "protocol": "https",
+    "using_api": True,
+    "token": "benchmark-token",
+    "subject": "Blogosphere: Email Verification",
+    "html_template_name": "account/email/verification_resend_email.html",
+    "txt_template_name": "account/email/verification_resend_email.txt",
+}
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Just enough SMTP to accept messages, after the configured delay per
+    connection standing in for the TCP and TLS handshakes and the login.
+    """
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        time.sleep(self.server.latency)
+        self.reply("220 localhost SMTP stand-in")
+        while line := self.rfile.readline():
+            command = line[:4].upper()
+            if command == b"DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self.server.count()
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency: float):
+        super().__init__(("127.0.0.1", 0), SMTPHandler)
+        self.latency = latency
+        self.received = 0
+        self.lock = threading.Lock()
+
+    def count(self):
+        with self.lock:
+            self.received += 1
+
+
+class Command(BaseCommand):
+    help = "Compare the email sending rate of one SMTP connection per message with pooled and batched sending"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=300, help="Number of emails sent per mode")
+        parser.add_argument("--batch-size", type=int, default=100, help="Number of emails per batch")
+        parser.add_argument("--latency", type=int, default=20, help="Delay of each new SMTP connection in ms")
+
+    def handle(self, *args, **options):
+        server = SMTPStandIn(options["latency"] / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        smtp = {
+            "EMAIL_BACKEND": "django.core.mail.backends.smtp.EmailBackend",
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": server.server_address[1],
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",
+            "EMAIL_USE_TLS": False,
+            "EMAIL_USE_SSL": False,
+        }
+        modes = {
+            "one connection per message": self.send_unpooled,
+            "pooled connection, one message per task": self.send_pooled,
+            f"pooled connection, batches of {options['batch_size']}": self.send_batched,
+        }
+        try:
+            with override_settings(**smtp):
+                for name, send in modes.items():
+                    close_connection()
+                    compiled_template.cache_clear()
+                    received = server.received
+                    start = time.perf_counter()
+                    send(options["messages"], options["batch_size"])
+                    elapsed = time.perf_counter() - start
+                    self.report(name, server.received - received, elapsed)
+        finally:
+            close_connection()
+            server.shutdown()
+            server.server_close()
+
+    def recipients(self, messages: int):
+        return [f"user{i}@example.com" for i in range(messages)]
+
+    def send_unpooled(self, messages: int, batch_size: int):
+        # What send_email did before: render both templates and open a connection per message.
+        context = {key: EMAIL[key] for key in ("domain", "protocol", "using_api", "token")}
+        for email in self.recipients(messages):
+            body_html = render_to_string(EMAIL["html_template_name"], context)
+            body_txt = render_to_string(EMAIL["txt_template_name"], context)
+            message = EmailMultiAlternatives(EMAIL["subject"], body_txt, to=[email])
+            message.attach_alternative(body_html, "text/html")
+            message.send()
+
+    def send_pooled(self, messages: int, batch_size: int):
+        for email in self.recipients(messages):
+            send_messages([render_message(email=email, **EMAIL)])
+
+    def send_batched(self, messages: int, batch_size: int):
+        recipients = self.recipients(messages)
+        for start in range(0, messages, batch_size):
+            send_messages([render_message(email=email, **EMAIL) for email in recipients[start:][:batch_size]])
+
+    def report(self, name: str, received: int, elapsed: float):
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        self.stdout.write(
+            self.style.SUCCESS(f"{received} messages in {elapsed:.2f}s, {received / elapsed:.0f} messages/s")
+        )
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("account", "0002_user_image"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="image_renditions",
+            field=models.JSONField(
+                blank=True,
+                default=dict,
+                editable=False,
+                verbose_name="Image Renditions",
+            ),
+        ),
+    ]
@@ -4,6 +4,8 @@ from django.contrib.auth.models import (
     PermissionsMixin,
     BaseUserManager,
 )
+from images.storage import get_image_storage
+from BlogSite.db.models import LoadedValuesMixin
 
 
 class UserManager(BaseUserManager):
@@ -50,7 +52,7 @@ class UserManager(BaseUserManager):
         return user
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(LoadedValuesMixin, AbstractBaseUser, PermissionsMixin):
     """
     Custom User model that uses email as the unique identifier.
     This model extends Django's AbstractBaseUser and PermissionsMixin to provide
@@ -64,7 +66,10 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name="Username",
         help_text="Username must be unique and is used to show to other users.",
     )
-    image = models.ImageField(upload_to="users", null=True, blank=True, verbose_name="Profile Image")
+    image = models.ImageField(
+        upload_to="users", storage=get_image_storage, null=True, blank=True, verbose_name="Profile Image"
+    )
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False, verbose_name="Image Renditions")
     is_active = models.BooleanField(default=True, verbose_name="Is Active")
     is_staff = models.BooleanField(default=False, verbose_name="Is Staff")
     is_verified = models.BooleanField(default=False, verbose_name="Is Verified")
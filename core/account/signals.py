@@ -1,24 +1,44 @@
-from django.db.models.signals import pre_save, post_delete
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from .models import User
+from images.blobs import release, stored_name, update_references
+from images.deletion import delete_on_commit
+from images.renditions import needs_update, rendition_files
+from images.tasks import generate_renditions
 
 
 @receiver(pre_save, sender=User)
-def delete_old_image(sender: User, instance: User, **kwargs):
-    if not instance.pk:
-        return  # Skip new instances
+def load_old_image(sender: User, instance: User, update_fields=None, **kwargs):
+    if not instance.pk or (update_fields is not None and "image" not in update_fields):
+        return  # Skip new instances and saves leaving the image alone
+    loaded = getattr(instance, "_loaded_values", {})
+    if "image" in loaded:
+        return  # Loaded with the instance, no query needed
+    # Only instances built by hand or loaded with the image deferred get here.
+    image = sender.objects.filter(pk=instance.pk).values_list("image", flat=True).first()
+    instance._loaded_values = {**loaded, "image": image}
 
-    try:
-        old_image = sender.objects.get(pk=instance.pk).image
-    except sender.DoesNotExist:
-        return
 
-    # If new image is different from old one
-    if old_image and old_image != instance.image:
-        old_image.delete(save=False)
+@receiver(post_save, sender=User)
+def delete_old_image(sender: User, instance: User, using: str, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    old_image = "" if created else stored_name(getattr(instance, "_loaded_values", {}).get("image"))
+    # Images are shared by identical uploads, the file goes once no row references it.
+    update_references(old_image, instance.image.name or "", using)
 
 
 @receiver(post_delete, sender=User)
-def auto_delete_image_on_delete(sender: User, instance: User, **kwargs):
+def auto_delete_image_on_delete(sender: User, instance: User, using: str, **kwargs):
     if instance.image:
-        instance.image.delete(save=False)
+        delete_on_commit("default", rendition_files(instance.image_renditions), using)
+        release(instance.image.name, using)
+
+
+@receiver(post_save, sender=User)
+def queue_image_renditions(sender: User, instance: User, using: str, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    if needs_update(instance.image, instance.image_renditions):
+        transaction.on_commit(lambda: generate_renditions.delay("account.User", instance.pk), using=using, robust=True)
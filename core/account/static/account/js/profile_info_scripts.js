@@ -19,32 +19,30 @@ const cropPreview = document.getElementById("crop-preview");
 imageInput.addEventListener("change", function () {
     const file = this.files[0];
     if (file) {
-        const reader = new FileReader();
-        reader.onload = function (e) {
-            cropPreview.src = e.target.result;
-
-            // Delay cropper init to make sure image is loaded
-            cropPreview.onload = function () {
-                if (cropper) cropper.destroy();
-                cropper = new Cropper(cropPreview, {
-                    aspectRatio: 1,
-                    viewMode: 1,
-                });
-            };
+        // Delay cropper init to make sure image is loaded
+        cropPreview.onload = function () {
+            if (cropper) cropper.destroy();
+            cropper = new Cropper(cropPreview, {
+                aspectRatio: 1,
+                viewMode: 1,
+            });
         };
-        reader.readAsDataURL(file);
+        cropPreview.src = URL.createObjectURL(file);
     }
 });
 
-// Intercept form submit and insert cropped image data
+// Intercept form submit and replace the selected file with the cropped image
 document.querySelector("form").addEventListener("submit", function (e) {
-    if (cropper) {
-        const canvas = cropper.getCroppedCanvas({ width: 300, height: 300 });
-        document.getElementById("cropped_image_data").value = canvas.toDataURL("image/png");
-    }
-    else {
-        document.getElementById("cropped_image_data").value = cropPreview.src
-    }
+    if (!cropper) return;
+    e.preventDefault();
+    const form = this;
+    cropper.getCroppedCanvas({ width: 300, height: 300 }).toBlob(function (blob) {
+        const files = new DataTransfer();
+        files.items.add(new File([blob], "profile.png", { type: "image/png" }));
+        imageInput.files = files.files;
+        cropper = null;
+        form.submit();
+    }, "image/png");
 });
 
 document.getElementById("delete_image")?.addEventListener("change", function () {
@@ -1,6 +1,8 @@
+import smtplib
 from celery import shared_task
-from django.template.loader import render_to_string
-from django.core.mail import EmailMultiAlternatives
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from .emails import close_connection, get_email_queue, render_message, send_messages
 
 
 @shared_task
@@ -26,14 +28,87 @@ def send_email(
         html_template_name (str): The name of the HTML template to render.
         txt_template_name (str): The name of the plain text template to render.
     """
-    email_context = {
-        "domain": domain,
-        "protocol": protocol,
-        "using_api": using_api,
-        "token": token,
-    }
-    body_html = render_to_string(html_template_name, email_context)
-    body_txt = render_to_string(txt_template_name, email_context)
-    email_obj = EmailMultiAlternatives(subject, body_txt, to=[email])
-    email_obj.attach_alternative(body_html, "text/html")
-    email_obj.send()
+    message = render_message(
+        email=email,
+        domain=domain,
+        protocol=protocol,
+        using_api=using_api,
+        token=token,
+        subject=subject,
+        html_template_name=html_template_name,
+        txt_template_name=txt_template_name,
+    )
+    send_messages([message])
+
+
+def is_permanent(exc: Exception) -> bool:
+    """
+    Whether sending the message again cannot succeed: the server refused it
+    with a 5xx reply, or it could not be rendered.
+    """
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return not isinstance(exc, (smtplib.SMTPException, OSError))
+
+
+@shared_task(bind=True, max_retries=5, acks_late=True, reject_on_worker_lost=True)
+def send_queued_emails(self):
+    """
+    Send the emails queued by queue_email, popped in batches of
+    EMAIL_BATCH_SIZE, one at a time over the connection of this worker.
+
+    Emails the server refuses for good are dropped. On a transient error the
+    emails of the batch not sent yet go back to the queue and the task retries,
+    or schedules a new task once out of retries.
+    """
+    queue = get_email_queue()
+    if queue is None:
+        return
+    if not queue.claim():
+        # Another worker is draining, check again once it's done.
+        if len(queue):
+            send_queued_emails.apply_async(countdown=settings.EMAIL_BATCH_DELAY)
+        return
+    try:
+        queue.recover()
+        queue.start_draining()
+        sent = dropped = 0
+        while batch := queue.pop(settings.EMAIL_BATCH_SIZE):
+            for i, (item, kwargs) in enumerate(batch):
+                try:
+                    sent += send_messages([render_message(**kwargs)])
+                except Exception as exc:
+                    if not is_permanent(exc):
+                        countdown = 30 * 2**self.request.retries
+                        queue.requeue([item for item, _ in batch[i:]], countdown)
+                        if self.request.retries >= self.max_retries:
+                            send_queued_emails.apply_async(countdown=countdown)
+                            raise
+                        raise self.retry(exc=exc, countdown=countdown)
+                    dropped += 1
+                    print(f"Dropped the email to {kwargs.get('email')}: {exc!r}")
+                queue.ack(item)
+    finally:
+        queue.release()
+    print(f"{sent} queued emails sent, {dropped} dropped.")
+
+
+def queue_email(**kwargs):
+    """
+    Send an email in the background, taking the arguments of send_email.
+
+    With EMAIL_QUEUE_REDIS_URL set, emails are queued and sent in batches
+    EMAIL_BATCH_DELAY seconds later, otherwise each one gets its own task.
+    """
+    queue = get_email_queue()
+    if queue is None:
+        send_email.delay(**kwargs)
+    elif queue.push(**kwargs):
+        send_queued_emails.apply_async(countdown=settings.EMAIL_BATCH_DELAY)
+
+
+@worker_process_shutdown.connect
+def close_email_connection(**kwargs):
+    close_connection()
@@ -0,0 +1,211 @@
+import os
+import smtplib
+from unittest import mock
+import pytest
+import redis
+from django.core import mail
+from account import emails
+from account.emails import get_email_queue, send_messages
+from account.tasks import queue_email, send_email, send_queued_emails
+
+EMAIL = {
+    "domain": "example.com",
+    "protocol": "https",
+    "using_api": True,
+    "token": "token",
+    "subject": "Blogosphere: Email Verification",
+    "html_template_name": "account/email/verification_resend_email.html",
+    "txt_template_name": "account/email/verification_resend_email.txt",
+}
+
+
+@pytest.fixture(autouse=True)
+def email_connection():
+    emails.close_connection()
+    yield
+    emails.close_connection()
+
+
+@pytest.fixture
+def email_queue(settings):
+    url = os.environ.get("TEST_EMAIL_QUEUE_REDIS_URL", "redis://localhost:6379/14")
+    client = redis.Redis.from_url(url, socket_connect_timeout=1)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("No Redis server for the email queue tests.")
+    client.flushdb()
+    settings.EMAIL_QUEUE_REDIS_URL = url
+    yield get_email_queue()
+    client.flushdb()
+
+
+class TestSendEmail:
+    def test_send_email(self):
+        send_email(email="user@example.com", **EMAIL)
+
+        assert len(mail.outbox) == 1
+        message = mail.outbox[0]
+        assert message.to == ["user@example.com"]
+        assert message.subject == EMAIL["subject"]
+        assert "token" in message.alternatives[0].content
+
+    def test_connection_is_reused(self):
+        with mock.patch("account.emails.get_connection", wraps=emails.get_connection) as get_connection:
+            send_email(email="first@example.com", **EMAIL)
+            send_email(email="second@example.com", **EMAIL)
+
+        get_connection.assert_called_once()
+        assert len(mail.outbox) == 2
+
+    def test_reconnects_after_disconnect(self):
+        send_email(email="first@example.com", **EMAIL)
+        connection = emails._connection
+        with mock.patch.object(
+            connection, "send_messages", side_effect=[smtplib.SMTPServerDisconnected, 1]
+        ) as send, mock.patch.object(connection, "close") as close:
+            assert send_messages([mail.EmailMessage(to=["second@example.com"])]) == 1
+        close.assert_called_once()
+        assert send.call_count == 2
+
+    def test_without_queue_each_email_gets_a_task(self, settings):
+        settings.EMAIL_QUEUE_REDIS_URL = ""
+        with mock.patch("account.tasks.send_email.delay") as delay:
+            queue_email(email="user@example.com", **EMAIL)
+        delay.assert_called_once_with(email="user@example.com", **EMAIL)
+
+
+class TestEmailQueue:
+    def test_burst_schedules_one_task(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async") as apply_async:
+            for i in range(3):
+                queue_email(email=f"user{i}@example.com", **EMAIL)
+
+        apply_async.assert_called_once()
+        assert len(email_queue) == 3
+
+    def test_queued_emails_are_sent_in_batches(self, email_queue, settings):
+        settings.EMAIL_BATCH_SIZE = 2
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            for i in range(5):
+                queue_email(email=f"user{i}@example.com", **EMAIL)
+
+        with mock.patch("account.tasks.send_messages", wraps=send_messages) as send:
+            send_queued_emails()
+
+        assert send.call_count == 5
+        assert [message.to[0] for message in mail.outbox] == [f"user{i}@example.com" for i in range(5)]
+        assert len(email_queue) == 0
+
+    def test_unsent_emails_are_requeued(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            for name in ("a", "b", "c"):
+                queue_email(email=f"{name}@example.com", **EMAIL)
+
+        with mock.patch(
+            "account.tasks.send_messages", side_effect=[1, smtplib.SMTPServerDisconnected, 1]
+        ), mock.patch.object(send_queued_emails, "retry", side_effect=RuntimeError):
+            with pytest.raises(RuntimeError):
+                send_queued_emails()
+
+        assert [kwargs["email"] for _, kwargs in email_queue.pop(10)] == ["b@example.com", "c@example.com"]
+
+    def test_refused_recipient_is_dropped(self, email_queue):
+        def refuse(messages):
+            if messages[0].to == ["bad@example.com"]:
+                raise smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"No such user")})
+            return send_messages(messages)
+
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            for name in ("a", "bad", "c"):
+                queue_email(email=f"{name}@example.com", **EMAIL)
+
+        with mock.patch("account.tasks.send_messages", side_effect=refuse), mock.patch.object(
+            send_queued_emails, "retry"
+        ) as retry:
+            send_queued_emails()
+
+        retry.assert_not_called()
+        assert [message.to[0] for message in mail.outbox] == ["a@example.com", "c@example.com"]
+        assert len(email_queue) == 0
+
+    def test_unrenderable_email_is_dropped(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            queue_email(email="a@example.com", **{**EMAIL, "html_template_name": "account/email/missing.html"})
+            queue_email(email="b@example.com", **EMAIL)
+
+        send_queued_emails()
+
+        assert [message.to[0] for message in mail.outbox] == ["b@example.com"]
+        assert len(email_queue) == 0
+
+    def test_greylisted_recipient_is_retried(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            queue_email(email="user@example.com", **EMAIL)
+
+        refused = smtplib.SMTPRecipientsRefused({"user@example.com": (451, b"Try again later")})
+        with mock.patch("account.tasks.send_messages", side_effect=refused), mock.patch.object(
+            send_queued_emails, "retry", side_effect=RuntimeError
+        ):
+            with pytest.raises(RuntimeError):
+                send_queued_emails()
+
+        assert [kwargs for _, kwargs in email_queue.pop(10)] == [{"email": "user@example.com", **EMAIL}]
+
+    def test_draining_allows_a_new_task(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async") as apply_async:
+            queue_email(email="first@example.com", **EMAIL)
+            send_queued_emails()
+            queue_email(email="second@example.com", **EMAIL)
+
+        assert apply_async.call_count == 2
+
+    def test_requeue_keeps_the_task_scheduled(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async") as apply_async:
+            queue_email(email="first@example.com", **EMAIL)
+            with mock.patch(
+                "account.tasks.send_messages", side_effect=smtplib.SMTPServerDisconnected
+            ), mock.patch.object(send_queued_emails, "retry", side_effect=RuntimeError):
+                with pytest.raises(RuntimeError):
+                    send_queued_emails()
+            queue_email(email="second@example.com", **EMAIL)
+
+        apply_async.assert_called_once()
+
+    def test_out_of_retries_schedules_a_new_task(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            queue_email(email="user@example.com", **EMAIL)
+
+        with mock.patch("account.tasks.send_messages", side_effect=smtplib.SMTPServerDisconnected), mock.patch.object(
+            send_queued_emails, "max_retries", 0
+        ), mock.patch("account.tasks.send_queued_emails.apply_async") as apply_async:
+            with pytest.raises(smtplib.SMTPServerDisconnected):
+                send_queued_emails()
+
+        apply_async.assert_called_once_with(countdown=30)
+        assert len(email_queue) == 1
+
+    def test_emails_of_a_dead_worker_are_sent(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            for name in ("a", "b", "c"):
+                queue_email(email=f"{name}@example.com", **EMAIL)
+        # Popped by a worker that died before sending them.
+        email_queue.pop(2)
+
+        send_queued_emails()
+
+        assert [message.to[0] for message in mail.outbox] == ["a@example.com", "b@example.com", "c@example.com"]
+        assert len(email_queue) == 0
+        assert email_queue.pop(10) == []
+
+    def test_one_task_drains_at_a_time(self, email_queue):
+        with mock.patch("account.tasks.send_queued_emails.apply_async"):
+            queue_email(email="user@example.com", **EMAIL)
+        assert get_email_queue().claim()
+
+        with mock.patch("account.tasks.send_queued_emails.apply_async") as apply_async:
+            send_queued_emails()
+
+        assert mail.outbox == []
+        apply_async.assert_called_once()
+        assert len(email_queue) == 1
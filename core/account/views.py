@@ -18,7 +18,7 @@ from .forms import (
 from jwt_token.models import Token
 from .models import User
 from .mixins import VerifiedUserRequiredMixin
-from .tasks import send_email
+from .tasks import queue_email
 
 
 class SignUpView(FormView):
@@ -43,7 +43,7 @@ class VerificationResendView(LoginRequiredMixin, RedirectView):
         protocol = "https" if request.is_secure() else "http"
         token = Token.make_token(request.user)
 
-        send_email.delay(
+        queue_email(
             email=request.user.email,
             domain=domain,
             protocol=protocol,
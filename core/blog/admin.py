@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Post, Category
+from .models import Post, Category, TrendingPost
 
 
 @admin.register(Category)
@@ -9,6 +9,12 @@ class CategoryAdmin(admin.ModelAdmin):
 
 @admin.register(Post)
 class PostAdmin(admin.ModelAdmin):
-    list_display = ("title", "author", "published", "created_at")
+    list_display = ("title", "author", "published", "comment_count", "created_at")
     list_filter = ("published", "created_at")
     search_fields = ("title", "content")
+
+
+@admin.register(TrendingPost)
+class TrendingPostAdmin(admin.ModelAdmin):
+    list_display = ("rank", "post", "score", "scored_at")
+    list_select_related = ("post",)
@@ -0,0 +1,16 @@
+from rest_framework.filters import SearchFilter
+from blog.search import get_search_backend
+
+
+class PostSearchFilter(SearchFilter):
+    """
+    Search posts through the full-text index, most relevant first.
+    Falls back to SearchFilter's lookups on databases without an index.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        backend = get_search_backend(queryset.db)
+        if not terms or backend is None:
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, " ".join(terms))
@@ -0,0 +1,95 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+class SparseFieldsetSerializerMixin:
+    """
+    Serializer mixin that keeps only the fields named in the ``fields`` argument.
+
+    Serializers can list the model columns needed by fields which don't read a
+    column of their own in ``Meta.sparse_field_sources``.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def get_field_sources(self, name: str) -> list[str]:
+        sources = getattr(self.Meta, "sparse_field_sources", {})
+        if name in sources:
+            return list(sources[name])
+        source = self.fields[name].source
+        # Method fields (source "*") get the whole instance, which only holds the pk.
+        return [] if source == "*" else [source.split(".")[0]]
+
+
+class SparseFieldsetMixin:
+    """
+    Let clients of read endpoints choose the serialized fields with
+    ``?fields=a,b`` or drop some with ``?omit=a,b``.
+
+    Only the columns behind the selected fields (plus the primary key and the
+    default ordering) are loaded, unselected fields are never computed.
+    """
+
+    fields_param = "fields"
+    omit_param = "omit"
+
+    def get_sparse_fields(self) -> list[str] | None:
+        """
+        Return the names of the selected fields, or None when the whole
+        representation is requested.
+        """
+        if hasattr(self, "_sparse_fields"):
+            return self._sparse_fields
+
+        self._sparse_fields = None
+        request = self.request
+        params = getattr(request, "query_params", {})
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+
+        requested = [name.strip() for name in params.get(self.fields_param, "").split(",") if name.strip()]
+        omitted = [name.strip() for name in params.get(self.omit_param, "").split(",") if name.strip()]
+        if not requested and not omitted:
+            return None
+
+        available = list(self.get_serializer_class()().fields)
+        errors = {}
+        for param, names in ((self.fields_param, requested), (self.omit_param, omitted)):
+            unknown = [name for name in names if name not in available]
+            if unknown:
+                errors[param] = [f"Unknown field(s): {', '.join(unknown)}."]
+        if errors:
+            raise ValidationError(errors)
+
+        self._sparse_fields = [
+            name for name in available if (not requested or name in requested) and name not in omitted
+        ]
+        return self._sparse_fields
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        if fields is None:
+            return queryset
+
+        serializer = self.get_serializer_class()()
+        model = queryset.model
+        columns = {field.name for field in model._meta.concrete_fields}
+        loaded = {model._meta.pk.name} | {field.lstrip("-") for field in model._meta.ordering}
+        for name in fields:
+            sources = serializer.get_field_sources(name)
+            if not columns.issuperset(sources):
+                # The field reads something else than a column, load everything.
+                return queryset
+            loaded.update(sources)
+        return queryset.only(*loaded)
@@ -1,5 +1,10 @@
-from rest_framework.pagination import PageNumberPagination
+import math
+from rest_framework.pagination import PageNumberPagination, BasePagination
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param, remove_query_param
+from blog.paginators import KeysetPaginator, InvalidCursor
+from blog import trending
 
 
 class PostPagination(PageNumberPagination):
@@ -25,3 +30,97 @@ class PostPagination(PageNumberPagination):
                 "results": data,
             }
         )
+
+
+class PostCursorPagination(BasePagination):
+    """
+    Keyset pagination for blog posts ordered by ``(created_at, id)``.
+    The total count is only computed when requested with ``?count=true``.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        with_count = request.query_params.get(self.count_query_param, "").lower() in ("1", "true")
+        paginator = KeysetPaginator(queryset, self.get_page_size(request))
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param), with_count=with_count)
+        except InvalidCursor as e:
+            raise NotFound(str(e))
+        return list(self.page)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = remove_query_param(self.request.build_absolute_uri(), "page")
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        response = {
+            "links": {
+                "next": self.get_link(self.page.next_cursor),
+                "previous": self.get_link(self.page.previous_cursor),
+            },
+        }
+        if self.page.count is not None:
+            response["total_items"] = self.page.count
+        response["results"] = data
+        return Response(response)
+
+
+class TrendingPagination(BasePagination):
+    """
+    Page through the precomputed trending feed. The ids of a page come from
+    the cache (or the snapshot table) and only the posts of that page are read.
+    """
+
+    page_query_param = "page"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            self.number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound("Invalid page.")
+        if self.number < 1:
+            raise NotFound("Invalid page.")
+        post_ids, self.count = trending.get_page(self.number)
+        if not post_ids and self.number > 1:
+            raise NotFound("Invalid page.")
+        # Keep the rank order, posts deleted since the last run are skipped.
+        posts = queryset.in_bulk(post_ids)
+        return [posts[pk] for pk in post_ids if pk in posts]
+
+    def get_page_link(self, number):
+        if number < 1 or (number - 1) * trending.PAGE_SIZE >= self.count:
+            return None
+        url = self.request.build_absolute_uri()
+        if number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "links": {
+                    "next": self.get_page_link(self.number + 1),
+                    "previous": self.get_page_link(self.number - 1),
+                },
+                "total_items": self.count,
+                "total_pages": math.ceil(self.count / trending.PAGE_SIZE),
+                "current_page": self.number,
+                "results": data,
+            }
+        )
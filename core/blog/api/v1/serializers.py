@@ -2,6 +2,8 @@ from rest_framework import serializers
 from django.urls import reverse
 from account.api.v1.serializers import ProfileSerializer
 from blog.models import Category, Post
+from images.serializers import ImageUploadField, SrcsetField
+from .mixins import SparseFieldsetSerializerMixin
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -15,14 +17,16 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for blog posts.
     """
 
     relative_url = serializers.SerializerMethodField(method_name="get_relative_url")
     absolute_url = serializers.SerializerMethodField(method_name="get_absolute_url")
-    comments_count = serializers.IntegerField(source="comments.count", read_only=True)
+    comments_count = serializers.IntegerField(source="comment_count", read_only=True)
+    image = ImageUploadField(required=False, allow_null=True)
+    image_srcset = SrcsetField()
 
     def get_relative_url(self, obj):
         return reverse("post:api-v1:posts-detail", kwargs={"pk": obj.pk})
@@ -39,6 +43,7 @@ class PostSerializer(serializers.ModelSerializer):
             "category",
             "author",
             "image",
+            "image_srcset",
             "content",
             "published",
             "created_at",
@@ -48,15 +53,58 @@ class PostSerializer(serializers.ModelSerializer):
             "comments_count",
         ]
         read_only_fields = ["id", "author", "created_at", "updated_at", "published", "comments_count"]
+        sparse_field_sources = {"image_srcset": ["image", "image_renditions"]}
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
-        if rep["category"]:
+        if rep.get("category"):
             rep["category"] = CategorySerializer(instance.category).data
-        if rep["author"]:
+        if rep.get("author"):
             rep["author"] = ProfileSerializer(instance.author).data
         return rep
 
     def create(self, validated_data):
         validated_data["author"] = self.context["request"].user
         return super().create(validated_data)
+
+
+class PostSummarySerializer(PostSerializer):
+    """
+    Serializer for blog posts in lists, with an excerpt instead of the full content.
+    """
+
+    class Meta(PostSerializer.Meta):
+        fields = [field if field != "content" else "excerpt" for field in PostSerializer.Meta.fields]
+        read_only_fields = PostSerializer.Meta.read_only_fields + ["excerpt"]
+
+
+class BulkCategoryField(serializers.PrimaryKeyRelatedField):
+    """
+    Category field that looks categories up in the ``categories`` context,
+    loaded once for a whole bulk request, instead of one query per item.
+    """
+
+    def to_internal_value(self, data):
+        categories = self.context.get("categories")
+        if categories is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return categories[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class PostBulkSerializer(PostSerializer):
+    """
+    Serializer for the items of the bulk endpoint. Images can't be sent in a
+    JSON array, they are set through the regular endpoints.
+    """
+
+    category = BulkCategoryField(queryset=Category.objects.all(), required=False, allow_null=True)
+
+    class Meta(PostSerializer.Meta):
+        fields = [field for field in PostSerializer.Meta.fields if field != "image"]
@@ -0,0 +1,126 @@
+import pytest
+from rest_framework.test import APIClient
+from rest_framework import status
+from django.urls import reverse
+from django.core.cache import cache
+from blog.models import Post, Category
+from blog.cache import get_stats
+from account.models import User
+from comment.models import Comment
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def api_client() -> APIClient:
+    return APIClient()
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create_user(
+        username="testuser", email="testuser@example.com", password="testpassword", is_verified=True
+    )
+
+
+@pytest.fixture
+def category() -> Category:
+    return Category.objects.create(name="Test Category", color="#FFFFFF")
+
+
+@pytest.fixture
+def post(user: User, category: Category) -> Post:
+    return Post.objects.create(title="Test Post", content="This is a test post.", author=user, category=category)
+
+
+@pytest.mark.django_db
+class TestVersionedCache:
+    def test_repeated_reads_hit_the_cache(self, api_client: APIClient, post: Post):
+        url = reverse("post:api-v1:posts-detail", args=[post.pk])
+        api_client.get(url)
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert get_stats()["hits"] == 1
+        assert get_stats()["misses"] == 1
+
+    def test_post_update_invalidates_detail_and_list(
+        self, api_client: APIClient, post: Post, django_capture_on_commit_callbacks
+    ):
+        detail_url = reverse("post:api-v1:posts-detail", args=[post.pk])
+        list_url = reverse("post:api-v1:posts-list")
+        api_client.get(detail_url)
+        api_client.get(list_url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.title = "Updated Title"
+            post.save()
+
+        assert api_client.get(detail_url).data["title"] == "Updated Title"
+        assert api_client.get(list_url).data["results"][0]["title"] == "Updated Title"
+        assert get_stats()["hits"] == 0
+
+    def test_comment_invalidates_post_count(
+        self, api_client: APIClient, user: User, post: Post, django_capture_on_commit_callbacks
+    ):
+        url = reverse("post:api-v1:posts-detail", args=[post.pk])
+        assert api_client.get(url).data["comments_count"] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Comment.objects.create(content="Comment", author=user, post=post)
+
+        assert api_client.get(url).data["comments_count"] == 1
+
+    def test_category_update_invalidates_posts(
+        self, api_client: APIClient, post: Post, category: Category, django_capture_on_commit_callbacks
+    ):
+        url = reverse("post:api-v1:posts-detail", args=[post.pk])
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            category.name = "Renamed"
+            category.save()
+
+        assert api_client.get(url).data["category"]["name"] == "Renamed"
+
+    def test_unrelated_post_stays_cached(
+        self, api_client: APIClient, user: User, post: Post, django_capture_on_commit_callbacks
+    ):
+        url = reverse("post:api-v1:posts-detail", args=[post.pk])
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Post.objects.create(title="Other", content="Content", author=user)
+
+        api_client.get(url)
+        assert get_stats()["hits"] == 1
+
+    def test_author_update_invalidates_posts_and_feeds(
+        self, api_client: APIClient, user: User, post: Post, django_capture_on_commit_callbacks
+    ):
+        Post.objects.filter(pk=post.pk).update(published=True)
+        url = reverse("post:api-v1:posts-detail", args=[post.pk])
+        feed_url = reverse("syndication:rss")
+        api_client.get(url)
+        assert "testuser" in api_client.get(feed_url).content.decode()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            user.username = "renamed"
+            user.save()
+
+        assert api_client.get(url).data["author"]["username"] == "renamed"
+        assert "renamed" in api_client.get(feed_url).content.decode()
+
+    def test_login_keeps_posts_cached(
+        self, api_client: APIClient, user: User, post: Post, django_capture_on_commit_callbacks
+    ):
+        url = reverse("post:api-v1:posts-detail", args=[post.pk])
+        api_client.get(url)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.login(username="testuser", password="testpassword")
+
+        api_client.get(url)
+        assert get_stats()["hits"] == 1
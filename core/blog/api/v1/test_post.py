@@ -1,9 +1,34 @@
+import asyncio
+import json
+import time
+import warnings
+from base64 import b64encode
+import os
+from io import StringIO
+from datetime import datetime, timedelta
+from unittest import mock
 import pytest
+import redis
+from asgiref.sync import async_to_sync
 from rest_framework.test import APIClient
 from rest_framework import status
 from django.urls import reverse
-from blog.models import Post, Category
+from django.utils.http import http_date
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connection
+from django.test.utils import CaptureQueriesContext
+from django.core.management import call_command, CommandError
+from blog.models import Post, Category, TrendingPost, EXCERPT_LENGTH
+from blog.trending import update_trending, PAGE_SIZE
+from blog.feeds import get_feed_store, score
+from blog.export import export_lines
+from blog.api.v1.serializers import PostBulkSerializer
+from images.signals import renditions_updated
 from account.models import User
+from comment.models import Comment
 
 
 @pytest.fixture
@@ -182,3 +207,673 @@ class TestPostAPI:
         url = reverse("post:api-v1:posts-detail", args=[post.pk])
         response = api_client.delete(url)
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestPostCursorPagination:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def posts(self, user: User) -> list[Post]:
+        return [Post.objects.create(title=f"Post {i}", content="Content", author=user) for i in range(5)]
+
+    def test_cursor_pages_walk_the_feed(self, api_client: APIClient, posts: list[Post]):
+        url = reverse("post:api-v1:posts-list")
+        response = api_client.get(url, {"pagination": "cursor", "page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert "total_items" not in response.data
+        assert response.data["links"]["previous"] is None
+
+        seen = [item["id"] for item in response.data["results"]]
+        next_link = response.data["links"]["next"]
+        while next_link:
+            response = api_client.get(next_link)
+            assert response.status_code == status.HTTP_200_OK
+            seen += [item["id"] for item in response.data["results"]]
+            next_link = response.data["links"]["next"]
+
+        assert seen == [post.id for post in reversed(posts)]
+
+        response = api_client.get(response.data["links"]["previous"])
+        assert [item["id"] for item in response.data["results"]] == [posts[2].id, posts[1].id]
+
+    def test_cursor_count_on_request(self, api_client: APIClient, posts: list[Post]):
+        url = reverse("post:api-v1:posts-list")
+        response = api_client.get(url, {"pagination": "cursor", "count": "true"})
+        assert response.data["total_items"] == len(posts)
+
+    def test_invalid_cursor(self, api_client: APIClient, posts: list[Post]):
+        url = reverse("post:api-v1:posts-list")
+        response = api_client.get(url, {"cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestPostQueryCount:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def posts(self, user: User, category: Category) -> list[Post]:
+        posts = []
+        for i in range(20):
+            post = Post.objects.create(title=f"Post {i}", content="Content", author=user, category=category)
+            Comment.objects.create(content="Comment", author=user, post=post)
+            posts.append(post)
+        return posts
+
+    def count_list_queries(self, api_client: APIClient, page_size: int) -> int:
+        with CaptureQueriesContext(connection) as ctx:
+            response = api_client.get(reverse("post:api-v1:posts-list"), {"page_size": page_size})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == page_size
+        return len(ctx.captured_queries)
+
+    def test_list_query_count_is_flat(self, api_client: APIClient, posts: list[Post]):
+        assert self.count_list_queries(api_client, 1) == self.count_list_queries(api_client, 20)
+
+    def test_list_comments_count(self, api_client: APIClient, posts: list[Post]):
+        response = api_client.get(reverse("post:api-v1:posts-list"))
+        assert all(item["comments_count"] == 1 for item in response.data["results"])
+
+
+@pytest.mark.django_db
+class TestPostSearch:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def search(self, api_client: APIClient, query: str) -> list[int]:
+        response = api_client.get(reverse("post:api-v1:posts-list"), {"search": query})
+        assert response.status_code == status.HTTP_200_OK
+        return [item["id"] for item in response.data["results"]]
+
+    def test_search_ranks_title_matches_first(self, api_client: APIClient, user: User):
+        body_match = Post.objects.create(title="Travel notes", content="Cooking pasta at the camp.", author=user)
+        title_match = Post.objects.create(title="Pasta recipes", content="Boil the water first.", author=user)
+        Post.objects.create(title="Unrelated", content="Nothing to see here.", author=user)
+        assert self.search(api_client, "pasta") == [title_match.id, body_match.id]
+
+    def test_search_index_follows_updates_and_deletes(self, api_client: APIClient, post: Post):
+        post.title = "Quantum gardening"
+        post.save()
+        assert self.search(api_client, "quantum") == [post.id]
+
+        post.delete()
+        cache.clear()
+        assert self.search(api_client, "quantum") == []
+
+    def test_rebuild_search_index(self, api_client: APIClient, user: User):
+        post = Post.objects.create(title="Hidden", content="Stale index", author=user)
+        Post.objects.filter(pk=post.pk).update(title="Rediscovered")
+        call_command("rebuild_search_index", batch_size=1, stdout=StringIO())
+        assert self.search(api_client, "rediscovered") == [post.id]
+
+
+@pytest.mark.django_db
+class TestPostExcerpt:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def long_post(self, user: User, category: Category) -> Post:
+        return Post.objects.create(title="Long Post", content="word " * 1000, author=user, category=category)
+
+    def test_excerpt_is_computed_on_save(self, long_post: Post):
+        assert len(long_post.excerpt) == EXCERPT_LENGTH
+        long_post.content = "Short content."
+        long_post.save(update_fields=["content"])
+        long_post.refresh_from_db()
+        assert long_post.excerpt == "Short content."
+
+    def test_list_returns_excerpt_only(self, api_client: APIClient, long_post: Post):
+        url = reverse("post:api-v1:posts-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        item = response.data["results"][0]
+        assert item["excerpt"] == long_post.excerpt
+        assert "content" not in item
+        assert not any('"blog_post"."content"' in query["sql"] for query in queries.captured_queries)
+
+    def test_detail_returns_full_content(self, api_client: APIClient, long_post: Post):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": long_post.pk})
+        response = api_client.get(url)
+        assert response.data["content"] == long_post.content
+
+    def test_backfill_excerpts(self, long_post: Post):
+        Post.objects.filter(pk=long_post.pk).update(excerpt="")
+        out = StringIO()
+        call_command("backfill_excerpts", stdout=out)
+        long_post.refresh_from_db()
+        assert len(long_post.excerpt) == EXCERPT_LENGTH
+        assert "1 posts updated" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestPostSparseFieldsets:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def test_fields_trim_representation_and_columns(self, api_client: APIClient, post: Post):
+        url = reverse("post:api-v1:posts-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "id,title,created_at"})
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["results"][0]) == {"id", "title", "created_at"}
+        sql = queries.captured_queries[-1]["sql"]
+        assert '"blog_post"."excerpt"' not in sql
+        assert "account_user" not in sql and "blog_category" not in sql
+
+    def test_omit(self, api_client: APIClient, post: Post):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": post.pk})
+        response = api_client.get(url, {"omit": "author,category,content"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "author" not in response.data and "content" not in response.data
+        assert response.data["title"] == post.title
+
+    def test_nested_fields_still_expanded(self, api_client: APIClient, post: Post):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": post.pk})
+        response = api_client.get(url, {"fields": "id,category"})
+        assert response.data["category"]["name"] == post.category.name
+
+    def test_cursor_pagination_with_fields(self, api_client: APIClient, user: User):
+        Post.objects.bulk_create(Post(title=f"Post {i}", content="Content", author=user) for i in range(3))
+        url = reverse("post:api-v1:posts-list")
+        response = api_client.get(url, {"pagination": "cursor", "fields": "title"})
+        assert len(response.data["results"]) == 3
+        assert set(response.data["results"][0]) == {"title"}
+
+    def test_unknown_field(self, api_client: APIClient, post: Post):
+        url = reverse("post:api-v1:posts-list")
+        response = api_client.get(url, {"fields": "id,secret"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "fields" in response.data
+
+
+@pytest.mark.django_db
+class TestPostConditionalGet:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    def test_detail_not_modified(self, api_client: APIClient, post: Post):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": post.pk})
+        response = api_client.get(url)
+        assert response.has_header("ETag")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert len(queries) == 1
+
+    def test_detail_has_no_last_modified(
+        self, api_client: APIClient, user: User, post: Post, django_capture_on_commit_callbacks
+    ):
+        # Comments change the count without moving updated_at.
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": post.pk})
+        response = api_client.get(url)
+        assert not response.has_header("Last-Modified")
+        with django_capture_on_commit_callbacks(execute=True):
+            Comment.objects.create(content="New comment", author=user, post=post)
+
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["comments_count"] == 1
+
+    def test_detail_etag_changes_with_renditions(
+        self, api_client: APIClient, post: Post, django_capture_on_commit_callbacks
+    ):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": post.pk})
+        old_etag = api_client.get(url)["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            renditions_updated.send(sender=Post, pk=post.pk)
+
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=old_etag).status_code == status.HTTP_200_OK
+
+    def test_detail_etag_changes_with_post(
+        self, api_client: APIClient, user: User, post: Post, django_capture_on_commit_callbacks
+    ):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": post.pk})
+        old_etag = api_client.get(url)["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            Comment.objects.create(content="New comment", author=user, post=post)
+
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=old_etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["comments_count"] == 1
+        assert response["ETag"] != old_etag
+
+    def test_etag_depends_on_fields(self, api_client: APIClient, post: Post):
+        url = reverse("post:api-v1:posts-detail", kwargs={"pk": post.pk})
+        etag = api_client.get(url)["ETag"]
+        response = api_client.get(url, {"fields": "id"}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_not_modified_until_a_write(
+        self, api_client: APIClient, user: User, post: Post, django_capture_on_commit_callbacks
+    ):
+        url = reverse("post:api-v1:posts-list")
+        etag = api_client.get(url)["ETag"]
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Post.objects.create(title="Another Post", content="Content", author=user)
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestTrendingPosts:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def posts(self, user: User) -> list[Post]:
+        return [Post.objects.create(title=f"Post {i}", content="Content", author=user) for i in range(3)]
+
+    def comment(self, post: Post, user: User, age: timedelta = timedelta()) -> Comment:
+        comment = Comment.objects.create(post=post, author=user, content="Comment")
+        Comment.objects.filter(pk=comment.pk).update(published_at=datetime.now() - age)
+        return comment
+
+    def test_recent_activity_ranks_first(self, user: User, posts: list[Post]):
+        for _ in range(3):
+            self.comment(posts[0], user, age=timedelta(days=3))
+        self.comment(posts[1], user)
+        self.comment(posts[1], user)
+
+        assert update_trending() == 2
+        ranking = list(TrendingPost.objects.values_list("post_id", "rank"))
+        assert ranking == [(posts[1].pk, 1), (posts[0].pk, 2)]
+        assert TrendingPost.objects.get(post=posts[1]).score == pytest.approx(2, rel=1e-3)
+
+    def test_incremental_run_decays_and_adds(self, user: User, posts: list[Post]):
+        self.comment(posts[0], user)
+        now = datetime.now()
+        update_trending(now)
+
+        self.comment(posts[1], user)
+        later = now + timedelta(hours=settings.TRENDING_HALF_LIFE)
+        with CaptureQueriesContext(connection) as queries:
+            update_trending(later)
+        # Only the comment published since the previous run is read.
+        comment_reads = [q["sql"] for q in queries if "comment_comment" in q["sql"] and "published_at" in q["sql"]]
+        assert len(comment_reads) == 1 and '"id" >' in comment_reads[0]
+
+        scores = dict(TrendingPost.objects.values_list("post_id", "score"))
+        assert scores[posts[0].pk] == pytest.approx(0.5, rel=1e-3)
+        assert list(TrendingPost.objects.values_list("post_id", flat=True)) == [posts[1].pk, posts[0].pk]
+
+    def test_endpoint_serves_ranked_pages(self, api_client: APIClient, user: User):
+        posts = [Post.objects.create(title=f"Post {i}", content="Content", author=user) for i in range(PAGE_SIZE + 2)]
+        for i, post in enumerate(posts):
+            self.comment(post, user, age=timedelta(hours=i))
+        update_trending()
+
+        url = reverse("post:api-v1:trending")
+        response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["total_items"] == len(posts)
+        assert response.data["total_pages"] == 2
+        assert [item["id"] for item in response.data["results"]] == [post.pk for post in posts[:PAGE_SIZE]]
+        assert "content" not in response.data["results"][0]
+
+        response = api_client.get(response.data["links"]["next"])
+        assert [item["id"] for item in response.data["results"]] == [post.pk for post in posts[PAGE_SIZE:]]
+        assert response.data["links"]["next"] is None
+
+        assert api_client.get(url, {"page": 3}).status_code == status.HTTP_404_NOT_FOUND
+        assert api_client.get(url, {"page": "x"}).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_page_from_cache_is_one_lookup(self, api_client: APIClient, user: User, posts: list[Post]):
+        for post in posts:
+            self.comment(post, user)
+        update_trending()
+
+        url = reverse("post:api-v1:trending")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        assert response.data["total_items"] == len(posts)
+        # Only the posts of the page are read, the ranking comes from the cache.
+        assert len(queries) == 1
+
+    def test_falls_back_to_snapshot(self, api_client: APIClient, user: User, posts: list[Post]):
+        self.comment(posts[2], user)
+        self.comment(posts[2], user)
+        self.comment(posts[0], user)
+        update_trending()
+        cache.clear()
+
+        response = api_client.get(reverse("post:api-v1:trending"))
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [posts[2].pk, posts[0].pk]
+        assert response.data["total_items"] == 2
+
+    def test_deleted_post_is_skipped(self, api_client: APIClient, user: User, posts: list[Post]):
+        for post in posts:
+            self.comment(post, user)
+        update_trending()
+        posts[0].delete()
+
+        response = api_client.get(reverse("post:api-v1:trending"))
+        assert posts[0].pk not in [item["id"] for item in response.data["results"]]
+
+
+@pytest.fixture
+def feed_store(settings):
+    url = os.environ.get("TEST_CATEGORY_FEED_REDIS_URL", "redis://localhost:6379/15")
+    client = redis.Redis.from_url(url, socket_connect_timeout=1)
+    try:
+        client.ping()
+    except redis.RedisError:
+        pytest.skip("No Redis server for the category feed tests.")
+    client.flushdb()
+    settings.CATEGORY_FEED_REDIS_URL = url
+    yield get_feed_store()
+    client.flushdb()
+
+
+@pytest.mark.django_db
+class TestCategoryFeed:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def posts(self, user: User, category: Category) -> list[Post]:
+        return [
+            Post.objects.create(title=f"Post {i}", content="Content", author=user, category=category) for i in range(3)
+        ]
+
+    def test_score_is_exact(self):
+        created_at = datetime(2025, 3, 1, 12, 30, 15, 123456)
+        assert score(created_at) - score(created_at - timedelta(microseconds=1)) == 1
+
+    def test_rebuild_requires_redis(self, settings):
+        settings.CATEGORY_FEED_REDIS_URL = ""
+        with pytest.raises(CommandError):
+            call_command("rebuild_category_feeds", stdout=StringIO())
+
+    def test_served_from_store(self, api_client: APIClient, feed_store, posts: list[Post], category: Category):
+        call_command("rebuild_category_feeds", stdout=StringIO())
+        url = reverse("post:api-v1:posts-list")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"category": category.pk, "page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [posts[2].pk, posts[1].pk]
+        assert response.data["total_items"] == 3
+        # Only the posts of the page are read, in a single query.
+        assert len(queries) == 1
+
+        response = api_client.get(response.data["links"]["next"])
+        assert [item["id"] for item in response.data["results"]] == [posts[0].pk]
+
+    def test_signals_keep_sets_in_sync(
+        self, feed_store, django_capture_on_commit_callbacks, user: User, posts: list[Post], category: Category
+    ):
+        feed_store.rebuild()
+        with django_capture_on_commit_callbacks(execute=True):
+            other = Category.objects.create(name="Other")
+            new = Post.objects.create(title="New", content="Content", author=user, category=category)
+        assert feed_store.range(category.pk, 0, None) == [new.pk, posts[2].pk, posts[1].pk, posts[0].pk]
+        assert feed_store.has_category(other.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            posts[2].category = other
+            posts[2].save()
+            posts[1].delete()
+        assert feed_store.range(category.pk, 0, None) == [new.pk, posts[0].pk]
+        assert feed_store.range(other.pk, 0, None) == [posts[2].pk]
+
+        other_id = other.pk
+        with django_capture_on_commit_callbacks(execute=True):
+            other.delete()
+        assert not feed_store.has_category(other_id)
+        assert feed_store.count(other_id) == 0
+
+    def test_bulk_writes_update_sets(
+        self, api_client: APIClient, feed_store, django_capture_on_commit_callbacks, user: User, category: Category
+    ):
+        feed_store.rebuild()
+        api_client.force_authenticate(user=user)
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                reverse("post:api-v1:posts-bulk"),
+                [{"title": f"Post {i}", "content": "Content", "category": category.pk} for i in range(2)],
+                format="json",
+            )
+        created = [result["data"]["id"] for result in response.data["results"]]
+        assert sorted(feed_store.range(category.pk, 0, None)) == sorted(created)
+
+    @pytest.mark.parametrize("method", ["zcard", "zrevrange"])
+    def test_falls_back_to_db_when_redis_fails(
+        self, api_client: APIClient, feed_store, posts: list[Post], category: Category, method: str
+    ):
+        feed_store.rebuild()
+        url = reverse("post:api-v1:posts-list")
+        with mock.patch.object(feed_store.client, method, side_effect=redis.ConnectionError):
+            response = api_client.get(url, {"category": category.pk, "page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["id"] for item in response.data["results"]] == [posts[2].pk, posts[1].pk]
+        assert response.data["total_items"] == 3
+
+    def test_falls_back_to_db(self, api_client: APIClient, feed_store, posts: list[Post], category: Category):
+        url = reverse("post:api-v1:posts-list")
+        # Not rebuilt yet, the sets may be incomplete.
+        response = api_client.get(url, {"category": category.pk})
+        assert [item["id"] for item in response.data["results"]] == [post.pk for post in reversed(posts)]
+
+        feed_store.rebuild()
+        response = api_client.get(url, {"category": 0})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.get(url, {"category": category.pk, "search": "Content"})
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+class TestPostBulk:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        cache.clear()
+
+    @pytest.fixture
+    def other_post(self, user: User, category: Category) -> Post:
+        return Post.objects.create(title="Other", content="Content", author=user, category=category, published=True)
+
+    def post_bulk(self, api_client: APIClient, items):
+        return api_client.post(reverse("post:api-v1:posts-bulk"), items, format="json")
+
+    def test_requires_verified_user(self, api_client: APIClient, unverified_user: User, category: Category):
+        items = [{"title": "New", "content": "Content", "category": category.pk}]
+        assert self.post_bulk(api_client, items).status_code == status.HTTP_403_FORBIDDEN
+        api_client.force_authenticate(user=unverified_user)
+        assert self.post_bulk(api_client, items).status_code == status.HTTP_403_FORBIDDEN
+        assert not Post.objects.exists()
+
+    def test_create_in_constant_queries(self, api_client: APIClient, user: User, category: Category):
+        api_client.force_authenticate(user=user)
+
+        def create(count: int) -> int:
+            items = [{"title": f"Post {i}", "content": "word " * 100, "category": category.pk} for i in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.post_bulk(api_client, items)
+            assert response.status_code == status.HTTP_200_OK
+            assert [result["status"] for result in response.data["results"]] == [201] * count
+            return len(queries)
+
+        assert create(2) == create(20)
+        assert Post.objects.filter(author=user, category=category).count() == 22
+        post = Post.objects.last()
+        assert post.excerpt and len(post.excerpt) <= EXCERPT_LENGTH
+
+    def test_per_item_results(self, api_client: APIClient, user: User, unverified_user: User, post: Post):
+        other = Post.objects.create(title="Other", content="Content", author=unverified_user)
+        api_client.force_authenticate(user=user)
+        response = self.post_bulk(
+            api_client,
+            [
+                {"id": post.pk, "title": "Renamed", "content": "New content"},
+                {"id": other.pk, "title": "Hijacked"},
+                {"id": 0, "title": "Missing"},
+                {"title": "No content"},
+                {"title": "Bad category", "content": "Content", "category": 0},
+                {"title": "Created", "content": "Content"},
+                {"id": post.pk, "title": "Twice"},
+            ],
+        )
+        statuses = [result["status"] for result in response.data["results"]]
+        assert statuses == [200, 403, 404, 400, 400, 201, 400]
+        assert "content" in response.data["results"][3]["errors"]
+        assert "category" in response.data["results"][4]["errors"]
+
+        post.refresh_from_db()
+        assert (post.title, post.content, post.excerpt) == ("Renamed", "New content", "New content")
+        assert Post.objects.get(pk=other.pk).title == "Other"
+        assert Post.objects.filter(title="Created", author=user).exists()
+
+    def test_updates_only_write_sent_fields(self, api_client: APIClient, user: User, post: Post, other_post: Post):
+        is_valid = PostBulkSerializer.is_valid
+
+        def edit_meanwhile(serializer, *args, **kwargs):
+            # Columns an item doesn't send change after the posts were loaded.
+            Post.objects.filter(pk__in=[post.pk, other_post.pk]).update(title="Edited", content="Edited", category=None)
+            return is_valid(serializer, *args, **kwargs)
+
+        api_client.force_authenticate(user=user)
+        with mock.patch.object(PostBulkSerializer, "is_valid", edit_meanwhile):
+            response = self.post_bulk(
+                api_client, [{"id": post.pk, "title": "Renamed"}, {"id": other_post.pk, "content": "New content"}]
+            )
+        assert [result["status"] for result in response.data["results"]] == [200, 200]
+
+        post.refresh_from_db()
+        other_post.refresh_from_db()
+        assert (post.title, post.content, post.category_id) == ("Renamed", "Edited", None)
+        assert (other_post.title, other_post.content, other_post.category_id) == ("Edited", "New content", None)
+
+    def test_rejects_non_list(self, api_client: APIClient, user: User):
+        api_client.force_authenticate(user=user)
+        assert self.post_bulk(api_client, {"title": "Post"}).status_code == status.HTTP_400_BAD_REQUEST
+        assert self.post_bulk(api_client, []).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalidates_and_indexes(
+        self, api_client: APIClient, django_capture_on_commit_callbacks, user: User, post: Post
+    ):
+        url = reverse("post:api-v1:posts-list")
+        assert api_client.get(url).data["total_items"] == 1
+
+        api_client.force_authenticate(user=user)
+        with django_capture_on_commit_callbacks(execute=True):
+            self.post_bulk(api_client, [{"title": "Lasagna", "content": "Content"}, {"id": post.pk, "title": "Pasta"}])
+
+        response = api_client.get(url)
+        assert response.data["total_items"] == 2
+        assert [item["title"] for item in api_client.get(url, {"search": "pasta"}).data["results"]] == ["Pasta"]
+
+
+@pytest.mark.django_db
+class TestExport:
+    @pytest.fixture
+    def admin(self) -> User:
+        return User.objects.create_superuser(username="admin", email="admin@example.com", password="adminpassword")
+
+    @pytest.fixture
+    def posts(self, user: User) -> list[Post]:
+        posts = [Post.objects.create(title=f"Post {i}", content="Content", author=user) for i in range(5)]
+        Comment.objects.create(post=posts[0], author=user, content="Comment")
+        return posts
+
+    def export(self, api_client: APIClient, resource: str, **params) -> list[dict]:
+        response = api_client.get(reverse("post:api-v1:export", kwargs={"resource": resource}), params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming and response["Content-Type"] == "application/x-ndjson"
+        return [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+    def test_admin_only(self, api_client: APIClient, user: User):
+        url = reverse("post:api-v1:export", kwargs={"resource": "posts"})
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+        api_client.force_authenticate(user=user)
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_streams_rows_in_id_order(self, api_client: APIClient, admin: User, posts: list[Post]):
+        api_client.force_authenticate(user=admin)
+        rows = self.export(api_client, "posts")
+        assert [row["id"] for row in rows] == [post.pk for post in posts]
+        assert rows[0]["comment_count"] == 1 and rows[0]["author_id"] == posts[0].author_id
+
+        comments = self.export(api_client, "comments")
+        assert [(row["post_id"], row["content"]) for row in comments] == [(posts[0].pk, "Comment")]
+
+        url = reverse("post:api-v1:export", kwargs={"resource": "users"})
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_checkpoint(self, api_client: APIClient, admin: User, posts: list[Post]):
+        api_client.force_authenticate(user=admin)
+        rows = self.export(api_client, "posts", after_id=posts[2].pk)
+        assert [row["id"] for row in rows] == [posts[3].pk, posts[4].pk]
+
+        since = datetime.now() + timedelta(hours=1)
+        Post.objects.filter(pk=posts[1].pk).update(updated_at=since)
+        rows = self.export(api_client, "posts", since=since.isoformat())
+        assert [row["id"] for row in rows] == [posts[1].pk]
+
+        url = reverse("post:api-v1:export", kwargs={"resource": "posts"})
+        assert api_client.get(url, {"since": "yesterday"}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_streams_chunk_by_chunk_under_asgi(self, monkeypatch, admin: User, posts: list[Post]):
+        events = []
+
+        def lines(*args, **kwargs):
+            for chunk in export_lines(*args, chunk_size=2, **kwargs):
+                events.append("read")
+                yield chunk
+
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Event().wait()
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                events.append("sent")
+
+        path = reverse("post:api-v1:export", kwargs={"resource": "posts"})
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": b"",
+            "headers": [(b"host", b"testserver"), (b"authorization", b"Basic " + b64encode(b"admin:adminpassword"))],
+        }
+        monkeypatch.setattr("blog.api.v1.views.export_lines", lines)
+        # As the test client does, keep the connection of the test transaction open.
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                async_to_sync(ASGIHandler())(scope, receive, send)
+        finally:
+            request_started.connect(close_old_connections)
+            request_finished.connect(close_old_connections)
+
+        # Five posts in chunks of two, each sent before the next one is read.
+        assert events == ["read", "sent"] * 3
+
+    def test_command_resumes_into_file(self, tmp_path, posts: list[Post]):
+        output = tmp_path / "posts.ndjson"
+        call_command("export_ndjson", "posts", output=str(output), chunk_size=2, stderr=StringIO())
+        lines = output.read_text().splitlines()
+        assert len(lines) == len(posts)
+
+        # Interrupted after the third post, the resumed run appends the rest.
+        output.write_text("\n".join(lines[:3]) + "\n")
+        call_command("export_ndjson", "posts", output=str(output), after_id=posts[2].pk, stderr=StringIO())
+        assert output.read_text().splitlines() == lines
@@ -1,6 +1,7 @@
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 from rest_framework_nested import routers
-from blog.api.v1.views import PostViewSet
+from blog.api.v1.views import ExportView, PostViewSet, TrendingPostListView
 from comment.api.v1.views import PostCommentsViewSet
 
 router = DefaultRouter()
@@ -12,7 +13,10 @@ nested_router.register(r"comments", PostCommentsViewSet, basename="post-comments
 
 app_name = "api-v1"
 
-urlpatterns = []
+urlpatterns = [
+    path("trending/", TrendingPostListView.as_view(), name="trending"),
+    path("export/<str:resource>/", ExportView.as_view(), name="export"),
+]
 
 urlpatterns += router.urls
 urlpatterns += nested_router.urls
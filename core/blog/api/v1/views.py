@@ -1,13 +1,44 @@
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.generics import ListAPIView
+from rest_framework.views import APIView
+from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from django.conf import settings
+from django.db import router, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
+from redis import RedisError
 from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-from blog.models import Category, Post
-from .serializers import CategorySerializer, PostSerializer
+from django.views.decorators.http import etag
+from blog.models import Category, Post, make_excerpt
+from blog.signals import posts_bulk_saved
+from .serializers import CategorySerializer, PostBulkSerializer, PostSerializer, PostSummarySerializer
 from .permissions import IsVerifiedOrReadOnly, IsAuthorOrReadOnly, IsSuperuserOrReadOnly
-from .paginations import PostPagination
+from .filters import PostSearchFilter
+from .mixins import SparseFieldsetMixin
+from .paginations import PostPagination, PostCursorPagination, TrendingPagination
+from blog.paginators import use_cursor_pagination
+from blog.feeds import CategoryFeed, get_feed_store
+from blog.export import EXPORTS, export_lines, iterate_in_thread
+from blog.cache import versioned_cache_page
+from blog.conditional import post_etag, post_list_etag
+
+
+def parse_id(value) -> int | None:
+    # Ids may come as numbers or numeric strings, anything else is no id.
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
 
 
 class CategoryViewSet(ModelViewSet):
@@ -23,16 +54,16 @@ class CategoryViewSet(ModelViewSet):
         IsVerifiedOrReadOnly,
     ]
 
-    @method_decorator(cache_page(60 * 15))
+    @method_decorator(versioned_cache_page(settings.API_CACHE_TIMEOUT, "category"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60 * 15))
+    @method_decorator(versioned_cache_page(settings.API_CACHE_TIMEOUT, "category"))
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
 
-class PostViewSet(ModelViewSet):
+class PostViewSet(SparseFieldsetMixin, ModelViewSet):
     """
     ViewSet for managing blog posts.
     """
@@ -45,15 +76,230 @@ class PostViewSet(ModelViewSet):
         IsAuthorOrReadOnly,
     ]
     pagination_class = PostPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, PostSearchFilter, OrderingFilter]
     filterset_fields = ["category", "author"]
     search_fields = ["title", "content"]
     ordering_fields = ["created_at", "updated_at"]
+    # Query parameters a category feed can be served with
+    feed_params = {"category", "page", "page_size", "pagination", "fields", "omit", "format"}
+    bulk_max_items = 500
+
+    def get_queryset(self):
+        # Comment counts are stored on the post, so joining authors and
+        # categories keeps every page at a fixed number of queries.
+        queryset = super().get_queryset()
+        fields = self.get_sparse_fields()
+        related = [name for name in ("author", "category") if fields is None or name in fields]
+        if related:
+            queryset = queryset.select_related(*related)
+        if self.action == "list":
+            # Lists only show the stored excerpt, don't read the full bodies.
+            queryset = queryset.defer("content")
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == "list":
+            return PostSummarySerializer
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        if self.action == "list":
+            feed = self.get_category_feed(queryset)
+            if feed is not None:
+                return feed
+        return super().filter_queryset(queryset)
+
+    def paginate_queryset(self, queryset):
+        if isinstance(queryset, CategoryFeed):
+            try:
+                return super().paginate_queryset(queryset)
+            except RedisError:
+                # Redis failed while reading the page, list it from the database.
+                queryset = super().filter_queryset(queryset.queryset)
+        return super().paginate_queryset(queryset)
+
+    def get_category_feed(self, queryset) -> CategoryFeed | None:
+        """
+        Serve ``?category=`` listings in the default order from the category
+        feeds materialized in Redis, when nothing else filters or orders them.
+        """
+        params = self.request.query_params
+        if set(params) - self.feed_params or not isinstance(self.paginator, PostPagination):
+            return None
+        try:
+            category_id = int(params.get("category", ""))
+        except ValueError:
+            return None
+        store = get_feed_store()
+        try:
+            if store is None or not store.has_category(category_id):
+                return None
+        except RedisError:
+            return None
+        return CategoryFeed(store, category_id, queryset)
+
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when the client (or the settings) opt in to it.
+        """
+        if not hasattr(self, "_paginator"):
+            if use_cursor_pagination(getattr(self.request, "query_params", {})):
+                self._paginator = PostCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request, *args, **kwargs):
+        """
+        Create (items without an ``id``) or partially update (items with one)
+        many posts at once. Valid items are written in a single transaction,
+        every item gets its own status with its data or errors.
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise ValidationError({"non_field_errors": ["Expected a non-empty list of posts."]})
+        if len(items) > self.bulk_max_items:
+            raise ValidationError({"non_field_errors": [f"Send at most {self.bulk_max_items} posts at a time."]})
+
+        # The referenced categories are loaded once for all items.
+        category_ids = {parse_id(item.get("category")) for item in items if isinstance(item, dict)} - {None}
+        context = self.get_serializer_context()
+        context["categories"] = Category.objects.in_bulk(category_ids)
+
+        # The updated posts are read from the primary and locked until the
+        # commit, so concurrent edits are neither overwritten nor lost.
+        using = router.db_for_write(Post)
+        post_ids = {parse_id(item.get("id")) for item in items if isinstance(item, dict)} - {None}
+        with transaction.atomic(using=using):
+            locked = (
+                Post.objects.using(using)
+                .select_related("author", "category")
+                .select_for_update(of=("self",))
+                .filter(pk__in=post_ids)
+                .order_by("pk")
+            )
+            existing = {post.pk: post for post in locked}
+
+            results = [None] * len(items)
+            created, updated, seen = [], [], set()
+            now = timezone.now()
+            for index, item in enumerate(items):
+                instance = None
+                if isinstance(item, dict) and item.get("id") is not None:
+                    post_id = parse_id(item["id"])
+                    instance = existing.get(post_id)
+                    if instance is None:
+                        results[index] = {"status": status.HTTP_404_NOT_FOUND, "errors": {"id": ["Not found."]}}
+                        continue
+                    if post_id in seen:
+                        results[index] = {"status": status.HTTP_400_BAD_REQUEST, "errors": {"id": ["Duplicate id."]}}
+                        continue
+                    try:
+                        self.check_object_permissions(request, instance)
+                    except PermissionDenied as e:
+                        results[index] = {"status": status.HTTP_403_FORBIDDEN, "errors": {"detail": e.detail}}
+                        continue
+                    seen.add(post_id)
+
+                serializer = PostBulkSerializer(instance, data=item, partial=instance is not None, context=context)
+                if not serializer.is_valid():
+                    results[index] = {"status": status.HTTP_400_BAD_REQUEST, "errors": serializer.errors}
+                    continue
+
+                data = serializer.validated_data
+                # Updates only write the fields the item sent, and the columns derived from them.
+                fields = {*data, "updated_at"}
+                if instance is None:
+                    instance = Post(author=request.user, **data)
+                    created.append((index, instance))
+                else:
+                    for attr, value in data.items():
+                        setattr(instance, attr, value)
+                    updated.append((index, instance, fields))
+                # bulk_create and bulk_update skip Post.save, keep the derived columns in step.
+                if "content" in data:
+                    instance.excerpt = make_excerpt(instance.content)
+                    fields.add("excerpt")
+                instance.updated_at = now
+
+            Post.objects.using(using).bulk_create([post for _, post in created])
+            # Posts sending the same fields are updated in one query.
+            groups = {}
+            for _, post, fields in updated:
+                groups.setdefault(frozenset(fields), []).append(post)
+            for fields, posts in groups.items():
+                Post.objects.using(using).bulk_update(posts, sorted(fields))
+            saved = [post for _, post in created] + [post for _, post, _ in updated]
+            if saved:
+                posts_bulk_saved.send(sender=Post, posts=saved, using=using)
 
-    @method_decorator(cache_page(60 * 5))
+        for index, post in created:
+            results[index] = {"status": status.HTTP_201_CREATED, "data": PostBulkSerializer(post, context=context).data}
+        for index, post, _ in updated:
+            results[index] = {"status": status.HTTP_200_OK, "data": PostBulkSerializer(post, context=context).data}
+        return Response({"results": results}, status=status.HTTP_200_OK)
+
+    @method_decorator(etag(post_list_etag))
+    @method_decorator(versioned_cache_page(settings.API_CACHE_TIMEOUT, "post"))
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60 * 5))
+    @method_decorator(etag(post_etag))
+    @method_decorator(versioned_cache_page(settings.API_CACHE_TIMEOUT, "post"))
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
+
+
+class TrendingPostListView(ListAPIView):
+    """
+    Posts ranked by recent comment activity, refreshed by the update_trending_posts task.
+    """
+
+    queryset = Post.objects.select_related("author", "category").defer("content")
+    serializer_class = PostSummarySerializer
+    permission_classes = [AllowAny]
+    pagination_class = TrendingPagination
+
+
+class ExportView(APIView):
+    """
+    Stream every post or comment as NDJSON, one object per line in id order.
+
+    ``?since=`` keeps the rows changed since a time, ``?after_id=`` resumes an
+    interrupted export after the last id received.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, resource):
+        if resource not in EXPORTS:
+            raise NotFound(f"Unknown export {resource!r}.")
+        since, after_id = self.get_checkpoint()
+        lines = export_lines(resource, since=since, after_id=after_id)
+        if isinstance(request._request, ASGIRequest):
+            lines = iterate_in_thread(lines)
+        response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="{resource}.ndjson"'
+        return response
+
+    def get_checkpoint(self):
+        params = self.request.query_params
+        errors = {}
+        since = after_id = None
+        if params.get("since"):
+            try:
+                since = parse_datetime(params["since"])
+            except ValueError:
+                pass
+            if since is None:
+                errors["since"] = ["Expected an ISO 8601 date and time."]
+        if params.get("after_id"):
+            try:
+                after_id = int(params["after_id"])
+            except ValueError:
+                errors["after_id"] = ["Expected a post or comment id."]
+        if errors:
+            raise ValidationError(errors)
+        return since, after_id
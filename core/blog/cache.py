@@ -0,0 +1,164 @@
+import hashlib
+import time
+from functools import wraps
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import parse_http_date_safe, quote_etag
+from django.db import transaction
+from BlogSite.db.routers import use_primary
+
+GENERATION_KEY = "api-cache:generation:{}"
+RESPONSE_KEY = "api-cache:response:{}:{}"
+STATS_KEY = "api-cache:stats:{}"
+PRERENDERED_KEY = "prerendered:{}:{}"
+PRERENDER_LOCK_TIMEOUT = 30
+STATS = ("hits", "misses", "invalidations")
+
+
+def _incr(key: str, delta: int = 1):
+    if not cache.add(key, delta, timeout=None):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            cache.set(key, delta, timeout=None)
+
+
+def _new_generation() -> int:
+    # Start from the clock, so a counter lost from the cache never comes back
+    # with a value that older cached responses were stored under.
+    return time.time_ns()
+
+
+def get_generations(*scopes: str) -> list[int]:
+    """
+    Return the current generation of each scope, creating missing ones.
+    """
+    keys = [GENERATION_KEY.format(scope) for scope in scopes]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, _new_generation(), timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump(*scopes: str):
+    """
+    Move each scope to a new generation, making every response cached under
+    the previous one unreachable.
+    """
+    for scope in scopes:
+        key = GENERATION_KEY.format(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_generation(), timeout=None)
+    _incr(STATS_KEY.format("invalidations"), len(scopes))
+
+
+def invalidate(*scopes: str):
+    """
+    Bump the given scopes once the current transaction commits.
+    """
+    transaction.on_commit(lambda: bump(*scopes))
+
+
+def get_stats() -> dict:
+    values = cache.get_many([STATS_KEY.format(name) for name in STATS])
+    return {name: values.get(STATS_KEY.format(name), 0) for name in STATS}
+
+
+def reset_stats():
+    cache.delete_many([STATS_KEY.format(name) for name in STATS])
+
+
+def versioned_cache_page(timeout: int, resource: str):
+    """
+    Cache GET responses of a list or detail view under the generations of
+    ``resource``. Detail responses (with a ``pk`` URL kwarg) depend on the
+    resource and the item, list responses on the resource and its collection,
+    so a write only has to bump a few counters instead of deleting keys.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view_func(request, *args, **kwargs)
+
+            pk = kwargs.get("pk")
+            scope = f"{resource}:{pk}" if pk is not None else f"{resource}:list"
+            generations = get_generations(resource, scope)
+            url = request.build_absolute_uri() + "|" + request.META.get("HTTP_ACCEPT", "")
+            digest = hashlib.md5(url.encode(), usedforsecurity=False).hexdigest()
+            key = RESPONSE_KEY.format(digest, ".".join(str(g) for g in generations))
+
+            response = cache.get(key)
+            if response is not None:
+                _incr(STATS_KEY.format("hits"))
+                return response
+
+            _incr(STATS_KEY.format("misses"))
+            with use_primary():
+                response = view_func(request, *args, **kwargs)
+
+            def store(response):
+                # The browsable API page shows the current user, never share it.
+                if not response.get("Content-Type", "").startswith("text/html"):
+                    cache.set(key, response, timeout)
+
+            if response.status_code == 200 and not response.streaming:
+                if hasattr(response, "add_post_render_callback"):
+                    response.add_post_render_callback(store)
+                else:
+                    store(response)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def serve_prerendered(request, name: str, scopes: list[str], render, max_age: int):
+    """
+    Answer with the stored rendering of ``name``, calling ``render(request)``
+    only when a write moved one of ``scopes`` since it was stored. While one
+    request renders, the others keep getting the previous rendering.
+
+    Renderings are stored per origin (their links are absolute) and served
+    with an ETag, their Last-Modified and a public Cache-Control max-age.
+    """
+    origin = hashlib.md5(request.build_absolute_uri("/").encode(), usedforsecurity=False).hexdigest()
+    key = PRERENDERED_KEY.format(name, origin)
+    generations = get_generations(*scopes)
+    stored = cache.get(key)
+    if stored is None or stored["generations"] != generations:
+        locked = cache.add(key + ":lock", 1, PRERENDER_LOCK_TIMEOUT)
+        # Without a previous rendering there is nothing else to serve.
+        if locked or stored is None:
+            try:
+                with use_primary():
+                    response = render(request)
+                if response.status_code != 200:
+                    return response
+                content = response.content
+                stored = {
+                    "generations": generations,
+                    "content": content,
+                    "content_type": response["Content-Type"],
+                    "etag": quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest()),
+                    "last_modified": response.get("Last-Modified"),
+                }
+                cache.set(key, stored, timeout=None)
+            finally:
+                if locked:
+                    cache.delete(key + ":lock")
+
+    response = HttpResponse(stored["content"], content_type=stored["content_type"])
+    response["ETag"] = stored["etag"]
+    if stored["last_modified"]:
+        response["Last-Modified"] = stored["last_modified"]
+    patch_cache_control(response, public=True, max_age=max_age)
+    last_modified = parse_http_date_safe(stored["last_modified"]) if stored["last_modified"] else None
+    return get_conditional_response(request, etag=stored["etag"], last_modified=last_modified, response=response)
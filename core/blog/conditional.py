@@ -0,0 +1,50 @@
+import hashlib
+from django.utils import timezone
+from .cache import get_generations
+from .models import Post
+
+
+def make_etag(request, *parts) -> str:
+    """
+    Build an entity tag from the state of the resource and the parts of the
+    request that change its representation (query string and Accept header).
+    """
+    parts += (request.get_full_path(), request.META.get("HTTP_ACCEPT", ""))
+    return hashlib.md5("|".join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def as_aware(value):
+    # Datetimes are stored naive in TIME_ZONE, Last-Modified must be in UTC.
+    return timezone.make_aware(value) if value is not None and timezone.is_naive(value) else value
+
+
+def memoize_on_request(request, name: str, lookup):
+    # The ETag and Last-Modified functions run one after the other, look the
+    # state up once per request.
+    if not hasattr(request, name):
+        try:
+            setattr(request, name, lookup())
+        except (TypeError, ValueError):
+            # Malformed pk, the view answers with a 404.
+            setattr(request, name, None)
+    return getattr(request, name)
+
+
+def post_etag(request, *args, pk=None, **kwargs):
+    # No Last-Modified: comment counts (updated without touching updated_at),
+    # category and author changes and new renditions don't move updated_at.
+    state = memoize_on_request(
+        request,
+        "_post_state",
+        lambda: Post.objects.filter(pk=pk).values_list("updated_at", "comment_count").first(),
+    )
+    if state is None:
+        return None
+    # The "post" generation moves when a category or an author changes, the
+    # "post:<pk>" one when the renditions of the post are updated.
+    return make_etag(request, pk, *state, *get_generations("post", f"post:{pk}"))
+
+
+def post_list_etag(request, *args, **kwargs):
+    # Every write to posts (and their comment counts) bumps these generations.
+    return make_etag(request, *get_generations("post", "post:list"))
@@ -0,0 +1,181 @@
+import functools
+import time
+from datetime import datetime, timedelta
+import redis
+from django.conf import settings
+from django.db.models import QuerySet
+from .models import Category, Post
+
+FEED_KEY = "feed:category:{}"
+POST_CATEGORY_KEY = "feed:post-category"
+CATEGORIES_KEY = "feed:categories"
+READY_KEY = "feed:ready"
+EPOCH = datetime(1970, 1, 1)
+
+
+def score(created_at: datetime) -> int:
+    # Microseconds since the epoch, exact in a Redis score (a double).
+    return (created_at.replace(tzinfo=None) - EPOCH) // timedelta(microseconds=1)
+
+
+class CategoryFeedStore:
+    """
+    One Redis sorted set of post ids per category, scored by creation time,
+    so a category page is a ZREVRANGE instead of a sort and offset in the DB.
+
+    The category of every stored post is kept in a hash to move posts between
+    sets, and the known categories in a set so unknown ids still get the
+    filter's validation error from the DB path.
+    """
+
+    def __init__(self, client: redis.Redis):
+        self.client = client
+
+    def has_category(self, category_id: int) -> bool:
+        """
+        Whether the feed of the category can be served, the sets are only
+        complete after a rebuild.
+        """
+        with self.client.pipeline(transaction=False) as pipe:
+            pipe.exists(READY_KEY)
+            pipe.sismember(CATEGORIES_KEY, category_id)
+            ready, known = pipe.execute()
+        return bool(ready and known)
+
+    def add_category(self, category_id: int):
+        self.client.sadd(CATEGORIES_KEY, category_id)
+
+    def remove_category(self, category_id: int):
+        with self.client.pipeline() as pipe:
+            pipe.srem(CATEGORIES_KEY, category_id)
+            pipe.delete(FEED_KEY.format(category_id))
+            pipe.execute()
+
+    def add(self, post_id: int, category_id: int | None, created_at: datetime):
+        """
+        Put the post in the set of its category, taking it out of the set of
+        its previous one.
+        """
+        self.add_many([(post_id, category_id, created_at)])
+
+    def add_many(self, rows: list[tuple[int, int | None, datetime]]):
+        """
+        Like ``add`` for many ``(post_id, category_id, created_at)`` rows in two round trips.
+        """
+        if not rows:
+            return
+        previous = self.client.hmget(POST_CATEGORY_KEY, [post_id for post_id, _, _ in rows])
+        with self.client.pipeline() as pipe:
+            for (post_id, category_id, created_at), old in zip(rows, previous):
+                if old is not None and int(old) != category_id:
+                    pipe.zrem(FEED_KEY.format(int(old)), post_id)
+                if category_id is None:
+                    pipe.hdel(POST_CATEGORY_KEY, post_id)
+                else:
+                    pipe.zadd(FEED_KEY.format(category_id), {post_id: score(created_at)})
+                    pipe.hset(POST_CATEGORY_KEY, post_id, category_id)
+            pipe.execute()
+
+    def remove(self, post_id: int):
+        previous = self.client.hget(POST_CATEGORY_KEY, post_id)
+        if previous is None:
+            return
+        with self.client.pipeline() as pipe:
+            pipe.zrem(FEED_KEY.format(int(previous)), post_id)
+            pipe.hdel(POST_CATEGORY_KEY, post_id)
+            pipe.execute()
+
+    def count(self, category_id: int) -> int:
+        return self.client.zcard(FEED_KEY.format(category_id))
+
+    def range(self, category_id: int, start: int, stop: int | None) -> list[int]:
+        """
+        Return the ids of the posts ``start`` to ``stop`` of the category, newest first.
+        """
+        end = -1 if stop is None else stop - 1
+        return [int(pk) for pk in self.client.zrevrange(FEED_KEY.format(category_id), start, end)]
+
+    def rebuild(self, batch_size: int = 1000) -> int:
+        """
+        Regenerate every set from the DB into staging keys, then swap them in
+        at once. Posts written while the rebuild ran are added again after the
+        swap. Return the number of stored posts.
+        """
+        started = datetime.now()
+        staging = f"feed:rebuild:{time.time_ns()}:"
+        categories = list(Category.objects.values_list("pk", flat=True))
+        filled = set()
+        stored = 0
+        last_id = 0
+        while True:
+            rows = list(
+                Post.objects.filter(pk__gt=last_id, category__isnull=False)
+                .order_by("pk")
+                .values_list("pk", "category_id", "created_at")[:batch_size]
+            )
+            if not rows:
+                break
+            with self.client.pipeline(transaction=False) as pipe:
+                for pk, category_id, created_at in rows:
+                    pipe.zadd(staging + FEED_KEY.format(category_id), {pk: score(created_at)})
+                    pipe.hset(staging + POST_CATEGORY_KEY, pk, category_id)
+                    filled.add(category_id)
+                pipe.execute()
+            stored += len(rows)
+            last_id = rows[-1][0]
+
+        stale = list(self.client.scan_iter(FEED_KEY.format("*")))
+        with self.client.pipeline() as pipe:
+            if stale:
+                pipe.delete(*stale)
+            for category_id in filled:
+                pipe.rename(staging + FEED_KEY.format(category_id), FEED_KEY.format(category_id))
+            if stored:
+                pipe.rename(staging + POST_CATEGORY_KEY, POST_CATEGORY_KEY)
+            else:
+                pipe.delete(POST_CATEGORY_KEY)
+            pipe.delete(CATEGORIES_KEY)
+            if categories:
+                pipe.sadd(CATEGORIES_KEY, *categories)
+            pipe.set(READY_KEY, 1)
+            pipe.execute()
+
+        self.add_many(list(Post.objects.filter(updated_at__gte=started).values_list("pk", "category_id", "created_at")))
+        return stored
+
+
+class CategoryFeed:
+    """
+    The posts of a category, newest first, sliced by a Paginator. A slice reads
+    its ids from the store and hydrates them with a single ``in_bulk`` query.
+    """
+
+    def __init__(self, store: CategoryFeedStore, category_id: int, queryset: QuerySet):
+        self.store = store
+        self.category_id = category_id
+        self.queryset = queryset
+
+    def count(self) -> int:
+        return self.store.count(self.category_id)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError("Category feeds can only be sliced.")
+        post_ids = self.store.range(self.category_id, index.start or 0, index.stop)
+        posts = self.queryset.in_bulk(post_ids)
+        # Posts deleted after their ids were read are skipped.
+        return [posts[pk] for pk in post_ids if pk in posts]
+
+
+@functools.cache
+def _get_client(url: str) -> redis.Redis:
+    # One connection pool per process.
+    return redis.Redis.from_url(url)
+
+
+def get_feed_store() -> CategoryFeedStore | None:
+    """
+    Return the category feed store, or None when CATEGORY_FEED_REDIS_URL is empty.
+    """
+    url = settings.CATEGORY_FEED_REDIS_URL
+    return CategoryFeedStore(_get_client(url)) if url else None
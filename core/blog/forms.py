@@ -1,6 +1,5 @@
 from django import forms
-from django.core.files.base import ContentFile
-import base64
+from images.fields import ImageUploadField
 from .models import Category, Post
 
 
@@ -11,7 +10,7 @@ class CategoryForm(forms.ModelForm):
 
 
 class PostForm(forms.ModelForm):
-    image_data = forms.CharField(widget=forms.HiddenInput(), required=False)
+    image = ImageUploadField(required=False)
     delete_image = forms.BooleanField(required=False, label="Clear current image")
 
     class Meta:
@@ -23,18 +22,13 @@ class PostForm(forms.ModelForm):
 
         # Handle deleting the current image
         if self.cleaned_data.get("delete_image") and instance.image:
-            instance.image.delete(save=False)
+            # The signals delete the file once no other row references it.
             instance.image = None
 
-        image_data = self.cleaned_data.get("image_data")
-        if image_data:
-            try:
-                format, imgstr = image_data.split(";base64,")
-                ext = format.split("/")[-1]
-                image_file = ContentFile(base64.b64decode(imgstr), name=f"post_{instance.pk}.{ext}")
-                instance.image = image_file
-            except Exception:
-                pass
+        image = self.cleaned_data.get("image")
+        if image:
+            # The upload is a temporary file, the storage hashes and copies it in chunks.
+            instance.image = image
 
         if commit:
             instance.save()
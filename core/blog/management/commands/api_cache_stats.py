@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from blog.cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Show the hit, miss and invalidation counters of the API response cache"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after showing them")
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        lookups = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / lookups * 100 if lookups else 0
+        for name, value in stats.items():
+            self.stdout.write(f"{name}: {value}")
+        self.stdout.write(f"hit ratio: {ratio:.1f}%")
+
+        if options["reset"]:
+            reset_stats()
+            self.stdout.write(self.style.SUCCESS("Successfully reset API cache counters"))
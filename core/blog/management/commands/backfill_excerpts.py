@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.dateformat import format as date_format
+from blog.cache import bump
+from blog.models import Post, make_excerpt
+
+
+class Command(BaseCommand):
+    help = "Compute the stored excerpt of every post in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of posts updated per transaction")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        last_id = 0
+        updated = 0
+        while True:
+            posts = list(
+                Post.objects.filter(pk__gt=last_id)
+                .order_by("pk")
+                .only("pk", "content", "excerpt", "updated_at")[:batch_size]
+            )
+            if not posts:
+                break
+
+            stale = []
+            for post in posts:
+                excerpt = make_excerpt(post.content)
+                if post.excerpt != excerpt:
+                    post.excerpt = excerpt
+                    stale.append(post)
+            Post.objects.bulk_update(stale, ["excerpt"])
+            # bulk_update() doesn't touch updated_at, so drop the cached cards by hand.
+            cache.delete_many(
+                [
+                    make_template_fragment_key("post_card_excerpt", [post.pk, date_format(post.updated_at, "U.u")])
+                    for post in stale
+                ]
+            )
+            updated += len(stale)
+            last_id = posts[-1].pk
+
+        if updated:
+            bump("post")
+        self.stdout.write(self.style.SUCCESS(f"Successfully backfilled excerpts ({updated} posts updated)"))
@@ -0,0 +1,134 @@
+import asyncio
+import io
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wsgiref.util import setup_testing_defaults
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Compare request throughput of the WSGI and ASGI handlers at a fixed worker count under simulated DB latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", action="append", help="Path to request (repeatable, defaults to the post pages)")
+        parser.add_argument("--requests", type=int, default=200, help="Number of requests per mode")
+        parser.add_argument("--workers", type=int, default=2, help="Number of workers in each mode")
+        parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight per ASGI worker")
+        parser.add_argument("--latency", type=float, default=20, help="Milliseconds added to every DB query")
+        parser.add_argument("--host", default="localhost", help="Host header sent with the requests")
+
+    def handle(self, *args, **options):
+        post = Post.objects.order_by("-created_at").first()
+        if post is None:
+            raise CommandError("No posts found. Run create_fake_posts first.")
+        self.paths = options["path"] or ["/posts/", f"/posts/{post.pk}/"]
+        self.host = options["host"]
+        self.latency = options["latency"] / 1000
+
+        # Every connection, including the ones opened by worker threads, waits before each query.
+        connection_created.connect(self.add_latency)
+        for connection in connections.all(initialized_only=True):
+            self.add_latency(None, connection)
+        try:
+            for mode, run in (("WSGI", self.run_wsgi), ("ASGI", self.run_asgi)):
+                start = time.perf_counter()
+                statuses = run(options["requests"], options["workers"], options["concurrency"])
+                elapsed = time.perf_counter() - start
+                self.report(mode, statuses, elapsed)
+        finally:
+            connection_created.disconnect(self.add_latency)
+
+    def sleep(self, execute, sql, params, many, context):
+        time.sleep(self.latency)
+        return execute(sql, params, many, context)
+
+    def add_latency(self, sender, connection, **kwargs):
+        # Connections are closed after every request and reopened by the same wrapper.
+        if self.sleep not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self.sleep)
+
+    def run_wsgi(self, requests: int, workers: int, concurrency: int) -> list[int]:
+        from BlogSite.wsgi import application
+
+        def get(i):
+            path, _, query = self.paths[i % len(self.paths)].partition("?")
+            environ = {"PATH_INFO": path, "QUERY_STRING": query, "HTTP_HOST": self.host, "wsgi.input": io.BytesIO()}
+            setup_testing_defaults(environ)
+            status = []
+            body = application(environ, lambda code, headers: status.append(int(code.split()[0])))
+            b"".join(body)
+            body.close()
+            return status[0]
+
+        # A sync worker serves one request at a time.
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(get, range(requests)))
+
+    def run_asgi(self, requests: int, workers: int, concurrency: int) -> list[int]:
+        from BlogSite.asgi import application
+
+        async def get(i):
+            path, _, query = self.paths[i % len(self.paths)].partition("?")
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": query.encode(),
+                "root_path": "",
+                "headers": [(b"host", self.host.encode())],
+                "client": ("127.0.0.1", 0),
+                "server": (self.host, 80),
+            }
+            messages = [{"type": "http.request", "body": b"", "more_body": False}]
+            status = []
+
+            async def receive():
+                if messages:
+                    return messages.pop()
+                # The client never disconnects, the handler cancels this wait.
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            await application(scope, receive, send)
+            return status[0]
+
+        async def worker(indexes):
+            # An ASGI worker is one event loop with many requests in flight.
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def limited(i):
+                async with semaphore:
+                    return await get(i)
+
+            return await asyncio.gather(*(limited(i) for i in indexes))
+
+        results = [None] * workers
+
+        def run_worker(n):
+            results[n] = asyncio.run(worker(range(n, requests, workers)))
+
+        threads = [threading.Thread(target=run_worker, args=(n,)) for n in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [status for statuses in results for status in statuses]
+
+    def report(self, mode: str, statuses: list[int], elapsed: float):
+        failed = sum(1 for status in statuses if status >= 400)
+        line = f"{mode}: {len(statuses)} requests in {elapsed:.2f}s ({len(statuses) / elapsed:.1f} req/s)"
+        if failed:
+            self.stdout.write(self.style.WARNING(f"{line}, {failed} failed"))
+        else:
+            self.stdout.write(self.style.SUCCESS(line))
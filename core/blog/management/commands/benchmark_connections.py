@@ -0,0 +1,60 @@
+import copy
+import time
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import load_backend
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = "Compare per-request latency with a new connection per request, persistent connections and a pool"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Number of simulated requests per mode")
+        parser.add_argument("--database", default="default", help="Database alias to connect to")
+
+    def handle(self, *args, **options):
+        base = connections[options["database"]].settings_dict
+        modes = {
+            "new connection per request": {"CONN_MAX_AGE": 0, "pool": None},
+            "persistent connections": {"CONN_MAX_AGE": 600, "pool": None},
+        }
+        if base["ENGINE"] == "django.db.backends.postgresql":
+            modes["connection pool"] = {"CONN_MAX_AGE": 0, "pool": {"min_size": 1, "max_size": 1}}
+        else:
+            self.stdout.write(self.style.WARNING("Pooling needs PostgreSQL, only comparing the other modes."))
+
+        sql = str(Post.objects.order_by("-created_at").values("id", "title")[:10].query)
+        for index, (name, mode) in enumerate(modes.items()):
+            settings_dict = copy.deepcopy(base)
+            settings_dict["CONN_MAX_AGE"] = mode["CONN_MAX_AGE"]
+            settings_dict["OPTIONS"] = {key: value for key, value in settings_dict["OPTIONS"].items() if key != "pool"}
+            if mode["pool"]:
+                settings_dict["OPTIONS"]["pool"] = mode["pool"]
+            backend = load_backend(settings_dict["ENGINE"])
+            connection = backend.DatabaseWrapper(settings_dict, alias=f"benchmark_{index}")
+            try:
+                timings = [self.request(connection, sql) for _ in range(options["requests"])]
+            finally:
+                connection.close()
+                if mode["pool"]:
+                    connection.close_pool()
+            self.report(name, timings)
+
+    def request(self, connection, sql: str) -> float:
+        # What Django does around a request: drop obsolete connections before
+        # and after it, query in between.
+        start = time.perf_counter()
+        connection.close_if_unusable_or_obsolete()
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            cursor.fetchall()
+        connection.close_if_unusable_or_obsolete()
+        return time.perf_counter() - start
+
+    def report(self, name: str, timings: list[float]):
+        timings.sort()
+        median = timings[len(timings) // 2] * 1000
+        p95 = timings[int(len(timings) * 0.95)] * 1000
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        self.stdout.write(self.style.SUCCESS(f"median {median:.2f}ms, p95 {p95:.2f}ms over {len(timings)} requests"))
@@ -0,0 +1,98 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from blog.models import Category, Post, make_excerpt
+from blog.paginators import KeysetPaginator
+from comment.models import Comment
+from account.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Seed N posts and report EXPLAIN plans and timings of the list and filter queries"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=10000, help="Number of posts to seed")
+        parser.add_argument("--comments", type=int, default=5, help="Number of comments per post")
+        parser.add_argument("--repeat", type=int, default=20, help="Number of timed runs per query")
+        parser.add_argument("--keep", action="store_true", help="Keep the seeded rows instead of rolling back")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.seed(options["posts"], options["comments"])
+                for name, queryset in self.get_queries(options["posts"]):
+                    self.report(name, queryset, options["repeat"])
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            self.stdout.write("Seeded rows rolled back.")
+
+    def seed(self, posts: int, comments: int):
+        self.user, _ = User.objects.get_or_create(
+            username="bench_user", defaults={"email": "bench_user@example.com", "is_verified": True}
+        )
+        self.category, _ = Category.objects.get_or_create(name="Benchmark")
+        categories = [self.category] + list(Category.objects.exclude(pk=self.category.pk)[:4])
+
+        content = "Benchmark content " * 20
+        start = time.perf_counter()
+        Post.objects.bulk_create(
+            (
+                Post(
+                    title=f"Post {i}",
+                    content=content,
+                    excerpt=make_excerpt(content),
+                    author=self.user,
+                    category=categories[i % len(categories)],
+                )
+                for i in range(posts)
+            ),
+            batch_size=1000,
+        )
+        post_ids = Post.objects.filter(author=self.user).values_list("pk", flat=True)
+        Comment.objects.bulk_create(
+            (
+                Comment(content="Benchmark comment", author=self.user, post_id=pk)
+                for pk in post_ids
+                for _ in range(comments)
+            ),
+            batch_size=1000,
+        )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE blog_post; ANALYZE comment_comment;")
+        self.stdout.write(f"Seeded {posts} posts and {posts * comments} comments in {time.perf_counter() - start:.2f}s")
+
+    def get_queries(self, posts: int):
+        feed = Post.objects.select_related("author", "category").defer("content").order_by("-created_at", "-id")
+        start, end = posts // 2, posts // 2 + 10
+        cursor = KeysetPaginator.encode_cursor(feed[start])
+        post = Post.objects.filter(author=self.user).first()
+
+        return [
+            ("posts list, first page", feed[:10]),
+            ("posts list, deep page (OFFSET)", feed[start:end]),
+            ("posts list, deep page (cursor)", KeysetPaginator(feed, 10).seek(cursor)[:10]),
+            ("posts filtered by category", feed.filter(category=self.category)[:10]),
+            ("posts filtered by author", feed.filter(author=self.user)[:10]),
+            ("comments of a post", Comment.objects.filter(post=post).order_by("-published_at")[:20]),
+        ]
+
+    def report(self, name: str, queryset, repeat: int):
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        self.stdout.write(queryset.explain())
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.all())
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        median = timings[len(timings) // 2] * 1000
+        self.stdout.write(
+            self.style.SUCCESS(f"median {median:.2f}ms, max {timings[-1] * 1000:.2f}ms over {repeat} runs")
+        )
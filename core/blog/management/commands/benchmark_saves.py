@@ -0,0 +1,71 @@
+from django.contrib.auth.models import update_last_login
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from blog.models import Category, Post
+from account.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Report the queries run by each kind of post and user save, signals included"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=20, help="Number of saves per kind")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username="bench_saves", email="bench_saves@example.com", password="bench", is_verified=True
+                )
+                category, _ = Category.objects.get_or_create(name="Benchmark")
+                Post.objects.create(title="Post", content="Benchmark content", author=user, category=category)
+                for name, save in self.get_saves(user.pk):
+                    self.report(name, save, options["repeat"])
+                raise Rollback
+        except Rollback:
+            self.stdout.write("Seeded rows rolled back.")
+
+    def get_saves(self, user_id: int):
+        def login():
+            update_last_login(None, User.objects.get(pk=user_id))
+
+        def edit_profile():
+            user = User.objects.get(pk=user_id)
+            user.username = "bench_saves"
+            user.save()
+
+        def edit_post():
+            post = Post.objects.filter(author_id=user_id).first()
+            post.title = "Edited"
+            post.save()
+
+        def edit_post_deferred_image():
+            post = Post.objects.filter(author_id=user_id).only("pk", "title").first()
+            post.image = ""
+            post.save(update_fields=["image"])
+
+        return [
+            ("login (last_login update)", login),
+            ("profile edit", edit_profile),
+            ("post edit", edit_post),
+            ("post image change, image column deferred", edit_post_deferred_image),
+        ]
+
+    def report(self, name: str, save, repeat: int):
+        total = selects = 0
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as context:
+                save()
+            # The first query loads the instance, the rest belong to the save.
+            queries = context.captured_queries[1:]
+            total += len(queries)
+            selects += sum(query["sql"].lstrip().upper().startswith("SELECT") for query in queries)
+        self.stdout.write(self.style.MIGRATE_HEADING(name))
+        self.stdout.write(
+            self.style.SUCCESS(f"{total / repeat:.1f} queries per save, {selects / repeat:.1f} of them SELECTs")
+        )
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from blog.export import CHUNK_SIZE, EXPORTS, export_lines
+
+
+class Command(BaseCommand):
+    help = "Export posts or comments as NDJSON in id order, streaming them in constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", choices=sorted(EXPORTS), help="What to export")
+        parser.add_argument("--output", help="File to write (defaults to stdout)")
+        parser.add_argument("--since", help="Only export rows changed at or after this ISO 8601 time")
+        parser.add_argument("--after-id", type=int, help="Resume after this id (the last one of an earlier run)")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Number of rows fetched per round trip")
+
+    def handle(self, *args, **options):
+        since = None
+        if options["since"]:
+            try:
+                since = parse_datetime(options["since"])
+            except ValueError:
+                pass
+            if since is None:
+                raise CommandError("--since must be an ISO 8601 date and time.")
+
+        lines = export_lines(
+            options["resource"], since=since, after_id=options["after_id"], chunk_size=options["chunk_size"]
+        )
+        # A resumed export is appended to the file of the interrupted one.
+        output = (
+            open(options["output"], "a" if options["after_id"] else "w", encoding="utf-8")
+            if options["output"]
+            else None
+        )
+        exported = 0
+        try:
+            for chunk in lines:
+                if output:
+                    output.write(chunk)
+                else:
+                    self.stdout.write(chunk, ending="")
+                exported += chunk.count("\n")
+        finally:
+            if output:
+                output.close()
+        # stdout may be the export itself, report on stderr.
+        self.stderr.write(f"Exported {exported} {options['resource']}", style_func=self.style.SUCCESS)
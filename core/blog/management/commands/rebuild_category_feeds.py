@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+from blog.feeds import get_feed_store
+
+
+class Command(BaseCommand):
+    help = "Regenerate the Redis sorted sets of the category feeds from the database"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of posts read per query")
+
+    def handle(self, *args, **options):
+        store = get_feed_store()
+        if store is None:
+            raise CommandError("CATEGORY_FEED_REDIS_URL is not set.")
+
+        stored = store.rebuild(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Successfully rebuilt the category feeds ({stored} posts)"))
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from blog.models import Post
+from blog.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index of posts in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of posts indexed per transaction")
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if backend is None:
+            raise CommandError("The configured database has no full-text search backend.")
+
+        batch_size = options["batch_size"]
+        last_id = 0
+        indexed = 0
+        while True:
+            ids = list(Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+
+            with transaction.atomic():
+                backend.index(ids)
+            indexed += len(ids)
+            last_id = ids[-1]
+            self.stdout.write(f"Indexed {indexed} posts")
+
+        backend.prune()
+        self.stdout.write(self.style.SUCCESS(f"Successfully rebuilt the search index ({indexed} posts)"))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from blog.models import Post
+from comment.models import Comment
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored comment count of every post in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of posts updated per transaction")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        counts = Comment.objects.filter(post=OuterRef("pk")).order_by().values("post").annotate(count=Count("pk"))
+        comment_count = Coalesce(Subquery(counts.values("count")), 0)
+
+        last_id = 0
+        fixed = 0
+        while True:
+            ids = list(Post.objects.filter(pk__gt=last_id).order_by("pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                break
+
+            with transaction.atomic():
+                stale = Post.objects.filter(pk__in=ids).exclude(comment_count=comment_count)
+                fixed += stale.update(comment_count=comment_count)
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully recounted comments ({fixed} posts fixed)"))
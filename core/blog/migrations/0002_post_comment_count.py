@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("comment", "Comment")
+    counts = Comment.objects.filter(post=OuterRef("pk")).order_by().values("post").annotate(count=Count("pk"))
+    Post.objects.update(comment_count=Coalesce(Subquery(counts.values("count")), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0001_initial"),
+        ("comment", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:10
+
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    "ALTER TABLE blog_post ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS blog_post_search_vector_idx ON blog_post USING gin (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX CONCURRENTLY IF EXISTS blog_post_search_vector_idx",
+    "ALTER TABLE blog_post DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS blog_post_fts USING fts5(title, content, tokenize='porter unicode61')",
+]
+SQLITE_BACKWARD = [
+    "DROP TABLE IF EXISTS blog_post_fts",
+]
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0002_post_comment_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            run_for_vendor({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
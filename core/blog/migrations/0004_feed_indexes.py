@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+from BlogSite.db.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0003_post_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(fields=["-created_at", "-id"], name="blog_post_feed_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="blog_post_category_feed_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="post",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="blog_post_author_feed_idx",
+            ),
+        ),
+    ]
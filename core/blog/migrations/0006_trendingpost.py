@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0005_post_excerpt"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrendingPost",
+            fields=[
+                (
+                    "post",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="trending",
+                        serialize=False,
+                        to="blog.post",
+                    ),
+                ),
+                ("rank", models.PositiveIntegerField(unique=True)),
+                ("score", models.FloatField()),
+                ("scored_at", models.DateTimeField()),
+            ],
+            options={
+                "ordering": ["rank"],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:05
+
+import images.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0007_post_image_renditions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="post",
+            name="image",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                storage=images.storage.get_image_storage,
+                upload_to="posts/",
+            ),
+        ),
+    ]
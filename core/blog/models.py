@@ -2,12 +2,24 @@ from django.db import models
 from account.models import User
 import random
 from django.utils.html import mark_safe
+from django.utils.text import Truncator
+from django.urls import reverse
+from images.storage import get_image_storage
+from BlogSite.db.models import LoadedValuesMixin
+
+EXCERPT_LENGTH = 300
+# Columns of Post written by their own UPDATEs, never by Post.save
+MANAGED_FIELDS = ("comment_count", "image_renditions")
 
 
 def random_color():
     return "#{:06x}".format(random.randint(0, 0xFFFFFF))
 
 
+def make_excerpt(content: str) -> str:
+    return Truncator(" ".join(content.split())).chars(EXCERPT_LENGTH)
+
+
 class Category(models.Model):
     name = models.CharField(max_length=50, verbose_name="Name", unique=True)
     color = models.CharField(max_length=7, default=random_color)
@@ -27,18 +39,68 @@ class Category(models.Model):
     color_badge.short_description = "Color"
 
 
-class Post(models.Model):
+class Post(LoadedValuesMixin, models.Model):
     title = models.CharField(max_length=200)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, blank=True, null=True, related_name="posts")
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
-    image = models.ImageField(upload_to="posts/", blank=True, null=True)
+    # Stored once per distinct content and shared, see images.blobs
+    image = models.ImageField(upload_to="posts/", storage=get_image_storage, blank=True, null=True)
+    # Resized variants of the image, written by the images.tasks.generate_renditions task
+    image_renditions = models.JSONField(default=dict, blank=True, editable=False)
     content = models.TextField()
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
     published = models.BooleanField(default=True)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Feed ordering, optionally filtered by category or author
+            models.Index(fields=["-created_at", "-id"], name="blog_post_feed_idx"),
+            models.Index(fields=["category", "-created_at", "-id"], name="blog_post_category_feed_idx"),
+            models.Index(fields=["author", "-created_at", "-id"], name="blog_post_author_feed_idx"),
+        ]
 
     def __str__(self):
         return self.title
+
+    def get_absolute_url(self):
+        return reverse("post:detail", kwargs={"pk": self.pk})
+
+    def save(self, *args, update_fields=None, **kwargs):
+        # comment_count is kept up to date with atomic UPDATEs by the comment
+        # signals and image_renditions by the rendition task, so never write
+        # back the (possibly stale) loaded values.
+        if update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            deferred = self.get_deferred_fields()
+            update_fields = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in MANAGED_FIELDS and field.attname not in deferred
+            ]
+        # The excerpt is derived from the content, refresh it whenever the
+        # content is written (it may be deferred on summary querysets).
+        if update_fields is None or "content" in update_fields:
+            self.excerpt = make_excerpt(self.content)
+            if update_fields is not None and "excerpt" not in update_fields:
+                update_fields = [*update_fields, "excerpt"]
+        super().save(*args, update_fields=update_fields, **kwargs)
+
+
+class TrendingPost(models.Model):
+    """
+    Snapshot of the trending feed, written by the update_trending_posts task.
+    """
+
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name="trending")
+    rank = models.PositiveIntegerField(unique=True)
+    score = models.FloatField()
+    scored_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ["rank"]
+
+    def __str__(self):
+        return f"#{self.rank} {self.post_id}"
@@ -0,0 +1,126 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from django.conf import settings
+from django.db.models import Q, QuerySet
+
+
+def use_cursor_pagination(params) -> bool:
+    """
+    Decide whether a post feed request should be paginated with cursors.
+    Clients opt in with ``?pagination=cursor`` (or by sending a cursor), and
+    ``POST_PAGINATION_MODE = "cursor"`` makes it the default.
+    """
+    mode = params.get("pagination") or settings.POST_PAGINATION_MODE
+    return mode == "cursor" or bool(params.get("cursor"))
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class KeysetPage:
+    """
+    A single page of a keyset paginated queryset.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    Paginate posts by seeking on ``(created_at, id)`` instead of using OFFSET.
+
+    Every page is a single range scan of the feed index limited to
+    ``per_page + 1`` rows, so deep pages cost the same as the first one.
+    Cursors are opaque base64 strings holding the boundary row and the
+    direction to walk in.
+    """
+
+    def __init__(self, queryset: QuerySet, per_page: int):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    @staticmethod
+    def encode_cursor(obj, reverse: bool = False) -> str:
+        payload = {"t": obj.created_at.isoformat(), "i": obj.pk}
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            payload = json.loads(raw)
+            return datetime.fromisoformat(payload["t"]), int(payload["i"]), bool(payload.get("r"))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidCursor("Invalid cursor")
+
+    def seek(self, cursor: str = None) -> QuerySet:
+        """
+        Return the queryset ordered in the walking direction and starting
+        right after the cursor's boundary row.
+        """
+        queryset = self.queryset
+        reverse = False
+        if cursor:
+            created_at, pk, reverse = self.decode_cursor(cursor)
+            if reverse:
+                # Walking back towards newer posts, in ascending order.
+                queryset = queryset.filter(Q(created_at__gte=created_at), Q(created_at__gt=created_at) | Q(id__gt=pk))
+            else:
+                queryset = queryset.filter(Q(created_at__lte=created_at), Q(created_at__lt=created_at) | Q(id__lt=pk))
+
+        ordering = ("created_at", "id") if reverse else ("-created_at", "-id")
+        return queryset.order_by(*ordering)
+
+    def page(self, cursor: str = None, with_count: bool = False) -> KeysetPage:
+        rows = list(self.seek(cursor)[: self.per_page + 1])
+        count = self.queryset.count() if with_count else None
+        return self.make_page(rows, cursor, count)
+
+    async def apage(self, cursor: str = None, with_count: bool = False) -> KeysetPage:
+        rows = [row async for row in self.seek(cursor)[: self.per_page + 1]]
+        count = await self.queryset.acount() if with_count else None
+        return self.make_page(rows, cursor, count)
+
+    def make_page(self, rows: list, cursor: str = None, count: int = None) -> KeysetPage:
+        """
+        Build the page from the ``per_page + 1`` rows fetched after the cursor.
+        """
+        reverse = bool(cursor) and self.decode_cursor(cursor)[2]
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                next_cursor = self.encode_cursor(rows[-1])
+            if (has_more and reverse) or (cursor and not reverse):
+                previous_cursor = self.encode_cursor(rows[0], reverse=True)
+
+        return KeysetPage(rows, next_cursor, previous_cursor, count)
@@ -0,0 +1,134 @@
+import re
+from django.db import connections
+from django.db.models import BooleanField, FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+from .models import Post
+
+
+class PostSearchBackend:
+    """
+    Full-text index over post titles and contents.
+    """
+
+    vendor = None
+
+    def __init__(self, using: str = "default"):
+        self.using = using
+        self.table = Post._meta.db_table
+
+    def execute(self, sql: str, params=None):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        """
+        Filter ``queryset`` down to matching posts, most relevant first.
+        """
+        raise NotImplementedError
+
+    def index(self, post_ids):
+        """
+        Add or refresh the index entries of the given posts.
+        """
+        raise NotImplementedError
+
+    def remove(self, post_ids):
+        """
+        Drop the index entries of the given posts.
+        """
+        raise NotImplementedError
+
+    def prune(self):
+        """
+        Drop index entries whose post no longer exists.
+        """
+
+
+class PostgresPostSearchBackend(PostSearchBackend):
+    """
+    Search a weighted ``tsvector`` column of ``blog_post`` covered by a GIN index.
+    """
+
+    vendor = "postgresql"
+    config = "english"
+
+    def search(self, queryset, query):
+        tsquery = "websearch_to_tsquery(%s::regconfig, %s)"
+        params = (self.config, query)
+        matches = RawSQL(f'"{self.table}"."search_vector" @@ {tsquery}', params, output_field=BooleanField())
+        rank = RawSQL(f'ts_rank("{self.table}"."search_vector", {tsquery})', params, output_field=FloatField())
+        return queryset.filter(matches).annotate(search_rank=rank).order_by("-search_rank", "-created_at")
+
+    def index(self, post_ids):
+        self.execute(
+            f"UPDATE {self.table} SET search_vector = "
+            "setweight(to_tsvector(%s::regconfig, title), 'A') || "
+            "setweight(to_tsvector(%s::regconfig, content), 'B') "
+            "WHERE id = ANY(%s)",
+            [self.config, self.config, list(post_ids)],
+        )
+
+    def remove(self, post_ids):
+        # The vector lives on the post row and goes away with it.
+        pass
+
+
+class SQLitePostSearchBackend(PostSearchBackend):
+    """
+    Search an FTS5 shadow table keyed by post id, used for development and tests.
+    """
+
+    vendor = "sqlite"
+
+    def __init__(self, using="default"):
+        super().__init__(using)
+        self.fts_table = f"{self.table}_fts"
+
+    def match_expression(self, query: str) -> str:
+        # Quote every word so user input can't be parsed as FTS5 syntax.
+        return " ".join(f'"{word}"' for word in re.findall(r"\w+", query))
+
+    def search(self, queryset, query):
+        match = self.match_expression(query)
+        if not match:
+            return queryset.none()
+
+        matching_ids = RawSQL(f"SELECT rowid FROM {self.fts_table} WHERE {self.fts_table} MATCH %s", (match,))
+        # bm25() is lower for better matches, negate it to rank like Postgres.
+        rank = RawSQL(
+            f"SELECT -bm25({self.fts_table}, 10.0, 1.0) FROM {self.fts_table} "
+            f'WHERE {self.fts_table} MATCH %s AND rowid = "{self.table}"."id"',
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=matching_ids).annotate(search_rank=rank).order_by("-search_rank", "-created_at")
+
+    def index(self, post_ids):
+        post_ids = list(post_ids)
+        placeholders = ", ".join(["%s"] * len(post_ids))
+        self.remove(post_ids)
+        self.execute(
+            f"INSERT INTO {self.fts_table} (rowid, title, content) "
+            f"SELECT id, title, content FROM {self.table} WHERE id IN ({placeholders})",
+            post_ids,
+        )
+
+    def remove(self, post_ids):
+        post_ids = list(post_ids)
+        placeholders = ", ".join(["%s"] * len(post_ids))
+        self.execute(f"DELETE FROM {self.fts_table} WHERE rowid IN ({placeholders})", post_ids)
+
+    def prune(self):
+        self.execute(f"DELETE FROM {self.fts_table} WHERE rowid NOT IN (SELECT id FROM {self.table})")
+
+
+BACKENDS = {backend.vendor: backend for backend in (PostgresPostSearchBackend, SQLitePostSearchBackend)}
+
+
+def get_search_backend(using: str = "default") -> PostSearchBackend | None:
+    """
+    Return the search backend for the database ``using``, or None when the
+    database has no full-text index.
+    """
+    backend = BACKENDS.get(connections[using].vendor)
+    return backend(using) if backend else None
@@ -1,24 +1,175 @@
-from django.db.models.signals import pre_save, post_delete
-from django.dispatch import receiver
-from .models import Post
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.db import transaction
+from django.dispatch import Signal, receiver
+from .models import Category, Post
+from .cache import invalidate
+from .search import get_search_backend
+from .feeds import get_feed_store
+from .syndication import post_scopes
+from account.models import User
+from images.blobs import release, stored_name, update_references
+from images.deletion import delete_on_commit
+from images.renditions import needs_update, rendition_files
+from images.signals import renditions_updated
+from images.tasks import generate_renditions
+
+# Sent with the saved posts after bulk_create/bulk_update, which skip the model signals.
+posts_bulk_saved = Signal()
+
+# Columns of the author profile embedded in post responses and feeds.
+AUTHOR_FIELDS = {"username", "email", "image", "image_renditions", "is_verified", "is_active"}
 
 
 @receiver(pre_save, sender=Post)
-def delete_old_image(sender: Post, instance: Post, **kwargs):
-    if not instance.pk:
-        return  # Skip new instances
+def load_old_image(sender: Post, instance: Post, update_fields=None, **kwargs):
+    if not instance.pk or (update_fields is not None and "image" not in update_fields):
+        return  # Skip new instances and saves leaving the image alone
+    loaded = getattr(instance, "_loaded_values", {})
+    if "image" in loaded:
+        return  # Loaded with the instance, no query needed
+    # Only instances built by hand or loaded with the image deferred get here.
+    image = sender.objects.filter(pk=instance.pk).values_list("image", flat=True).first()
+    instance._loaded_values = {**loaded, "image": image}
 
-    try:
-        old_image = sender.objects.get(pk=instance.pk).image
-    except sender.DoesNotExist:
-        return
 
-    # If new image is different from old one
-    if old_image and old_image != instance.image:
-        old_image.delete(save=False)
+@receiver(post_save, sender=Post)
+def delete_old_image(sender: Post, instance: Post, using: str, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    old_image = "" if created else stored_name(getattr(instance, "_loaded_values", {}).get("image"))
+    # Images are shared by identical uploads, the file goes once no row references it.
+    update_references(old_image, instance.image.name or "", using)
 
 
 @receiver(post_delete, sender=Post)
-def auto_delete_image_on_delete(sender: Post, instance: Post, **kwargs):
+def auto_delete_image_on_delete(sender: Post, instance: Post, using: str, **kwargs):
     if instance.image:
-        instance.image.delete(save=False)
+        delete_on_commit("default", rendition_files(instance.image_renditions), using)
+        release(instance.image.name, using)
+
+
+@receiver(post_save, sender=Post)
+def queue_image_renditions(sender: Post, instance: Post, using: str, update_fields=None, **kwargs):
+    if update_fields is not None and "image" not in update_fields:
+        return
+    if needs_update(instance.image, instance.image_renditions):
+        transaction.on_commit(lambda: generate_renditions.delay("blog.Post", instance.pk), using=using, robust=True)
+
+
+@receiver(renditions_updated, sender=Post)
+def invalidate_post_renditions(sender: Post, pk: int, **kwargs):
+    invalidate("post:list", f"post:{pk}")
+
+
+@receiver(renditions_updated, sender=User)
+def invalidate_author_renditions(sender: User, pk: int, **kwargs):
+    # Posts embed their author's profile.
+    invalidate("post")
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_author_cache(sender: User, instance: User, update_fields=None, **kwargs):
+    if update_fields is not None and not AUTHOR_FIELDS.intersection(update_fields):
+        return  # Skip saves leaving the profile alone, like last_login updates
+    # Posts embed their author's profile, the feeds are cached under "post" too.
+    invalidate("post")
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_cache(sender: Post, instance: Post, **kwargs):
+    invalidate("post:list", f"post:{instance.pk}")
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender: Category, instance: Category, **kwargs):
+    # Posts embed their category, so every cached post response goes stale too.
+    invalidate("category:list", f"category:{instance.pk}", "post")
+
+
+@receiver(post_save, sender=Post)
+def update_search_index(sender: Post, instance: Post, using: str, **kwargs):
+    backend = get_search_backend(using)
+    if backend:
+        backend.index([instance.pk])
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_search_index(sender: Post, instance: Post, using: str, **kwargs):
+    backend = get_search_backend(using)
+    if backend:
+        backend.remove([instance.pk])
+
+
+@receiver(post_save, sender=Post)
+def update_category_feed(sender: Post, instance: Post, using: str, update_fields=None, **kwargs):
+    store = get_feed_store()
+    # created_at never changes, only a new category moves the post.
+    if store is None or (update_fields is not None and "category" not in update_fields):
+        return
+    # A failing Redis must not fail the write, rebuild_category_feeds repairs the sets.
+    transaction.on_commit(
+        lambda: store.add(instance.pk, instance.category_id, instance.created_at), using=using, robust=True
+    )
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_category_feed(sender: Post, instance: Post, using: str, **kwargs):
+    store = get_feed_store()
+    if store:
+        post_id = instance.pk
+        transaction.on_commit(lambda: store.remove(post_id), using=using, robust=True)
+
+
+@receiver(post_save, sender=Category)
+def add_category_feed(sender: Category, instance: Category, using: str, created: bool, **kwargs):
+    store = get_feed_store()
+    if store and created:
+        transaction.on_commit(lambda: store.add_category(instance.pk), using=using, robust=True)
+
+
+@receiver(post_delete, sender=Category)
+def remove_category_feed(sender: Category, instance: Category, using: str, **kwargs):
+    store = get_feed_store()
+    if store:
+        category_id = instance.pk
+        transaction.on_commit(lambda: store.remove_category(category_id), using=using, robust=True)
+
+
+@receiver(posts_bulk_saved, sender=Post)
+def invalidate_bulk_post_cache(sender: Post, posts: list[Post], **kwargs):
+    invalidate("post:list", *(f"post:{post.pk}" for post in posts))
+
+
+@receiver(posts_bulk_saved, sender=Post)
+def update_bulk_search_index(sender: Post, posts: list[Post], using: str, **kwargs):
+    backend = get_search_backend(using)
+    if backend and posts:
+        backend.index([post.pk for post in posts])
+
+
+@receiver(posts_bulk_saved, sender=Post)
+def update_bulk_category_feed(sender: Post, posts: list[Post], using: str, **kwargs):
+    store = get_feed_store()
+    if store:
+        rows = [(post.pk, post.category_id, post.created_at) for post in posts]
+        transaction.on_commit(lambda: store.add_many(rows), using=using, robust=True)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_syndication(sender: Post, instance: Post, **kwargs):
+    # A post moved to another category leaves the feed of its previous one.
+    loaded = getattr(instance, "_loaded_values", {})
+    invalidate(*post_scopes(instance.pk, {instance.category_id, loaded.get("category_id")} - {None}))
+
+
+@receiver(posts_bulk_saved, sender=Post)
+def invalidate_bulk_syndication(sender: Post, posts: list[Post], **kwargs):
+    scopes = set()
+    for post in posts:
+        loaded = getattr(post, "_loaded_values", {})
+        scopes.update(post_scopes(post.pk, {post.category_id, loaded.get("category_id")} - {None}))
+    invalidate(*sorted(scopes))
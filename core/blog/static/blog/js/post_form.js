@@ -24,17 +24,7 @@ const imagePreview = document.getElementById("image_preview");
 imageInput.addEventListener("change", function () {
     const file = this.files[0];
     if (file) {
-        const reader = new FileReader();
-        reader.onload = function (e) {
-            imagePreview.src = e.target.result;
-            // document.getElementById("image_data").value = imagePreview.src;
-        };
-        reader.readAsDataURL(file);
+        // The file itself is sent as multipart, the preview only needs a URL.
+        imagePreview.src = URL.createObjectURL(file);
     }
-});
-
-// Intercept form submit and insert cropped image data
-document.getElementById("form").addEventListener("submit", function (e) {
-    document.getElementById("image_data").value = imagePreview.src;
-    console.log("CHABGED");
 });
\ No newline at end of file
@@ -0,0 +1,97 @@
+from django.contrib.syndication.views import Feed
+from django.db.models import F, Max
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from .models import Category, Post
+
+FEED_SIZE = 20
+# Sitemap pages cover fixed ranges of post ids, so a post change only makes
+# the page of its own range stale.
+POSTS_PER_SITEMAP = 5000
+
+
+def sitemap_page(post_id: int) -> int:
+    return (post_id - 1) // POSTS_PER_SITEMAP + 1
+
+
+def feed_scopes(category_id: int = None) -> list[str]:
+    # The "post" generation moves when a category or an author changes.
+    return ["post", "feed:posts" if category_id is None else f"feed:category:{category_id}"]
+
+
+def post_scopes(post_id: int, category_ids) -> list[str]:
+    """
+    Return the scopes of the feeds and sitemaps a change of the post makes stale.
+    """
+    scopes = ["feed:posts", "sitemap:index", f"sitemap:page:{sitemap_page(post_id)}"]
+    return scopes + [f"feed:category:{category_id}" for category_id in sorted(category_ids)]
+
+
+class LatestPostsFeed(Feed):
+    """
+    RSS feed of the latest published posts, optionally of a single category.
+    """
+
+    description = "Latest posts"
+
+    def get_object(self, request, category_pk=None):
+        return get_object_or_404(Category, pk=category_pk) if category_pk is not None else None
+
+    def title(self, category):
+        return f"BlogWebApp: {category.name}" if category else "BlogWebApp"
+
+    def link(self, category):
+        return reverse("post:list")
+
+    def items(self, category):
+        posts = Post.objects.filter(published=True).select_related("author", "category").defer("content")
+        if category:
+            posts = posts.filter(category=category)
+        return posts.order_by("-created_at", "-id")[:FEED_SIZE]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return post.excerpt
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_pubdate(self, post):
+        return post.created_at
+
+    def item_updateddate(self, post):
+        return post.updated_at
+
+    def item_categories(self, post):
+        return [post.category.name] if post.category else []
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+def sitemap_index_entries() -> list[dict]:
+    """
+    Return the page numbers of the non-empty post sitemaps with the last change of each.
+    """
+    pages = (
+        Post.objects.filter(published=True)
+        .annotate(page=(F("pk") - 1) / POSTS_PER_SITEMAP + 1)
+        .values("page")
+        .annotate(last_mod=Max("updated_at"))
+        .order_by("page")
+    )
+    return list(pages)
+
+
+def sitemap_entries(page: int) -> list[dict]:
+    """
+    Return the posts of a sitemap page (a range of post ids) in id order.
+    """
+    first = (page - 1) * POSTS_PER_SITEMAP + 1
+    posts = Post.objects.filter(published=True, pk__gte=first, pk__lt=first + POSTS_PER_SITEMAP).order_by("pk")
+    return list(posts.values("pk", "updated_at"))
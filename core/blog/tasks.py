@@ -0,0 +1,14 @@
+from celery import shared_task
+from BlogSite.db.routers import use_primary
+from .trending import update_trending
+
+
+@shared_task
+def update_trending_posts():
+    """
+    This task is scheduled to run every few minutes to refresh the trending feed.
+    """
+    # The ranked pages are cached for every reader.
+    with use_primary():
+        count = update_trending()
+    print(f"Trending feed updated with {count} posts.")
@@ -0,0 +1,160 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from blog.models import Post, Category
+from blog.syndication import POSTS_PER_SITEMAP
+from account.models import User
+from comment.models import Comment
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def client() -> Client:
+    return Client()
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create_user(
+        username="testuser", email="testuser@example.com", password="testpassword", is_verified=True
+    )
+
+
+@pytest.fixture
+def other_user() -> User:
+    return User.objects.create_user(
+        username="otheruser", email="otheruser@example.com", password="testpassword", is_verified=True
+    )
+
+
+@pytest.fixture
+def category() -> Category:
+    return Category.objects.create(name="Test Category", color="#FFFFFF")
+
+
+@pytest.fixture
+def post(user: User, category: Category) -> Post:
+    return Post.objects.create(title="Test Post", content="This is a test post.", author=user, category=category)
+
+
+@pytest.mark.django_db
+class TestPostListView:
+    def test_cached_cards_follow_post_updates(self, client: Client, post: Post):
+        url = reverse("post:list")
+        assert "Test Post" in client.get(url).content.decode()
+
+        post.title = "Updated Title"
+        post.save()
+        content = client.get(url).content.decode()
+        assert "Updated Title" in content
+        assert "Test Post" not in content
+
+    def test_owner_controls_are_not_cached(self, client: Client, user: User, other_user: User, post: Post):
+        url = reverse("post:list")
+        update_url = reverse("post:update", kwargs={"pk": post.pk})
+
+        client.force_login(user)
+        assert update_url in client.get(url).content.decode()
+
+        client.force_login(other_user)
+        assert update_url not in client.get(url).content.decode()
+
+    def test_cards_show_excerpt(self, client: Client, user: User, category: Category):
+        post = Post.objects.create(title="Long Post", content="word " * 1000 + "ending", author=user, category=category)
+        content = client.get(reverse("post:list")).content.decode()
+        assert post.excerpt in content
+        assert "ending" not in content
+
+    def test_page_numbers(self, client: Client, user: User):
+        Post.objects.bulk_create(Post(title=f"Post {i}", content="Content", author=user) for i in range(12))
+        response = client.get(reverse("post:list"), {"page": 2})
+        assert response.status_code == 200
+        assert len(response.context["posts"]) == 2
+        assert client.get(reverse("post:list"), {"page": 3}).status_code == 404
+
+    def test_cursor_pages(self, client: Client, user: User):
+        Post.objects.bulk_create(Post(title=f"Post {i}", content="Content", author=user) for i in range(12))
+        response = client.get(reverse("post:list"), {"pagination": "cursor"})
+        next_cursor = response.context["page_obj"].next_cursor
+        response = client.get(reverse("post:list"), {"cursor": next_cursor})
+        assert len(response.context["posts"]) == 2
+        assert client.get(reverse("post:list"), {"cursor": "invalid"}).status_code == 404
+
+
+@pytest.mark.django_db
+class TestPostDetailView:
+    def test_detail(self, client: Client, user: User, post: Post):
+        Comment.objects.create(content="Nice post", author=user, post=post)
+        response = client.get(reverse("post:detail", kwargs={"pk": post.pk}))
+        assert response.status_code == 200
+        assert "Nice post" in response.content.decode()
+
+    def test_missing_post(self, client: Client):
+        assert client.get(reverse("post:detail", kwargs={"pk": 404})).status_code == 404
+
+
+@pytest.mark.django_db
+class TestSyndication:
+    @pytest.fixture
+    def other_category(self) -> Category:
+        return Category.objects.create(name="Other Category", color="#000000")
+
+    def test_feeds_list_published_posts(self, client: Client, user: User, post: Post, other_category: Category):
+        Post.objects.create(title="Draft", content="Content", author=user, published=False)
+        Post.objects.create(title="Elsewhere", content="Content", author=user, category=other_category)
+
+        rss = client.get(reverse("syndication:rss"))
+        assert rss.status_code == 200 and rss["Content-Type"].startswith("application/rss+xml")
+        assert "Test Post" in rss.content.decode() and "Elsewhere" in rss.content.decode()
+        assert "Draft" not in rss.content.decode()
+        assert "public" in rss["Cache-Control"] and "max-age=" in rss["Cache-Control"]
+
+        atom = client.get(reverse("syndication:category-atom", kwargs={"category_pk": post.category_id}))
+        assert atom["Content-Type"].startswith("application/atom+xml")
+        assert "Test Post" in atom.content.decode() and "Elsewhere" not in atom.content.decode()
+
+        assert client.get(reverse("syndication:category-rss", kwargs={"category_pk": 0})).status_code == 404
+
+    def test_served_prerendered_until_a_post_changes(
+        self, client: Client, django_capture_on_commit_callbacks, post: Post, other_category: Category
+    ):
+        url = reverse("syndication:category-rss", kwargs={"category_pk": post.category_id})
+        other_url = reverse("syndication:category-rss", kwargs={"category_pk": other_category.pk})
+        first = client.get(url)
+        client.get(other_url)
+        with CaptureQueriesContext(connection) as queries:
+            second = client.get(url)
+        assert len(queries) == 0
+        assert second.content == first.content
+        assert client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code == 304
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.category = other_category
+            post.save()
+        # Both the previous and the new category feed are rendered again.
+        assert "Test Post" not in client.get(url).content.decode()
+        assert "Test Post" in client.get(other_url).content.decode()
+
+    def test_sitemaps(self, client: Client, django_capture_on_commit_callbacks, user: User, post: Post):
+        index = client.get(reverse("syndication:sitemap-index"))
+        assert index["Content-Type"] == "application/xml"
+        sitemap_url = reverse("syndication:sitemap", kwargs={"page": 1})
+        assert sitemap_url in index.content.decode()
+
+        sitemap = client.get(sitemap_url)
+        assert reverse("post:detail", kwargs={"pk": post.pk}) in sitemap.content.decode()
+        assert sitemap["Last-Modified"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            new = Post.objects.create(title="New", content="Content", author=user)
+        assert reverse("post:detail", kwargs={"pk": new.pk}) in client.get(sitemap_url).content.decode()
+
+        page = POSTS_PER_SITEMAP * 10
+        assert client.get(reverse("syndication:sitemap", kwargs={"page": page})).status_code == 404
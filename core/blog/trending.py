@@ -0,0 +1,103 @@
+import math
+import time
+from datetime import datetime, timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from comment.models import Comment
+from .models import Post, TrendingPost
+
+PAGE_SIZE = 10
+META_KEY = "trending:meta"
+PAGE_KEY = "trending:{}:page:{}"
+WATERMARK_KEY = "trending:last-comment"
+# Posts below this score dropped out of the feed
+MIN_SCORE = 0.01
+
+
+def decay(age: timedelta) -> float:
+    """
+    Weight of something that happened ``age`` ago, halving every TRENDING_HALF_LIFE hours.
+    """
+    return math.pow(0.5, max(age.total_seconds(), 0) / (settings.TRENDING_HALF_LIFE * 3600))
+
+
+def update_trending(now: datetime = None) -> int:
+    """
+    Score posts by recency-weighted comment activity and store the ranked feed.
+
+    Scores from the previous run are decayed to ``now`` and the comments
+    published since then are added, so each run only reads the new comments.
+    Only the ranked posts keep their score between runs. Without a previous
+    run, all comments of the last few half-lives are read.
+    Return the number of ranked posts.
+    """
+    now = now or datetime.now()
+    last_comment_id = cache.get(WATERMARK_KEY)
+    latest_comment_id = Comment.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+
+    scores = {}
+    if last_comment_id is None:
+        since = now - timedelta(hours=settings.TRENDING_HALF_LIFE * 7)
+        comments = Comment.objects.filter(published_at__gte=since, pk__lte=latest_comment_id)
+    else:
+        for row in TrendingPost.objects.all():
+            scores[row.post_id] = row.score * decay(now - row.scored_at)
+        comments = Comment.objects.filter(pk__gt=last_comment_id, pk__lte=latest_comment_id)
+
+    for post_id, published_at in comments.values_list("post_id", "published_at").iterator():
+        scores[post_id] = scores.get(post_id, 0) + decay(now - published_at)
+
+    ranked = sorted(
+        ((score, post_id) for post_id, score in scores.items() if score >= MIN_SCORE),
+        key=lambda item: (-item[0], -item[1]),
+    )[: settings.TRENDING_SIZE]
+    post_ids = [post_id for _, post_id in ranked]
+
+    with transaction.atomic():
+        TrendingPost.objects.all().delete()
+        # Posts deleted since the comments were read have no row to point to.
+        existing = set(Post.objects.filter(pk__in=post_ids).values_list("pk", flat=True))
+        rows = [(score, post_id) for score, post_id in ranked if post_id in existing]
+        TrendingPost.objects.bulk_create(
+            TrendingPost(post_id=post_id, rank=rank, score=score, scored_at=now)
+            for rank, (score, post_id) in enumerate(rows, start=1)
+        )
+
+    store_pages([post_id for _, post_id in rows])
+    cache.set(WATERMARK_KEY, latest_comment_id, timeout=None)
+    return len(rows)
+
+
+def store_pages(post_ids: list[int]):
+    """
+    Cache the ranked post ids page by page under a new version, so a page is
+    a single cache read, then drop the pages of the previous version.
+    """
+    previous = cache.get(META_KEY)
+    version = time.time_ns()
+    starts = list(range(0, len(post_ids), PAGE_SIZE))
+    pages = [post_ids[start:end] for start, end in zip(starts, starts[1:] + [len(post_ids)])]
+    cache.set_many({PAGE_KEY.format(version, number): ids for number, ids in enumerate(pages, start=1)}, timeout=None)
+    cache.set(META_KEY, {"version": version, "count": len(post_ids)}, timeout=None)
+    if previous is not None:
+        count = math.ceil(previous["count"] / PAGE_SIZE)
+        cache.delete_many([PAGE_KEY.format(previous["version"], number) for number in range(1, count + 1)])
+
+
+def get_page(number: int) -> tuple[list[int], int]:
+    """
+    Return the post ids of a page of the trending feed and the feed's length.
+    """
+    meta = cache.get(META_KEY)
+    if meta is not None:
+        post_ids = cache.get(PAGE_KEY.format(meta["version"], number))
+        if post_ids is not None or (number - 1) * PAGE_SIZE >= meta["count"]:
+            return post_ids or [], meta["count"]
+
+    # Cache lost, read the page from the snapshot by its rank range.
+    start = (number - 1) * PAGE_SIZE
+    post_ids = list(
+        TrendingPost.objects.filter(rank__gt=start, rank__lte=start + PAGE_SIZE).values_list("post_id", flat=True)
+    )
+    return post_ids, TrendingPost.objects.count()
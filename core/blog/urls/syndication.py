@@ -0,0 +1,15 @@
+from django.urls import path
+from blog.views import PostFeedView, SitemapIndexView, SitemapView
+
+app_name = "syndication"
+
+urlpatterns = [
+    path("feeds/rss/", PostFeedView.as_view(), {"feed_type": "rss"}, name="rss"),
+    path("feeds/atom/", PostFeedView.as_view(), {"feed_type": "atom"}, name="atom"),
+    path("feeds/categories/<int:category_pk>/rss/", PostFeedView.as_view(), {"feed_type": "rss"}, name="category-rss"),
+    path(
+        "feeds/categories/<int:category_pk>/atom/", PostFeedView.as_view(), {"feed_type": "atom"}, name="category-atom"
+    ),
+    path("sitemap.xml", SitemapIndexView.as_view(), name="sitemap-index"),
+    path("sitemap-posts-<int:page>.xml", SitemapView.as_view(), name="sitemap"),
+]
@@ -1,5 +1,12 @@
 from django.urls import reverse_lazy
 from django.shortcuts import redirect
+from django.http import Http404
+from django.shortcuts import render
+from django.urls import reverse
+from django.utils.http import http_date
+from django.views import View
+from django.conf import settings
+from django.core.paginator import InvalidPage
 from django.views.generic import (
     ListView,
     CreateView,
@@ -13,6 +20,16 @@ from .models import Category, Post
 from account.mixins import SuperUserRequiredMixin, VerifiedUserRequiredMixin
 from .mixins import PostOwnerRequiredMixin
 from .forms import CategoryForm, PostForm
+from .paginators import KeysetPaginator, InvalidCursor, use_cursor_pagination
+from .cache import serve_prerendered
+from .conditional import as_aware
+from .syndication import (
+    LatestPostsFeed,
+    LatestPostsAtomFeed,
+    feed_scopes,
+    sitemap_entries,
+    sitemap_index_entries,
+)
 
 
 class CategoryListView(LoginRequiredMixin, SuperUserRequiredMixin, ListView):
@@ -101,11 +118,45 @@ class PostCreateView(LoginRequiredMixin, VerifiedUserRequiredMixin, CreateView):
 
 class PostListView(ListView):
     model = Post
-    queryset = Post.objects.select_related("author").select_related("category").prefetch_related("comments").all()
+    queryset = Post.objects.select_related("author").select_related("category").defer("content").all()
     context_object_name = "posts"
     template_name = "blog/posts.html"
     paginate_by = 10
 
+    async def get(self, request, *args, **kwargs):
+        # Run the feed queries on the async ORM, the template then only
+        # renders the already fetched page.
+        self.object_list = self.get_queryset()
+        self.pagination = await self.apaginate_queryset(self.object_list, self.get_paginate_by(self.object_list))
+        return self.render_to_response(self.get_context_data())
+
+    async def apaginate_queryset(self, queryset, page_size):
+        if use_cursor_pagination(self.request.GET):
+            paginator = KeysetPaginator(queryset, page_size)
+            try:
+                page = await paginator.apage(self.request.GET.get("cursor"))
+            except InvalidCursor as e:
+                raise Http404(str(e))
+            return (paginator, page, page.object_list, page.has_other_pages())
+
+        paginator = self.get_paginator(queryset, page_size, allow_empty_first_page=self.get_allow_empty())
+        # Paginator.count is cached, so page() below doesn't run it again.
+        paginator.count = await queryset.acount()
+        try:
+            page = paginator.page(self.request.GET.get(self.page_kwarg) or 1)
+        except InvalidPage as e:
+            raise Http404(str(e))
+        page.object_list = [post async for post in page.object_list]
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    def paginate_queryset(self, queryset, page_size):
+        return self.pagination
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["post_card_cache_timeout"] = settings.POST_CARD_CACHE_TIMEOUT
+        return context
+
 
 class PostUpdateView(LoginRequiredMixin, VerifiedUserRequiredMixin, PostOwnerRequiredMixin, UpdateView):
     model = Post
@@ -151,4 +202,86 @@ class PostDetailView(DetailView):
     template_name = "blog/post_detail.html"
 
     def get_queryset(self):
-        return self.model.objects.select_related("category").select_related("author").prefetch_related("comments").all()
+        return (
+            self.model.objects.select_related("category")
+            .select_related("author")
+            .prefetch_related("comments__author")
+            .all()
+        )
+
+    async def get(self, request, *args, **kwargs):
+        try:
+            self.object = await self.get_queryset().aget(pk=self.kwargs.get(self.pk_url_kwarg))
+        except Post.DoesNotExist:
+            raise Http404("No post found matching the query")
+        return self.render_to_response(self.get_context_data(object=self.object))
+
+
+class PostFeedView(View):
+    """
+    RSS or Atom feed of the latest posts, of every category or a single one.
+    Served pre-rendered, it is only rendered again after a post in it changes.
+    """
+
+    feeds = {"rss": LatestPostsFeed(), "atom": LatestPostsAtomFeed()}
+
+    def get(self, request, feed_type, category_pk=None):
+        feed = self.feeds[feed_type]
+        return serve_prerendered(
+            request,
+            f"feed:{feed_type}:{category_pk or 'all'}",
+            feed_scopes(category_pk),
+            lambda request: feed(request, category_pk=category_pk),
+            settings.SYNDICATION_MAX_AGE,
+        )
+
+
+class SitemapIndexView(View):
+    """
+    Sitemap index listing the post sitemap of every non-empty range of post ids.
+    """
+
+    def get(self, request):
+        return serve_prerendered(
+            request, "sitemap:index", ["sitemap:index"], self.render_sitemap, settings.SYNDICATION_MAX_AGE
+        )
+
+    def render_sitemap(self, request):
+        sitemaps = [
+            {
+                "location": request.build_absolute_uri(reverse("syndication:sitemap", kwargs={"page": entry["page"]})),
+                "last_mod": entry["last_mod"],
+            }
+            for entry in sitemap_index_entries()
+        ]
+        response = render(request, "sitemap_index.xml", {"sitemaps": sitemaps}, content_type="application/xml")
+        if sitemaps:
+            latest = max(sitemap["last_mod"] for sitemap in sitemaps)
+            response["Last-Modified"] = http_date(as_aware(latest).timestamp())
+        return response
+
+
+class SitemapView(View):
+    """
+    Sitemap of the published posts in one range of post ids.
+    """
+
+    def get(self, request, page):
+        return serve_prerendered(
+            request, f"sitemap:page:{page}", [f"sitemap:page:{page}"], self.render_sitemap, settings.SYNDICATION_MAX_AGE
+        )
+
+    def render_sitemap(self, request):
+        entries = sitemap_entries(self.kwargs["page"])
+        if not entries:
+            raise Http404("No posts in this sitemap")
+        urlset = [
+            {
+                "location": request.build_absolute_uri(reverse("post:detail", kwargs={"pk": entry["pk"]})),
+                "lastmod": entry["updated_at"],
+            }
+            for entry in entries
+        ]
+        response = render(request, "sitemap.xml", {"urlset": urlset}, content_type="application/xml")
+        response["Last-Modified"] = http_date(as_aware(max(entry["updated_at"] for entry in entries)).timestamp())
+        return response
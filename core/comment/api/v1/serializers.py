@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from comment.models import Comment
+from blog.api.v1.mixins import SparseFieldsetSerializerMixin
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(SparseFieldsetSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Comment model.
     """
@@ -1,7 +1,11 @@
+from io import StringIO
 import pytest
 from rest_framework import status
 from rest_framework.test import APIClient
 from django.urls import reverse
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from comment.models import Comment
 from account.models import User
 from blog.models import Post
@@ -134,3 +138,128 @@ class TestCommentAPI:
         url = reverse("comment:api-v1:comments-detail", args=[comment.id])
         response = api_client.delete(url)
         assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestPostCommentCount:
+    def test_count_follows_create_and_delete(self, user: User, post: Post) -> None:
+        comments = [Comment.objects.create(content="Comment", author=user, post=post) for _ in range(3)]
+        post.refresh_from_db()
+        assert post.comment_count == 3
+
+        comments[0].delete()
+        Comment.objects.filter(pk=comments[1].pk).delete()
+        post.refresh_from_db()
+        assert post.comment_count == 1
+
+    def test_count_follows_author_cascade(self, user: User, unverified_user: User, post: Post) -> None:
+        Comment.objects.create(content="Comment", author=user, post=post)
+        Comment.objects.create(content="Comment", author=unverified_user, post=post)
+        unverified_user.delete()
+        post.refresh_from_db()
+        assert post.comment_count == 1
+
+    def test_post_save_keeps_count(self, user: User, post: Post) -> None:
+        stale = Post.objects.get(pk=post.pk)
+        Comment.objects.create(content="Comment", author=user, post=post)
+        stale.title = "Updated"
+        stale.save()
+        post.refresh_from_db()
+        assert post.comment_count == 1
+
+    def test_recount_comments_command(self, user: User, post: Post) -> None:
+        Comment.objects.create(content="Comment", author=user, post=post)
+        Post.objects.filter(pk=post.pk).update(comment_count=42)
+        call_command("recount_comments", batch_size=1, stdout=StringIO())
+        post.refresh_from_db()
+        assert post.comment_count == 1
+
+
+@pytest.mark.django_db
+class TestCommentSparseFieldsets:
+    def test_list_fields(self, api_client: APIClient, comment: Comment) -> None:
+        url = reverse("post:api-v1:post-comments-list", kwargs={"post_pk": comment.post.id})
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"fields": "id,published_at"})
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data["results"][0]) == {"id", "published_at"}
+        assert '"comment_comment"."content"' not in queries.captured_queries[-1]["sql"]
+
+    def test_retrieve_omit(self, api_client: APIClient, comment: Comment) -> None:
+        url = reverse("comment:api-v1:comments-detail", args=[comment.id])
+        response = api_client.get(url, {"omit": "content"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "content" not in response.data and response.data["id"] == comment.id
+
+    def test_fields_ignored_on_update(self, api_client: APIClient, user: User, comment: Comment) -> None:
+        api_client.force_authenticate(user=user)
+        url = reverse("comment:api-v1:comments-detail", args=[comment.id]) + "?fields=id"
+        response = api_client.patch(url, {"content": "Updated content"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["content"] == "Updated content"
+
+
+@pytest.mark.django_db
+class TestCommentConditionalGet:
+    def test_retrieve_not_modified(self, api_client: APIClient, comment: Comment) -> None:
+        url = reverse("comment:api-v1:comments-detail", args=[comment.id])
+        response = api_client.get(url)
+        assert response.has_header("Last-Modified")
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        comment.content = "Edited content"
+        comment.save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_list_etag_follows_deletions(self, api_client: APIClient, user: User, comment: Comment) -> None:
+        url = reverse("post:api-v1:post-comments-list", kwargs={"post_pk": comment.post.id})
+        etag = api_client.get(url)["ETag"]
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_304_NOT_MODIFIED
+
+        comment.delete()
+        assert api_client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == status.HTTP_200_OK
+
+    def test_missing_comment(self, api_client: APIClient) -> None:
+        url = reverse("comment:api-v1:comments-detail", args=["abc"])
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestLatestComments:
+    @pytest.fixture
+    def posts(self, user: User) -> list[Post]:
+        posts = [Post.objects.create(title=f"Post {i}", content="Content", author=user) for i in range(3)]
+        for post in posts[:2]:
+            for i in range(4):
+                Comment.objects.create(content=f"{post.title} comment {i}", author=user, post=post)
+        return posts
+
+    def test_latest_per_post_in_one_query(self, api_client: APIClient, posts: list[Post]) -> None:
+        url = reverse("comment:api-v1:comments-latest")
+        post_ids = [posts[2].id, posts[0].id, posts[1].id]
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"posts": ",".join(map(str, post_ids)), "limit": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 1
+        assert "ROW_NUMBER()" in queries[0]["sql"]
+
+        results = response.data["results"]
+        assert [result["post"] for result in results] == post_ids
+        assert results[0]["comments"] == []
+        assert [comment["content"] for comment in results[1]["comments"]] == ["Post 0 comment 3", "Post 0 comment 2"]
+        assert [comment["content"] for comment in results[2]["comments"]] == ["Post 1 comment 3", "Post 1 comment 2"]
+
+    def test_sparse_fields(self, api_client: APIClient, posts: list[Post]) -> None:
+        url = reverse("comment:api-v1:comments-latest")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url, {"posts": f"{posts[0].id},{posts[1].id}", "fields": "id,content"})
+        assert len(queries) == 1
+        comments = response.data["results"][1]["comments"]
+        assert len(comments) == 3 and set(comments[0]) == {"id", "content"}
+
+    @pytest.mark.parametrize("params", [{}, {"posts": "1,a"}, {"posts": "1", "limit": 0}, {"posts": "1", "limit": 21}])
+    def test_invalid_params(self, api_client: APIClient, params: dict) -> None:
+        response = api_client.get(reverse("comment:api-v1:comments-latest"), params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
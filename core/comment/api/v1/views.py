@@ -1,16 +1,25 @@
 from rest_framework.viewsets import GenericViewSet
 from rest_framework import mixins
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition, etag
 from comment.models import Comment
 from rest_framework.permissions import IsAuthenticatedOrReadOnly
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
 from account.api.v1.permissions import IsVerifiedOrReadOnly
+from blog.api.v1.mixins import SparseFieldsetMixin
 from .serializers import CommentSerializer
 from .permissions import IsAuthorOrReadOnly
 from .paginations import CommentPagination
+from comment.conditional import comment_etag, comment_last_modified, post_comments_etag
 
 
-class PostCommentsViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
+class PostCommentsViewSet(SparseFieldsetMixin, mixins.CreateModelMixin, mixins.ListModelMixin, GenericViewSet):
     """
     ViewSet for managing comments.
     """
@@ -35,8 +44,14 @@ class PostCommentsViewSet(mixins.CreateModelMixin, mixins.ListModelMixin, Generi
         post_id = self.kwargs.get("post_pk")
         serializer.save(author=self.request.user, post_id=post_id)
 
+    @method_decorator(etag(post_comments_etag))
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
 
-class CommentViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.DestroyModelMixin, GenericViewSet):
+
+class CommentViewSet(
+    SparseFieldsetMixin, mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.DestroyModelMixin, GenericViewSet
+):
     """
     ViewSet for managing individual comments.
     """
@@ -48,3 +63,56 @@ class CommentViewSet(mixins.RetrieveModelMixin, mixins.UpdateModelMixin, mixins.
     filterset_fields = ["post", "author"]
     search_fields = ["content"]
     ordering_fields = ["created_at", "updated_at"]
+    latest_max_posts = 100
+    latest_max_limit = 20
+    latest_default_limit = 3
+
+    @action(detail=False, methods=["get"])
+    def latest(self, request, *args, **kwargs):
+        """
+        Return the latest ``?limit=`` comments of each post in ``?posts=1,2,3``
+        with a single windowed query, in the order the posts were given.
+        """
+        post_ids, limit = self.get_latest_params()
+        # ROW_NUMBER() OVER (PARTITION BY post_id ...) numbers the comments of
+        # each post newest first, Django filters on it in an outer query.
+        row_number = Window(
+            RowNumber(), partition_by=[F("post_id")], order_by=[F("published_at").desc(), F("id").desc()]
+        )
+        comments = list(
+            self.get_queryset()
+            .filter(post_id__in=post_ids)
+            # post_id may be left out by ?fields=, the annotation is always loaded.
+            .annotate(row_number=row_number, latest_post_id=F("post_id"))
+            .filter(row_number__lte=limit)
+            .order_by("post_id", "row_number")
+        )
+
+        data = {post_id: [] for post_id in post_ids}
+        for comment, representation in zip(comments, self.get_serializer(comments, many=True).data):
+            data[comment.latest_post_id].append(representation)
+        return Response({"results": [{"post": post_id, "comments": data[post_id]} for post_id in post_ids]})
+
+    def get_latest_params(self) -> tuple[list[int], int]:
+        params = self.request.query_params
+        errors = {}
+        try:
+            post_ids = list(dict.fromkeys(int(pk) for pk in params.get("posts", "").split(",") if pk.strip()))
+        except ValueError:
+            post_ids = None
+            errors["posts"] = ["Expected a comma separated list of post ids."]
+        if post_ids is not None and not 0 < len(post_ids) <= self.latest_max_posts:
+            errors["posts"] = [f"Give between 1 and {self.latest_max_posts} post ids."]
+        try:
+            limit = int(params.get("limit", self.latest_default_limit))
+        except ValueError:
+            limit = 0
+        if not 0 < limit <= self.latest_max_limit:
+            errors["limit"] = [f"Expected a number between 1 and {self.latest_max_limit}."]
+        if errors:
+            raise ValidationError(errors)
+        return post_ids, limit
+
+    @method_decorator(condition(etag_func=comment_etag, last_modified_func=comment_last_modified))
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
@@ -0,0 +1,29 @@
+from django.db.models import Count, Max
+from blog.conditional import as_aware, make_etag, memoize_on_request
+from .models import Comment
+
+
+def _comment_state(request, pk):
+    return memoize_on_request(
+        request,
+        "_comment_state",
+        lambda: Comment.objects.filter(pk=pk).values_list("edited_at", flat=True).first(),
+    )
+
+
+def comment_etag(request, *args, pk=None, **kwargs):
+    edited_at = _comment_state(request, pk)
+    return make_etag(request, pk, edited_at) if edited_at else None
+
+
+def comment_last_modified(request, *args, pk=None, **kwargs):
+    return as_aware(_comment_state(request, pk))
+
+
+def post_comments_etag(request, *args, post_pk=None, **kwargs):
+    def lookup():
+        # Served by the (post, published_at) index, the count catches deletions.
+        return Comment.objects.filter(post_id=post_pk).aggregate(count=Count("pk"), edited_at=Max("edited_at"))
+
+    state = memoize_on_request(request, "_post_comments_state", lookup)
+    return make_etag(request, post_pk, state["count"], state["edited_at"]) if state else None
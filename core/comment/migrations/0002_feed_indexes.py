@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:12
+
+from django.conf import settings
+from django.db import migrations, models
+from BlogSite.db.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently on PostgreSQL, outside a transaction.
+    atomic = False
+
+    dependencies = [
+        ("blog", "0004_feed_indexes"),
+        ("comment", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="comment",
+            index=models.Index(fields=["post", "-published_at"], name="comment_post_published_idx"),
+        ),
+    ]
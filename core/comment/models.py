@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from account.models import User
 from blog.models import Post
 
@@ -12,6 +12,15 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ["-published_at"]
+        indexes = [
+            # Comments of a post, newest first
+            models.Index(fields=["post", "-published_at"], name="comment_post_published_idx"),
+        ]
 
     def __str__(self):
         return f"{self.author} on {self.post}: {self.content}"
+
+    def save(self, *args, **kwargs):
+        # Keep the insert and the post's comment_count update in one transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
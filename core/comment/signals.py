@@ -0,0 +1,26 @@
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from blog.models import Post
+from blog.cache import invalidate
+from .models import Comment
+
+
+@receiver(post_save, sender=Comment)
+def increase_post_comment_count(sender: Comment, instance: Comment, created: bool, **kwargs):
+    if not created:
+        return
+
+    Post.objects.filter(pk=instance.post_id).update(comment_count=F("comment_count") + 1)
+    invalidate("post:list", f"post:{instance.post_id}")
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_post_comment_count(sender: Comment, instance: Comment, origin=None, **kwargs):
+    # Skip comments removed by the cascade of their own post's deletion
+    if isinstance(origin, Post) or (isinstance(origin, QuerySet) and origin.model is Post):
+        return
+
+    Post.objects.filter(pk=instance.post_id).update(comment_count=Greatest(F("comment_count") - 1, 0))
+    invalidate("post:list", f"post:{instance.post_id}")
@@ -0,0 +1,18 @@
+import copy
+import pytest
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings_parallel_suffix):
+    """
+    Add a "replica" alias with its own test database, so the replica router
+    can be tested against two databases.
+    """
+    from django.db import connections
+
+    if "replica" not in connections.settings:
+        replica = copy.deepcopy(connections.settings["default"])
+        replica["TEST"]["MIRROR"] = None
+        if replica["ENGINE"] != "django.db.backends.sqlite3":
+            replica["TEST"]["NAME"] = f"test_{replica['NAME']}_replica"
+        connections.settings["replica"] = replica
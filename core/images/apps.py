@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class ImagesConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "images"
+
+    def ready(self):
+        from django.conf import settings
+        from PIL import Image
+
+        # Pillow warns past this many pixels and refuses twice as many, which
+        # also guards the rendition task against decompression bombs.
+        Image.MAX_IMAGE_PIXELS = settings.IMAGE_UPLOAD_MAX_PIXELS
@@ -0,0 +1,51 @@
+from django.db.models import F
+from .deletion import delete_on_commit
+from .models import Blob
+from .storage import IMAGE_STORAGE
+
+
+def stored_name(value) -> str:
+    """
+    Return the name of a file field value, loaded (a string) or assigned (a FieldFile).
+    """
+    return getattr(value, "name", value) or ""
+
+
+def add_reference(name: str, using: str = None):
+    """
+    Count one more row referencing the stored file ``name``.
+    """
+    blobs = Blob.objects.using(using)
+    # A concurrent release() may delete the row between both queries, retry then.
+    while not blobs.filter(pk=name).update(references=F("references") + 1):
+        _, created = blobs.get_or_create(pk=name, defaults={"references": 1})
+        if created:
+            return
+
+
+def release(name: str, using: str = None):
+    """
+    Count one row less referencing the stored file ``name`` and delete the
+    file in the background after the commit once no row references it.
+
+    The Blob is kept at zero references until the file is deleted, so a new
+    upload counting it again locks the row the deletion checks.
+    Files saved before reference counting have no Blob and belong to a single row.
+    """
+    blobs = Blob.objects.using(using)
+    if blobs.filter(pk=name, references__gt=0).update(references=F("references") - 1):
+        if not blobs.filter(pk=name, references=0).exists():
+            return
+    delete_on_commit(IMAGE_STORAGE, [name], using)
+
+
+def update_references(old: str, new: str, using: str = None):
+    """
+    Move a reference from the stored file ``old`` to ``new``, either may be empty.
+    """
+    if old == new:
+        return
+    if new:
+        add_reference(new, using)
+    if old:
+        release(old, using)
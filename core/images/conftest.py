@@ -0,0 +1,35 @@
+import io
+import pytest
+from PIL import Image
+from django.core.files.uploadedfile import SimpleUploadedFile
+from account.models import User
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def make_image():
+    def make_image(
+        width: int = 20,
+        height: int = 20,
+        color: str = "red",
+        mode: str = "RGB",
+        format: str = "PNG",
+        name: str = "photo.png",
+    ) -> SimpleUploadedFile:
+        output = io.BytesIO()
+        Image.new(mode, (width, height), color).save(output, format)
+        return SimpleUploadedFile(name, output.getvalue(), content_type=f"image/{format.lower()}")
+
+    return make_image
+
+
+@pytest.fixture
+def user() -> User:
+    return User.objects.create_user(
+        username="testuser", email="testuser@example.com", password="testpassword", is_verified=True
+    )
@@ -0,0 +1,67 @@
+import time
+from collections import defaultdict
+from django.db import transaction
+from .tasks import delete_media
+
+# Files per delete_media task
+BATCH_SIZE = 500
+
+
+class DeletionBatch:
+    """
+    The files deleted by a transaction, sent to delete_media by a single
+    on_commit callback. Dropped with the transaction (or savepoint) that
+    registered it when that is rolled back.
+
+    Django has no public API telling whether an on_commit callback is still
+    pending, so ``is_pending`` reads the private ``connection.run_on_commit``
+    list and ``connection.savepoint_ids`` (Django 5.2). Without them every
+    deletion gets its own batch, which is correct, only not batched.
+    """
+
+    def __init__(self, connection):
+        self.names = defaultdict(list)
+        self.sent = False
+        self.savepoint_ids = list(getattr(connection, "savepoint_ids", []))
+        transaction.on_commit(self.send, using=connection.alias, robust=True)
+        callbacks = getattr(connection, "run_on_commit", None) or [None]
+        self.index = len(callbacks) - 1
+        self.entry = callbacks[self.index]
+
+    def is_pending(self, connection) -> bool:
+        # A rollback discards the callback, the batch must not collect more files then.
+        callbacks = getattr(connection, "run_on_commit", None)
+        if self.sent or self.entry is None or callbacks is None:
+            return False
+        if self.savepoint_ids != getattr(connection, "savepoint_ids", None):
+            return False
+        return self.index < len(callbacks) and callbacks[self.index] is self.entry
+
+    def send(self):
+        self.sent = True
+        queued_at = time.time()
+        for storage, names in self.names.items():
+            for start in range(0, len(names), BATCH_SIZE):
+                delete_media.delay(storage, names[start:][:BATCH_SIZE], queued_at)
+
+
+def delete_on_commit(storage: str, names, using: str = None):
+    """
+    Delete the files ``names`` of the storage alias ``storage`` in the
+    background once the current transaction commits.
+
+    Every file deleted by a transaction, e.g. the images of all the posts of
+    a deleted user, goes out in a few batched tasks instead of one delete per
+    file inside the request.
+    """
+    names = [name for name in names if name]
+    if not names:
+        return
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        transaction.on_commit(lambda: delete_media.delay(storage, names, time.time()), using=using, robust=True)
+        return
+    batch = getattr(connection, "media_deletion_batch", None)
+    if batch is None or not batch.is_pending(connection):
+        batch = connection.media_deletion_batch = DeletionBatch(connection)
+    batch.names[storage].extend(names)
@@ -0,0 +1,14 @@
+from django import forms
+from .uploads import check_upload
+
+
+class ImageUploadField(forms.ImageField):
+    """
+    ImageField rejecting uploads over the limits of ``check_upload`` before
+    Pillow verifies the whole image.
+    """
+
+    def to_python(self, data):
+        if data not in self.empty_values:
+            check_upload(data)
+        return super().to_python(data)
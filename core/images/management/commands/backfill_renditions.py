@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+from images.media import IMAGE_MODELS
+from images.renditions import needs_update, update_renditions
+from images.tasks import generate_renditions
+
+
+class Command(BaseCommand):
+    help = "Render the missing or stale image renditions of every post and user"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500, help="Number of rows read per query")
+        parser.add_argument("--workers", type=int, default=1, help="Number of images rendered at once")
+        parser.add_argument("--queue", action="store_true", help="Queue Celery tasks instead of rendering here")
+
+    @staticmethod
+    def render_in_thread(model, pk) -> bool:
+        try:
+            return update_renditions(model, pk)
+        finally:
+            # Worker threads open their own connections.
+            connections.close_all()
+
+    def pending(self, model, batch_size):
+        last_id = 0
+        while True:
+            rows = list(
+                model.objects.filter(pk__gt=last_id).order_by("pk").only("pk", "image", "image_renditions")[:batch_size]
+            )
+            if not rows:
+                break
+            yield [row.pk for row in rows if needs_update(row.image, row.image_renditions)]
+            last_id = rows[-1].pk
+
+    def handle(self, *args, **options):
+        workers = options["workers"]
+        executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 and not options["queue"] else None
+
+        for label in IMAGE_MODELS:
+            model = apps.get_model(label)
+            updated = 0
+            for pks in self.pending(model, options["batch_size"]):
+                if options["queue"]:
+                    for pk in pks:
+                        generate_renditions.delay(label, pk)
+                    updated += len(pks)
+                elif executor:
+                    updated += sum(executor.map(self.render_in_thread, [model] * len(pks), pks))
+                else:
+                    updated += sum(update_renditions(model, pk) for pk in pks)
+            action = "queued" if options["queue"] else "updated"
+            self.stdout.write(f"{label}: {action} {updated} image renditions")
+
+        if executor:
+            executor.shutdown()
+        self.stdout.write(self.style.SUCCESS("Successfully backfilled image renditions"))
@@ -0,0 +1,30 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from images.media import delete_stored, find_orphans
+
+
+class Command(BaseCommand):
+    help = "Delete the uploaded images and renditions no post or user references"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age", type=int, default=settings.MEDIA_ORPHAN_MIN_AGE, help="Only files older than this many hours"
+        )
+        parser.add_argument("--dry-run", action="store_true", help="List the orphans without deleting them")
+
+    def handle(self, *args, **options):
+        started = time.time()
+        orphans = find_orphans(timedelta(hours=options["min_age"]))
+        for storage, names in orphans.items():
+            for name in names:
+                self.stdout.write(f"{storage}: {name}")
+            if options["dry_run"]:
+                continue
+            for name in delete_stored(storage, names, started):
+                self.stderr.write(f"{storage}: failed to delete {name}")
+
+        found = sum(map(len, orphans.values()))
+        action = "Found" if options["dry_run"] else "Swept"
+        self.stdout.write(self.style.SUCCESS(f"{action} {found} orphan media files"))
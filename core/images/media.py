@@ -0,0 +1,95 @@
+from datetime import timedelta
+from django.apps import apps
+from django.core.files.storage import storages
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
+from .models import Blob
+from .renditions import rendition_files
+from .storage import IMAGE_STORAGE
+
+# Models with an ``image`` field and its ``image_renditions``
+IMAGE_MODELS = ["blog.Post", "account.User"]
+# Directories of each storage alias holding uploaded images and their renditions
+MEDIA_DIRECTORIES = {IMAGE_STORAGE: ["blobs", "posts", "users"], "default": ["renditions"]}
+
+
+def delete_stored(storage: str, names: list[str], queued_at: float = None) -> list[str]:
+    """
+    Delete the files ``names`` of a storage alias and return the ones that failed.
+
+    Images of the content-addressed storage referenced again since their
+    deletion was queued (at the ``queued_at`` timestamp) are kept: their Blob
+    is locked until the files are deleted, so an upload counting it again
+    waits for the deletion or the deletion for its commit, and files reused
+    by an upload after ``queued_at`` (which touches them) are left to it.
+    """
+    if storage != IMAGE_STORAGE:
+        return _delete_files(storages[storage], names)
+    with transaction.atomic(using=DEFAULT_DB_ALIAS):
+        blobs = Blob.objects.using(DEFAULT_DB_ALIAS).select_for_update().filter(pk__in=names)
+        references = dict(blobs.values_list("pk", "references"))
+        names = [name for name in names if not references.get(name)]
+        if queued_at is not None:
+            names = [name for name in names if not _modified_since(storages[storage], name, queued_at)]
+        failed = _delete_files(storages[storage], names)
+        Blob.objects.using(DEFAULT_DB_ALIAS).filter(pk__in=set(names) - set(failed), references=0).delete()
+    return failed
+
+
+def _modified_since(storage, name: str, timestamp: float) -> bool:
+    try:
+        return storage.get_modified_time(name).timestamp() > timestamp
+    except FileNotFoundError:
+        return False
+
+
+def _delete_files(storage, names: list[str]) -> list[str]:
+    failed = []
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            failed.append(name)
+    return failed
+
+
+def referenced_files() -> set[str]:
+    names = set()
+    for label in IMAGE_MODELS:
+        # From the primary, a row a lagging replica misses would lose its files.
+        rows = apps.get_model(label).objects.using(DEFAULT_DB_ALIAS).values_list("image", "image_renditions")
+        for image, renditions in rows.iterator(chunk_size=2000):
+            if image:
+                names.add(image)
+            names.update(rendition_files(renditions or {}))
+    return names
+
+
+def stored_files(storage, directory: str):
+    if not storage.exists(directory):
+        return
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield f"{directory}/{name}"
+    for name in directories:
+        yield from stored_files(storage, f"{directory}/{name}")
+
+
+def find_orphans(min_age: timedelta) -> dict[str, list[str]]:
+    """
+    Return the files of the media directories, by storage alias, that no row
+    references. Files younger than ``min_age`` are left out, their row may
+    not be committed yet.
+    """
+    referenced = referenced_files()
+    cutoff = timezone.now() - min_age
+    orphans = {}
+    for alias, directories in MEDIA_DIRECTORIES.items():
+        storage = storages[alias]
+        orphans[alias] = [
+            name
+            for directory in directories
+            for name in stored_files(storage, directory)
+            if name not in referenced and storage.get_modified_time(name) < cutoff
+        ]
+    return orphans
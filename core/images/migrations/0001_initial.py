@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:05
+
+from collections import Counter
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def count_references(apps, schema_editor):
+    # Files uploaded so far keep their names, they are counted like blobs.
+    Blob = apps.get_model("images", "Blob")
+    references = Counter()
+    for label in ("blog.Post", "account.User"):
+        model = apps.get_model(label)
+        rows = model.objects.exclude(image="").exclude(image__isnull=True).values("image").annotate(count=Count("pk"))
+        for row in rows.order_by():
+            references[row["image"]] += row["count"]
+    Blob.objects.bulk_create([Blob(name=name, references=count) for name, count in references.items()], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("account", "0004_alter_user_image"),
+        ("blog", "0008_alter_post_image"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Blob",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=255, primary_key=True, serialize=False),
+                ),
+                ("references", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(count_references, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class Blob(models.Model):
+    """
+    A file of the content-addressed storage with the number of image fields
+    referencing it.
+    """
+
+    name = models.CharField(max_length=255, primary_key=True)
+    references = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} ({self.references})"
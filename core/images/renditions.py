@@ -0,0 +1,131 @@
+import io
+import os
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import router
+from django.db.models import Model, Q
+from django.db.models.fields.files import ImageFieldFile
+from PIL import Image, ImageOps
+from .signals import renditions_updated
+
+# Rendition name: longest edge in pixels. Images are never scaled up.
+SIZES = {"thumbnail": 96, "card": 640, "full": 1600}
+# Format: (Pillow format, save options, MIME type)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}, "image/webp"),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}, "image/jpeg"),
+}
+
+
+def rendition_name(source: str, size: str, extension: str) -> str:
+    base, _ = os.path.splitext(source)
+    return f"renditions/{base}/{size}.{extension}"
+
+
+def encode(image: Image.Image, extension: str) -> bytes:
+    pil_format, options, _ = FORMATS[extension]
+    if extension == "jpeg" and image.mode != "RGB":
+        # JPEG has no alpha channel, flatten transparent images on white.
+        rgba = image.convert("RGBA")
+        image = Image.new("RGB", rgba.size, (255, 255, 255))
+        image.paste(rgba, mask=rgba.getchannel("A"))
+    elif image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+    output = io.BytesIO()
+    image.save(output, pil_format, **options)
+    return output.getvalue()
+
+
+def render(field_file: ImageFieldFile) -> dict:
+    """
+    Write every size of the image in every format next to each other and
+    return their description, to be stored in the model's renditions field:
+    ``{"source": name, "sizes": {size: {"width", "height", "webp", "jpeg"}}}``.
+
+    Renditions belong to their row, so they go to the default storage even
+    when the image itself is shared in the content-addressed one.
+    """
+    with field_file.open("rb") as source:
+        original = Image.open(source)
+        original = ImageOps.exif_transpose(original)
+        original.load()
+
+    sizes = {}
+    previous = None
+    for size, edge in sorted(SIZES.items(), key=lambda item: item[1]):
+        image = original.copy()
+        image.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+        if previous and sizes[previous]["width"] == image.width:
+            # The original is smaller than this size, reuse the previous files.
+            sizes[size] = sizes[previous]
+            continue
+        sizes[size] = {"width": image.width, "height": image.height}
+        for extension in FORMATS:
+            name = rendition_name(field_file.name, size, extension)
+            sizes[size][extension] = default_storage.save(name, ContentFile(encode(image, extension)))
+        previous = size
+    return {"source": field_file.name, "sizes": sizes}
+
+
+def rendition_files(renditions: dict) -> set[str]:
+    return {entry[extension] for entry in renditions.get("sizes", {}).values() for extension in FORMATS}
+
+
+def delete_files(names):
+    for name in names:
+        default_storage.delete(name)
+
+
+def is_current(image: ImageFieldFile, renditions: dict) -> bool:
+    """
+    Whether the renditions were made from the image now set on the instance.
+    """
+    return (renditions or {}).get("source") == (image.name or None)
+
+
+def needs_update(image: ImageFieldFile, renditions: dict) -> bool:
+    return not is_current(image, renditions) or bool(image) != bool(renditions)
+
+
+def update_renditions(model: type[Model], pk, field: str = "image", renditions_field: str = "image_renditions") -> bool:
+    """
+    Render the image of an instance and store the result on it, then delete
+    the files of its previous renditions. Return whether the instance changed.
+
+    The renditions are only stored if the image didn't change meanwhile (the
+    save that changed it queued another run), so a slow run never overwrites
+    the renditions of a newer image.
+    """
+    # Queued on commit, a lagging replica may not have the new image yet.
+    queryset = model.objects.using(router.db_for_write(model))
+    instance = queryset.filter(pk=pk).only("pk", field, renditions_field).first()
+    if instance is None:
+        return False
+    image = getattr(instance, field)
+    previous = getattr(instance, renditions_field) or {}
+    if not needs_update(image, previous):
+        return False
+
+    renditions = render(image) if image else {}
+    unchanged = Q(**{field: image.name}) if image else Q(**{field: ""}) | Q(**{f"{field}__isnull": True})
+    if not queryset.filter(unchanged, pk=pk).update(**{renditions_field: renditions}):
+        delete_files(rendition_files(renditions))
+        return False
+    delete_files(rendition_files(previous) - rendition_files(renditions))
+    renditions_updated.send(sender=model, pk=pk)
+    return True
+
+
+def srcsets(image: ImageFieldFile, renditions: dict, absolute=None) -> dict | None:
+    """
+    Return the ``srcset`` of each format, or None while the image has no
+    current renditions. ``absolute`` turns the URLs into absolute ones.
+    """
+    if not image or not renditions or not is_current(image, renditions):
+        return None
+    entries = sorted({entry["width"]: entry for entry in renditions["sizes"].values()}.items())
+    absolute = absolute or (lambda url: url)
+    return {
+        extension: ", ".join(f"{absolute(default_storage.url(entry[extension]))} {width}w" for width, entry in entries)
+        for extension in FORMATS
+    }
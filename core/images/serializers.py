@@ -0,0 +1,42 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import serializers
+from rest_framework.fields import get_error_detail
+from .renditions import srcsets
+from .uploads import check_upload
+
+
+class SrcsetField(serializers.Field):
+    """
+    Read-only field with the ``srcset`` of each rendition format of an image,
+    e.g. ``{"webp": "... 96w, ... 640w", "jpeg": "..."}``, or None while the
+    renditions are not rendered yet.
+    """
+
+    def __init__(self, image_field: str = "image", **kwargs):
+        self.image_field = image_field
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, instance):
+        request = self.context.get("request")
+        return srcsets(
+            getattr(instance, self.image_field),
+            getattr(instance, f"{self.image_field}_renditions"),
+            request.build_absolute_uri if request else None,
+        )
+
+
+class ImageUploadField(serializers.ImageField):
+    """
+    ImageField rejecting uploads over the limits of ``check_upload`` before
+    Pillow verifies the whole image.
+    """
+
+    def to_internal_value(self, data):
+        if hasattr(data, "size"):
+            try:
+                check_upload(data)
+            except DjangoValidationError as exc:
+                raise serializers.ValidationError(get_error_detail(exc))
+        return super().to_internal_value(data)
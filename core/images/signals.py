@@ -0,0 +1,4 @@
+from django.dispatch import Signal
+
+# Sent with the model and pk of an instance whose image renditions were stored.
+renditions_updated = Signal()
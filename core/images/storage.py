@@ -0,0 +1,52 @@
+import hashlib
+import os
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+
+# Alias of the image storage in STORAGES
+IMAGE_STORAGE = "images"
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Store every file under the SHA-256 of its content, whatever name it was
+    uploaded with, so identical uploads share a single file.
+
+    Files are shared between rows, so they must only be deleted once no row
+    references them anymore, see ``images.blobs.release``.
+    """
+
+    directory = "blobs"
+
+    def content_name(self, name: str, content: File) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+        digest = digest.hexdigest()
+        extension = os.path.splitext(name)[1].lower()
+        return f"{self.directory}/{digest[:2]}/{digest}{extension}"
+
+    def save(self, name, content, max_length=None):
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        return super().save(self.content_name(name or content.name, content), content, max_length)
+
+    def get_available_name(self, name, max_length=None):
+        # The same name means the same content, never rename.
+        return name
+
+    def _save(self, name, content):
+        if self.exists(name):
+            try:
+                # Reused by a new upload, the file is as young as that upload
+                # for the orphan sweep and queued deletions, see delete_stored.
+                os.utime(self.path(name))
+                return name
+            except FileNotFoundError:
+                pass  # Deleted meanwhile, write it again
+        return super()._save(name, content)
+
+
+def get_image_storage():
+    return storages[IMAGE_STORAGE]
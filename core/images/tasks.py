@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from .media import delete_stored, find_orphans
+from .renditions import update_renditions
+
+
+@shared_task
+def generate_renditions(model: str, pk: int):
+    """
+    Render the resized variants of the image of an instance after an upload.
+    ``model`` is the model's label, e.g. "blog.Post".
+    """
+    update_renditions(apps.get_model(model), pk)
+
+
+@shared_task(bind=True, max_retries=5)
+def delete_media(self, storage: str, names: list[str], queued_at: float = None):
+    """
+    Delete a batch of files of a storage alias, queued by images.deletion once
+    the rows referencing them are gone (at the ``queued_at`` timestamp).
+    Failed files are retried with a growing delay, sweep_orphan_media catches
+    whatever is left.
+    """
+    failed = delete_stored(storage, names, queued_at)
+    if failed:
+        raise self.retry(args=(storage, failed, queued_at), countdown=60 * 2**self.request.retries)
+
+
+@shared_task
+def sweep_orphan_media():
+    """
+    This task is scheduled to run every day to delete the media files no row references.
+    """
+    started = time.time()
+    orphans = find_orphans(timedelta(hours=settings.MEDIA_ORPHAN_MIN_AGE))
+    failed = sum(len(delete_stored(storage, names, started)) for storage, names in orphans.items())
+    print(f"Orphan media swept: {sum(map(len, orphans.values())) - failed} deleted, {failed} failed.")
@@ -0,0 +1,39 @@
+from django import template
+from django.core.files.storage import default_storage
+from django.utils.html import format_html, format_html_join
+from images.renditions import FORMATS, srcsets
+
+register = template.Library()
+
+
+@register.simple_tag
+def picture(image, renditions, sizes, default="", **attrs):
+    """
+    Render an ``<img>`` of ``image`` inside a ``<picture>`` offering its WebP
+    and JPEG renditions, so browsers fetch the smallest one that fits
+    ``sizes``. Falls back to the original until the renditions exist, and to
+    ``default`` without an image.
+
+    {% picture post.author.image post.author.image_renditions "48px" default=avatar alt="" width=48 height=48 %}
+    """
+    attributes = format_html_join("", ' {}="{}"', attrs.items())
+    if not image:
+        return format_html('<img src="{}"{}>', default, attributes)
+    srcset = srcsets(image, renditions)
+    if srcset is None:
+        return format_html('<img src="{}"{}>', image.url, attributes)
+
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        (
+            (mime_type, srcset[extension], sizes)
+            for extension, (_, _, mime_type) in FORMATS.items()
+            if extension != "jpeg"
+        ),
+    )
+    # The card size is the fallback of browsers without srcset support.
+    src = default_storage.url(renditions["sizes"]["card"]["jpeg"])
+    return format_html(
+        '<picture>{}<img src="{}" srcset="{}" sizes="{}"{}></picture>', sources, src, srcset["jpeg"], sizes, attributes
+    )
@@ -0,0 +1,143 @@
+import pytest
+from django.contrib.auth.models import update_last_login
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from blog.models import Post
+from account.models import User
+from BlogSite.celery import app as celery_app
+from images.models import Blob
+from images.storage import get_image_storage
+
+
+@pytest.fixture(autouse=True)
+def eager_tasks(monkeypatch):
+    # Files are deleted by a task queued on commit.
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+
+
+def create_post(user: User, image: SimpleUploadedFile = None) -> Post:
+    return Post.objects.create(title="Post", content="Content", author=user, image=image)
+
+
+@pytest.mark.django_db
+class TestContentAddressedStorage:
+    def test_identical_uploads_share_a_file(self, user, media_root, make_image):
+        first = create_post(user, make_image(name="a.png"))
+        second = create_post(user, make_image(name="b.PNG"))
+        user.image = make_image(name="avatar.png")
+        user.save()
+
+        assert first.image.name == second.image.name == user.image.name
+        assert first.image.name.startswith("blobs/")
+        assert first.image.name.endswith(".png")
+        assert len(list((media_root / "blobs").rglob("*.png"))) == 1
+        assert Blob.objects.get(pk=first.image.name).references == 3
+
+    def test_different_content_gets_another_file(self, user, make_image):
+        first = create_post(user, make_image(color="red"))
+        second = create_post(user, make_image(color="blue"))
+
+        assert first.image.name != second.image.name
+
+    def test_shared_file_is_kept_until_last_reference(self, user, django_capture_on_commit_callbacks, make_image):
+        storage = get_image_storage()
+        first = create_post(user, make_image())
+        second = create_post(user, make_image())
+        name = first.image.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            first.delete()
+        assert storage.exists(name)
+        assert Blob.objects.get(pk=name).references == 1
+
+        with django_capture_on_commit_callbacks(execute=True):
+            second.delete()
+        assert not storage.exists(name)
+        assert not Blob.objects.filter(pk=name).exists()
+
+    def test_replaced_image_releases_previous(self, user, django_capture_on_commit_callbacks, make_image):
+        storage = get_image_storage()
+        post = create_post(user, make_image(color="red"))
+        old = post.image.name
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.image = make_image(color="blue")
+            post.save()
+        assert not storage.exists(old)
+        assert Blob.objects.get(pk=post.image.name).references == 1
+
+    def test_cleared_image_keeps_file_of_other_rows(self, user, django_capture_on_commit_callbacks, make_image):
+        storage = get_image_storage()
+        post = create_post(user, make_image())
+        user.image = make_image()
+        user.save()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.image = None
+            post.save()
+        assert storage.exists(user.image.name)
+        assert Blob.objects.get(pk=user.image.name).references == 1
+
+    def test_field_file_save_after_a_save_moves_the_reference(
+        self, user, django_capture_on_commit_callbacks, make_image
+    ):
+        storage = get_image_storage()
+        post = create_post(user, make_image(color="red"))
+        old = post.image.name
+        post.save()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.image.save("b.png", make_image(color="blue"))
+        assert post.image.name != old
+        assert Blob.objects.get(pk=post.image.name).references == 1
+        assert not Blob.objects.filter(pk=old).exists()
+        assert not storage.exists(old)
+
+    def test_saves_without_image_keep_references(self, user, make_image):
+        post = create_post(user, make_image())
+        post.title = "Edited"
+        post.save()
+        user.save(update_fields=["last_login"])
+
+        assert Blob.objects.get(pk=post.image.name).references == 1
+
+    def test_files_without_blob_are_deleted_with_their_row(self, user, django_capture_on_commit_callbacks, make_image):
+        storage = get_image_storage()
+        post = create_post(user, make_image())
+        name = post.image.name
+        Blob.objects.all().delete()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.delete()
+        assert not storage.exists(name)
+
+    def test_saves_compare_with_the_loaded_image(self, user, django_capture_on_commit_callbacks, make_image):
+        storage = get_image_storage()
+        post = create_post(user, make_image(color="red"))
+        old = post.image.name
+        post = Post.objects.get(pk=post.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.image = make_image(color="blue")
+            with CaptureQueriesContext(connection) as context:
+                post.save()
+        assert not any('FROM "blog_post"' in query["sql"] for query in context.captured_queries)
+        assert not storage.exists(old)
+
+    def test_deferred_image_is_read_before_the_save(self, user, django_capture_on_commit_callbacks, make_image):
+        storage = get_image_storage()
+        post = create_post(user, make_image(color="red"))
+        old = post.image.name
+        post = Post.objects.only("pk", "title").get(pk=post.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            post.image = make_image(color="blue")
+            post.save(update_fields=["image"])
+        assert not storage.exists(old)
+
+    def test_login_runs_a_single_query(self, user):
+        user = User.objects.get(pk=user.pk)
+        with CaptureQueriesContext(connection) as context:
+            update_last_login(None, user)
+        assert len(context.captured_queries) == 1
@@ -0,0 +1,154 @@
+import os
+import time
+from unittest import mock
+import pytest
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import transaction
+from blog.models import Post
+from images.deletion import delete_on_commit
+from images.models import Blob
+from images.renditions import update_renditions
+from images.storage import get_image_storage
+from images.tasks import delete_media
+
+
+def age(storage, name: str, hours: int):
+    path = storage.path(name)
+    past = time.time() - hours * 3600
+    os.utime(path, (past, past))
+
+
+@pytest.mark.django_db
+class TestMediaDeletion:
+    def test_cascade_delete_sends_one_batch(self, user, django_capture_on_commit_callbacks, make_image):
+        colors = ["red", "green", "blue", "white", "black"]
+        posts = [
+            Post.objects.create(title="Post", content="Content", author=user, image=make_image(color=color))
+            for color in colors
+        ]
+
+        with mock.patch("images.deletion.delete_media.delay") as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                user.delete()
+        delay.assert_called_once()
+        storage, names, _ = delay.call_args.args
+        assert storage == "images"
+        assert sorted(names) == sorted(post.image.name for post in posts)
+
+    def test_large_batches_are_split(self, django_capture_on_commit_callbacks):
+        with mock.patch("images.deletion.BATCH_SIZE", 2), mock.patch("images.deletion.delete_media.delay") as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                delete_on_commit("default", ["a", "b", "c", "d", "e"])
+        assert [call.args[:2] for call in delay.call_args_list] == [
+            ("default", ["a", "b"]),
+            ("default", ["c", "d"]),
+            ("default", ["e"]),
+        ]
+
+    def test_rolled_back_deletions_are_dropped(self, django_capture_on_commit_callbacks):
+        with mock.patch("images.deletion.delete_media.delay") as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        delete_on_commit("default", ["kept"])
+                        raise ValueError
+                except ValueError:
+                    pass
+                delete_on_commit("default", ["deleted"])
+        delay.assert_called_once_with("default", ["deleted"], mock.ANY)
+
+    def test_failed_deletes_are_retried(self):
+        default_storage.save("renditions/a.webp", ContentFile(b"a"))
+        with mock.patch.object(default_storage, "delete", side_effect=OSError) as delete, mock.patch.object(
+            delete_media, "retry", side_effect=RuntimeError
+        ) as retry:
+            with pytest.raises(RuntimeError):
+                delete_media("default", ["renditions/a.webp"], 1.0)
+        delete.assert_called_once_with("renditions/a.webp")
+        assert retry.call_args.kwargs["args"] == ("default", ["renditions/a.webp"], 1.0)
+
+    def test_referenced_images_are_kept(self, user, make_image):
+        post = Post.objects.create(title="Post", content="Content", author=user, image=make_image())
+
+        delete_media("images", [post.image.name])
+        assert get_image_storage().exists(post.image.name)
+
+    def test_reused_images_are_touched_and_kept(self, user, make_image):
+        images = get_image_storage()
+        name = images.save("photo.png", make_image())
+        age(images, name, 48)
+        queued_at = time.time()
+
+        # Uploaded again after the deletion was queued, before its row commits.
+        assert images.save("again.png", make_image()) == name
+        assert images.get_modified_time(name).timestamp() >= queued_at
+        delete_media("images", [name], queued_at)
+        assert images.exists(name)
+
+        delete_media("images", [name], time.time())
+        assert not images.exists(name)
+
+    def test_released_blob_is_deleted_with_its_file(self, user, django_capture_on_commit_callbacks, make_image):
+        post = Post.objects.create(title="Post", content="Content", author=user, image=make_image())
+        name = post.image.name
+
+        with mock.patch("images.deletion.delete_media.delay") as delay:
+            with django_capture_on_commit_callbacks(execute=True):
+                post.delete()
+        # Kept at zero references until the file goes, a new upload locks it.
+        assert Blob.objects.get(pk=name).references == 0
+
+        delete_media(*delay.call_args.args)
+        assert not get_image_storage().exists(name)
+        assert not Blob.objects.filter(pk=name).exists()
+
+
+@pytest.mark.django_db
+class TestOrphanSweep:
+    def test_sweep_deletes_old_unreferenced_files(self, user, make_image):
+        images = get_image_storage()
+        post = Post.objects.create(title="Post", content="Content", author=user, image=make_image())
+        update_renditions(Post, post.pk)
+        post.refresh_from_db()
+        rendition = post.image_renditions["sizes"]["card"]["webp"]
+        orphan = images.save("photo.png", make_image(color="blue"))
+        stray = default_storage.save("renditions/gone/card.webp", ContentFile(b"webp"))
+        recent = images.save("photo.png", make_image(color="green"))
+        for name in (post.image.name, orphan, recent):
+            age(images, name, 48)
+        for name in (rendition, stray):
+            age(default_storage, name, 48)
+        age(images, recent, 1)
+
+        call_command("sweep_orphan_media")
+
+        assert images.exists(post.image.name)
+        assert default_storage.exists(rendition)
+        assert not images.exists(orphan)
+        assert not default_storage.exists(stray)
+        assert images.exists(recent)
+
+    def test_dry_run_keeps_files(self, capsys, make_image):
+        images = get_image_storage()
+        orphan = images.save("photo.png", make_image())
+        age(images, orphan, 48)
+
+        call_command("sweep_orphan_media", "--dry-run")
+
+        assert images.exists(orphan)
+        assert f"images: {orphan}" in capsys.readouterr().out
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_sweep_reads_references_from_the_primary(settings, user, make_image):
+    # The replica hasn't caught up with the post yet.
+    settings.DATABASE_REPLICAS = ["replica"]
+    images = get_image_storage()
+    with mock.patch("blog.signals.generate_renditions.delay"):
+        post = Post.objects.create(title="Post", content="Content", author=user, image=make_image())
+    age(images, post.image.name, 48)
+
+    call_command("sweep_orphan_media")
+    assert images.exists(post.image.name)
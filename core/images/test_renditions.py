@@ -0,0 +1,140 @@
+from unittest import mock
+import pytest
+from PIL import Image
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.template import Context, Template
+from blog.models import Post
+from images.renditions import SIZES, srcsets, update_renditions
+from images.signals import renditions_updated
+
+
+@pytest.fixture
+def post(user, make_image) -> Post:
+    return Post.objects.create(title="Test Post", content="Content", author=user, image=make_image(2000, 1000))
+
+
+@pytest.mark.django_db
+class TestRenditions:
+    def test_update_renders_every_size_and_format(self, post):
+        assert update_renditions(Post, post.pk)
+
+        post.refresh_from_db()
+        renditions = post.image_renditions
+        assert renditions["source"] == post.image.name
+        assert set(renditions["sizes"]) == set(SIZES)
+        assert renditions["sizes"]["card"]["width"] == 640
+        assert renditions["sizes"]["card"]["height"] == 320
+        with default_storage.open(renditions["sizes"]["thumbnail"]["webp"]) as file:
+            assert Image.open(file).format == "WEBP"
+        with default_storage.open(renditions["sizes"]["full"]["jpeg"]) as file:
+            assert Image.open(file).size == (1600, 800)
+
+    def test_update_is_skipped_when_current(self, post):
+        update_renditions(Post, post.pk)
+        assert not update_renditions(Post, post.pk)
+
+    def test_small_images_are_not_scaled_up(self, user, make_image):
+        post = Post.objects.create(
+            title="Small", content="Content", author=user, image=make_image(300, 200, mode="RGBA")
+        )
+        update_renditions(Post, post.pk)
+
+        post.refresh_from_db()
+        sizes = post.image_renditions["sizes"]
+        assert sizes["card"] == sizes["full"]
+        assert (sizes["card"]["width"], sizes["card"]["height"]) == (300, 200)
+
+    def test_new_image_replaces_previous_files(self, post, make_image):
+        update_renditions(Post, post.pk)
+        post.refresh_from_db()
+        previous = post.image_renditions["sizes"]["card"]["webp"]
+
+        post.image = make_image(800, 800, name="other.png")
+        post.save()
+        update_renditions(Post, post.pk)
+
+        post.refresh_from_db()
+        assert post.image_renditions["source"] == post.image.name
+        assert not default_storage.exists(previous)
+
+    def test_removed_image_clears_renditions(self, post):
+        update_renditions(Post, post.pk)
+        post.refresh_from_db()
+        previous = post.image_renditions["sizes"]["card"]["jpeg"]
+
+        post.image = None
+        post.save()
+        assert update_renditions(Post, post.pk)
+
+        post.refresh_from_db()
+        assert post.image_renditions == {}
+        assert not default_storage.exists(previous)
+
+    def test_update_sends_signal(self, post):
+        received = []
+
+        def receiver(sender, pk, **kwargs):
+            received.append((sender, pk))
+
+        renditions_updated.connect(receiver)
+        try:
+            update_renditions(Post, post.pk)
+        finally:
+            renditions_updated.disconnect(receiver)
+        assert received == [(Post, post.pk)]
+
+    def test_post_save_queues_task(self, user, django_capture_on_commit_callbacks, make_image):
+        with mock.patch("images.tasks.generate_renditions.delay") as delay, django_capture_on_commit_callbacks(
+            execute=True
+        ):
+            post = Post.objects.create(title="Queued", content="Content", author=user, image=make_image(100, 100))
+        delay.assert_called_once_with("blog.Post", post.pk)
+
+    def test_srcsets(self, post):
+        assert srcsets(post.image, post.image_renditions) is None
+
+        update_renditions(Post, post.pk)
+        post.refresh_from_db()
+        srcset = srcsets(post.image, post.image_renditions)
+        assert srcset["webp"].endswith("1600w")
+        assert srcset["webp"].count("w,") == 2
+        assert ".jpeg 96w" in srcset["jpeg"]
+
+    def test_picture_tag(self, post):
+        template = Template('{% load images %}{% picture post.image post.image_renditions "640px" alt="x" %}')
+        html = template.render(Context({"post": post}))
+        assert html == f'<img src="{post.image.url}" alt="x">'
+
+        update_renditions(Post, post.pk)
+        post.refresh_from_db()
+        html = template.render(Context({"post": post}))
+        assert html.startswith('<picture><source type="image/webp"')
+        assert 'sizes="640px"' in html
+
+    def test_picture_tag_default(self, user):
+        template = Template('{% load images %}{% picture user.image user.image_renditions "48px" default="/a.png" %}')
+        assert template.render(Context({"user": user})) == '<img src="/a.png">'
+
+    def test_backfill_command(self, post, user, make_image):
+        user.image = make_image(400, 400)
+        user.save()
+
+        call_command("backfill_renditions", "--batch-size", "1")
+
+        post.refresh_from_db()
+        user.refresh_from_db()
+        assert post.image_renditions["source"] == post.image.name
+        assert user.image_renditions["source"] == user.image.name
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+def test_update_reads_the_primary(settings, user, make_image):
+    # The replica hasn't caught up with the post yet.
+    settings.DATABASE_REPLICAS = ["replica"]
+    with mock.patch("blog.signals.generate_renditions.delay"):
+        post = Post.objects.create(title="Test Post", content="Content", author=user, image=make_image(800, 600))
+    assert not Post.objects.using("replica").filter(pk=post.pk).exists()
+
+    assert update_renditions(Post, post.pk)
+    assert Post.objects.using("default").get(pk=post.pk).image_renditions["source"] == post.image.name
@@ -0,0 +1,104 @@
+import pytest
+from PIL import Image
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from blog.models import Post
+from images.uploads import check_upload
+
+
+@pytest.fixture
+def api_client(user) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def client(user) -> Client:
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+@pytest.mark.django_db
+class TestImageUpload:
+    def test_profile_upload(self, api_client, user, make_image):
+        response = api_client.put(
+            reverse("account:api-v1:profile"), {"username": "testuser", "image": make_image(50, 50)}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.image.name.startswith("blobs/")
+        assert user.image.width == 50
+
+    def test_profile_upload_too_large(self, api_client, user, settings, make_image):
+        settings.IMAGE_UPLOAD_MAX_SIZE = 100
+        response = api_client.put(
+            reverse("account:api-v1:profile"), {"username": "testuser", "image": make_image(50, 50)}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["image"] == ["The image must be at most 100 bytes."]
+        user.refresh_from_db()
+        assert not user.image
+
+    def test_profile_upload_too_wide(self, api_client, settings, make_image):
+        settings.IMAGE_UPLOAD_MAX_DIMENSION = 40
+        response = api_client.put(
+            reverse("account:api-v1:profile"), {"username": "testuser", "image": make_image(50, 10)}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["image"] == ["The image must be at most 40 pixels wide and high."]
+
+    def test_profile_upload_not_an_image(self, api_client):
+        upload = SimpleUploadedFile("photo.png", b"not an image", content_type="image/png")
+        response = api_client.put(
+            reverse("account:api-v1:profile"), {"username": "testuser", "image": upload}, format="multipart"
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "image" in response.data
+
+    def test_post_form_upload(self, client, user, make_image):
+        response = client.post(
+            reverse("post:create"),
+            {"title": "Title", "content": "Content", "image": make_image(80, 60, format="JPEG", name="a.JPG")},
+        )
+
+        assert response.status_code == 302
+        post = Post.objects.get(title="Title")
+        assert post.image.name.startswith("blobs/")
+        assert post.image.name.endswith(".jpg")
+        assert (post.image.width, post.image.height) == (80, 60)
+
+    def test_post_form_rejects_too_many_pixels(self, client, settings, make_image):
+        settings.IMAGE_UPLOAD_MAX_PIXELS = 1000
+        response = client.post(
+            reverse("post:create"), {"title": "Title", "content": "Content", "image": make_image(50, 50)}
+        )
+
+        assert response.status_code == 200
+        assert response.context["form"].errors["image"] == ["The image must have at most 1000 pixels."]
+        assert not Post.objects.exists()
+
+    def test_profile_form_upload(self, client, user, make_image):
+        response = client.post(
+            reverse("account:edit"), {"email": user.email, "username": "testuser", "image": make_image(30, 30)}
+        )
+
+        assert response.status_code == 302
+        user.refresh_from_db()
+        assert user.image.name.startswith("blobs/")
+        assert user.image.name.endswith(".png")
+
+    def test_check_upload_rejects_decompression_bombs(self, monkeypatch, make_image):
+        monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 100)
+        with pytest.raises(ValidationError) as error:
+            check_upload(make_image(20, 20))
+        assert error.value.code == "image_too_many_pixels"
@@ -0,0 +1,107 @@
+import warnings
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from PIL import Image, ImageFile
+
+# Bytes of an upload fed to Pillow's parser to read its dimensions, the
+# headers of every supported format (EXIF included) fit in it.
+SNIFF_SIZE = 256 * 1024
+
+TOO_LARGE = ValidationError("The image must be at most %(limit)s bytes.", code="image_too_large")
+TOO_WIDE = ValidationError("The image must be at most %(limit)s pixels wide and high.", code="image_too_wide")
+TOO_MANY_PIXELS = ValidationError("The image must have at most %(limit)s pixels.", code="image_too_many_pixels")
+
+
+def limit_error(error: ValidationError, limit: int) -> ValidationError:
+    return ValidationError(error.message, code=error.code, params={"limit": limit})
+
+
+def check_dimensions(width: int, height: int) -> ValidationError | None:
+    if max(width, height) > settings.IMAGE_UPLOAD_MAX_DIMENSION:
+        return limit_error(TOO_WIDE, settings.IMAGE_UPLOAD_MAX_DIMENSION)
+    if width * height > settings.IMAGE_UPLOAD_MAX_PIXELS:
+        return limit_error(TOO_MANY_PIXELS, settings.IMAGE_UPLOAD_MAX_PIXELS)
+    return None
+
+
+class ImageUploadHandler(TemporaryFileUploadHandler):
+    """
+    Stream every uploaded file to a temporary file a chunk at a time, so the
+    memory used by an upload doesn't grow with its size.
+
+    The size limit is checked on every chunk and the dimensions as soon as the
+    image header went by. Past a limit the rest of the file is dropped and the
+    error is kept on the uploaded file for ``check_upload`` to raise.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.error = None
+        self.parser = ImageFile.Parser()
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.error is not None:
+            return None
+        self.received += len(raw_data)
+        if self.received > settings.IMAGE_UPLOAD_MAX_SIZE:
+            self.error = limit_error(TOO_LARGE, settings.IMAGE_UPLOAD_MAX_SIZE)
+            return None
+        if self.parser is not None:
+            self.sniff(raw_data)
+            if self.error is not None:
+                return None
+        return super().receive_data_chunk(raw_data, start)
+
+    def sniff(self, raw_data: bytes):
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+                self.parser.feed(raw_data)
+        except Exception:
+            # Not an image, or too large for Pillow; check_upload will tell.
+            self.parser = None
+            return
+        if self.parser.image is not None:
+            self.error = check_dimensions(*self.parser.image.size)
+            # Only the header is needed, never let the parser decode pixels.
+            self.parser = None
+        elif self.received >= SNIFF_SIZE:
+            self.parser = None
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        file.upload_error = self.error
+        return file
+
+
+def check_upload(file):
+    """
+    Raise a ValidationError for an uploaded image over the size, dimension or
+    pixel limits. Only the image header is read.
+    """
+    error = getattr(file, "upload_error", None)
+    if error is not None:
+        raise error
+    if file.size > settings.IMAGE_UPLOAD_MAX_SIZE:
+        raise limit_error(TOO_LARGE, settings.IMAGE_UPLOAD_MAX_SIZE)
+
+    source = file.temporary_file_path() if hasattr(file, "temporary_file_path") else file
+    try:
+        with warnings.catch_warnings():
+            # A decompression bomb is rejected like any image over the limit.
+            warnings.simplefilter("error", Image.DecompressionBombWarning)
+            with Image.open(source) as image:
+                size = image.size
+    except (Image.DecompressionBombWarning, Image.DecompressionBombError):
+        raise limit_error(TOO_MANY_PIXELS, settings.IMAGE_UPLOAD_MAX_PIXELS)
+    except Exception:
+        # Not an image, the ImageField reports it.
+        return
+    finally:
+        if hasattr(file, "seek"):
+            file.seek(0)
+    error = check_dimensions(*size)
+    if error is not None:
+        raise error